@@ -1,4 +1,5 @@
 from .arducam_B0273_adapter import ArducamB0273Camera
 from .arducam_B0311_adapter import ArducamB0311Camera
+from .synthetic_adapter import SyntheticCamera, VideoFileCamera
 
-__all__ = ['ArducamB0273Camera', 'ArducamB0311Camera']
+__all__ = ['ArducamB0273Camera', 'ArducamB0311Camera', 'SyntheticCamera', 'VideoFileCamera']
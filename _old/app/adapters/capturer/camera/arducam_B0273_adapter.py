@@ -1,12 +1,17 @@
 from app.adapters.capturer.camera.lense import LENSE_120
+from app.adapters.capturer.gstreamer import GstPipelineComposer
 from app.infra.logger import Logger
 from app.interfaces.capturer.camera import ICamera
-from app.models.capturer.formats import NVArgusCameraSrcFormats, NVVidConvFormats, VideoConvertFormats
+from app.models.capturer import CaptureChain, PixelFormat
+from app.models.capturer.formats import VideoConvertFormats
 
 from .sensor import IMX477
 
 
 class ArducamB0273Camera(ICamera):
+	# Formatos que acepta la etapa siguiente, en orden de preferencia
+	output_formats: tuple[VideoConvertFormats, ...] = (VideoConvertFormats.NV12, VideoConvertFormats.BGR)
+
 	def __init__(self, camera_index: int, flip_method: int) -> None:
 		sensor = IMX477
 		logger = Logger(name='arducam_B0273_adapter')
@@ -19,18 +24,23 @@ class ArducamB0273Camera(ICamera):
 			lense=lense,
 		)
 
-	def _pipeline(self) -> str:
-		return (
-			f'nvarguscamerasrc sensor-id={self._camera_index} ! '
-			f'video/x-raw(memory:NVMM), '
-			f'width={self._capture_width}, height={self._capture_height}, '
-			f'format={NVArgusCameraSrcFormats.NV12.value}, framerate={self._framerate}/1 ! '
-			f'nvvidconv flip-method={self._flip_method} ! '
-			f'video/x-raw, format={NVVidConvFormats.NV12.value} ! '
-			f'videoconvert ! '
-			f'video/x-raw, format={VideoConvertFormats.BGR.value} ! '
-			f'appsink drop=1 max-buffers=1'
+	def _composer(self) -> GstPipelineComposer:
+		return GstPipelineComposer(
+			sensor_id=self._camera_index,
+			width=self._capture_width,
+			height=self._capture_height,
+			fps=self._framerate,
+			flip_method=self._flip_method,
 		)
 
+	def _chain(self) -> CaptureChain:
+		return self._composer().best(self.output_formats)
+
+	def _pipeline(self) -> str:
+		return self._composer().pipeline(self._chain())
+
+	def _output_format(self) -> PixelFormat:
+		return PixelFormat.from_label(self._chain().output_format.value)
+
 	def focus(self) -> None:
 		self._logger.info('Focus method not implemented for Arducam B0273 camera')
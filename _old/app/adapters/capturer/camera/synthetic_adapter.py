@@ -0,0 +1,248 @@
+import time
+from abc import ABC, abstractmethod
+
+import cv2 as cv
+import numpy as np
+from numpy.typing import NDArray
+
+from app.adapters.capturer.camera.lense import LENSE_120
+from app.infra.logger import Logger
+from app.interfaces.capturer.camera import ICamera
+from app.models.capturer import CaptureFormat, PixelFormat, Resolution
+from app.models.capturer.camera import Sensor
+from config.settings import Settings
+
+# Fracción del ancho que comparten dos cámaras sintéticas contiguas
+_OVERLAP = 0.25
+
+
+def _pixel_format(capture_format: CaptureFormat) -> PixelFormat:
+	match capture_format:
+		case CaptureFormat.BGR888:
+			return PixelFormat.BGR
+		case CaptureFormat.RGB888:
+			return PixelFormat.RGB
+		case CaptureFormat.YUV420:
+			return PixelFormat.I420
+		case _:
+			raise ValueError(f'Unsupported synthetic capture format: {capture_format.value}')
+
+
+class _SyntheticCapture(ABC):
+	"""
+	Stand-in for cv.VideoCapture. read() blocks until the next frame is due and, like an
+	appsink with drop=1 max-buffers=1, skips the frames a late reader missed.
+	"""
+
+	def __init__(self, width: int, height: int, fps: int, capture_format: CaptureFormat) -> None:
+		self._width = width
+		self._height = height
+		self._fps = fps
+		self._format = capture_format
+		self._shape = _pixel_format(capture_format).shape(width, height)
+		self._bgr: NDArray[np.uint8] = np.empty((height, width, 3), dtype=np.uint8)
+		self._opened = True
+		self._t0: float | None = None
+		self._index = -1
+
+	def isOpened(self) -> bool:
+		return self._opened
+
+	def release(self) -> None:
+		self._opened = False
+
+	def read(self, image: NDArray[np.uint8] | None = None) -> tuple[bool, NDArray[np.uint8] | None]:
+		if not self._opened:
+			return False, image
+		if self._t0 is None:
+			self._t0 = time.perf_counter()
+
+		index = self._index + 1
+		due = self._t0 + index / self._fps
+		now = time.perf_counter()
+		if now < due:
+			time.sleep(due - now)
+		else:
+			index = max(index, int((now - self._t0) * self._fps))
+		self._index = index
+
+		if not self._render(index, self._bgr):
+			return False, image
+		if image is None or image.shape != self._shape:
+			image = np.empty(self._shape, dtype=np.uint8)
+		self._convert(image)
+		return True, image
+
+	def _convert(self, image: NDArray[np.uint8]) -> None:
+		match self._format:
+			case CaptureFormat.BGR888:
+				np.copyto(image, self._bgr)
+			case CaptureFormat.RGB888:
+				cv.cvtColor(self._bgr, cv.COLOR_BGR2RGB, dst=image)
+			case CaptureFormat.YUV420:
+				cv.cvtColor(self._bgr, cv.COLOR_BGR2YUV_I420, dst=image)
+
+	@abstractmethod
+	def _render(self, index: int, bgr: NDArray[np.uint8]) -> bool: ...
+
+
+class _BallPatternCapture(_SyntheticCapture):
+	def __init__(
+		self,
+		camera_index: int,
+		width: int,
+		height: int,
+		fps: int,
+		capture_format: CaptureFormat,
+		ball_speed: tuple[float, float],
+		ball_radius: int,
+	) -> None:
+		super().__init__(width, height, fps, capture_format)
+		self._offset_x = int(camera_index * width * (1 - _OVERLAP))
+		self._world_width = int(width * (2 - _OVERLAP))
+		self._ball_speed = ball_speed
+		self._ball_radius = ball_radius
+		self._background = self._court(width, height)
+
+	def _court(self, width: int, height: int) -> NDArray[np.uint8]:
+		court = np.empty((height, width, 3), dtype=np.uint8)
+		court[:] = (60, 120, 40)
+		thickness = max(2, height // 270)
+		margin_y = height // 8
+		x0 = -self._offset_x + width // 16
+		x1 = self._world_width - self._offset_x - width // 16
+		cv.rectangle(court, (x0, margin_y), (x1, height - margin_y), (235, 235, 235), thickness)
+		mid = self._world_width // 2 - self._offset_x
+		cv.line(court, (mid, margin_y), (mid, height - margin_y), (235, 235, 235), thickness)
+		return court
+
+	def _render(self, index: int, bgr: NDArray[np.uint8]) -> bool:
+		t = index / self._fps
+		r = self._ball_radius
+		x = r + _bounce(self._ball_speed[0] * t, self._world_width - 2 * r) - self._offset_x
+		y = r + _bounce(self._ball_speed[1] * t, self._height - 2 * r)
+		np.copyto(bgr, self._background)
+		cv.circle(bgr, (int(x), int(y)), r, (40, 200, 250), -1, cv.LINE_AA)
+		return True
+
+
+class _LoopedVideoCapture(_SyntheticCapture):
+	def __init__(
+		self, path: str, width: int, height: int, fps: int, capture_format: CaptureFormat
+	) -> None:
+		super().__init__(width, height, fps, capture_format)
+		self._path = path
+		self._video = cv.VideoCapture(path)
+		if not self._video.isOpened():
+			raise ValueError(f'Cannot open video file: {path}')
+		self._decoded: NDArray[np.uint8] | None = None
+
+	def release(self) -> None:
+		super().release()
+		self._video.release()
+
+	def _render(self, index: int, bgr: NDArray[np.uint8]) -> bool:
+		retval, self._decoded = self._video.read(self._decoded)
+		if not retval:
+			self._video.set(cv.CAP_PROP_POS_FRAMES, 0)
+			retval, self._decoded = self._video.read(self._decoded)
+			if not retval:
+				return False
+		if self._decoded.shape == bgr.shape:
+			np.copyto(bgr, self._decoded)
+		else:
+			cv.resize(self._decoded, (self._width, self._height), dst=bgr, interpolation=cv.INTER_AREA)
+		return True
+
+
+def _bounce(distance: float, length: int) -> float:
+	if length <= 0:
+		return 0.0
+	phase = distance % (2 * length)
+	return phase if phase <= length else 2 * length - phase
+
+
+class SyntheticCamera(ICamera):
+	def __init__(
+		self,
+		camera_index: int,
+		flip_method: int,
+		resolution: Resolution | None = None,
+		fps: int | None = None,
+		capture_format: CaptureFormat | None = None,
+	) -> None:
+		synthetic = Settings.synthetic
+		resolution = resolution or synthetic.resolution
+		fps = fps or synthetic.fps
+		capture_format = capture_format or CaptureFormat(synthetic.format)
+		super().__init__(
+			camera_index=camera_index,
+			flip_method=flip_method,
+			logger=Logger(name='synthetic_adapter'),
+			sensor=Sensor(format=capture_format, mode=(resolution, fps, False)),
+			lense=LENSE_120,
+		)
+
+	def _pipeline(self) -> str:
+		return (
+			f'synthetic ball camera-index={self._camera_index} '
+			f'width={self._capture_width}, height={self._capture_height}, '
+			f'format={self._format.value}, framerate={self._framerate}/1'
+		)
+
+	def _open_capturer(self) -> _SyntheticCapture:
+		synthetic = Settings.synthetic
+		return _BallPatternCapture(
+			camera_index=self._camera_index,
+			width=self._capture_width,
+			height=self._capture_height,
+			fps=self._framerate,
+			capture_format=self._format,
+			ball_speed=synthetic.ball_speed,
+			ball_radius=synthetic.ball_radius,
+		)
+
+	def _output_format(self) -> PixelFormat:
+		return _pixel_format(self._format)
+
+	def focus(self) -> None:
+		self._logger.info('Focus method not implemented for synthetic camera')
+
+
+class VideoFileCamera(SyntheticCamera):
+	def __init__(
+		self,
+		camera_index: int,
+		flip_method: int,
+		path: str | None = None,
+		resolution: Resolution | None = None,
+		fps: int | None = None,
+		capture_format: CaptureFormat | None = None,
+	) -> None:
+		path = path or Settings.synthetic.video_path
+		if not path:
+			raise ValueError('VideoFileCamera requires a video path')
+		self._path: str = path
+		super().__init__(
+			camera_index=camera_index,
+			flip_method=flip_method,
+			resolution=resolution,
+			fps=fps,
+			capture_format=capture_format,
+		)
+
+	def _pipeline(self) -> str:
+		return (
+			f'synthetic file location={self._path} '
+			f'width={self._capture_width}, height={self._capture_height}, '
+			f'format={self._format.value}, framerate={self._framerate}/1'
+		)
+
+	def _open_capturer(self) -> _SyntheticCapture:
+		return _LoopedVideoCapture(
+			path=self._path,
+			width=self._capture_width,
+			height=self._capture_height,
+			fps=self._framerate,
+			capture_format=self._format,
+		)
@@ -1,8 +1,16 @@
 from app.interfaces.capturer.camera import ICamera
 from config.device import get_device
+from config.settings import Settings
 
 
-def CapturerAdapter(camera_index: int, flip_method: int) -> ICamera:
+def CapturerAdapter(camera_index: int, flip_method: int, isolated: bool | None = None) -> ICamera:
+	if isolated is None:
+		isolated = Settings.capture.process_isolation
+	if isolated:
+		from app.adapters.capturer.process_adapter import ProcessCamera
+
+		return ProcessCamera(camera_index, flip_method)
+
 	_device = get_device()
 	match _device:
 		case 'jetson':
@@ -13,5 +21,11 @@ def CapturerAdapter(camera_index: int, flip_method: int) -> ICamera:
 			from app.adapters.capturer.camera import ArducamB0311Camera
 
 			return ArducamB0311Camera(camera_index, flip_method)
+		case 'synthetic':
+			from app.adapters.capturer.camera import SyntheticCamera, VideoFileCamera
+
+			if Settings.synthetic.video_path:
+				return VideoFileCamera(camera_index, flip_method)
+			return SyntheticCamera(camera_index, flip_method)
 		case _:
 			raise ValueError(f'Unsupported device: {_device}')
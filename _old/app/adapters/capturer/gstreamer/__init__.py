@@ -0,0 +1,3 @@
+from .pipeline_composer import GstPipelineComposer
+
+__all__ = ['GstPipelineComposer']
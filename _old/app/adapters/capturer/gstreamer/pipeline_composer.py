@@ -0,0 +1,153 @@
+import time
+from collections.abc import Sequence
+
+import cv2 as cv
+
+from app.infra.logger import Logger
+from app.models.capturer import CaptureChain, CaptureChainBenchmark
+from app.models.capturer.formats import NVArgusCameraSrcFormats, NVVidConvFormats, VideoConvertFormats
+
+# Formatos que el backend GStreamer de OpenCV acepta en el appsink
+APPSINK_FORMATS: tuple[VideoConvertFormats, ...] = (
+	VideoConvertFormats.BGR,
+	VideoConvertFormats.BGRx,
+	VideoConvertFormats.BGRA,
+	VideoConvertFormats.GRAY8,
+	VideoConvertFormats.NV12,
+	VideoConvertFormats.I420,
+	VideoConvertFormats.YV12,
+)
+
+YUV_FORMATS: frozenset[str] = frozenset({'NV12', 'NV21', 'I420', 'YV12'})
+
+_RGB_FORMATS = frozenset({'BGR', 'RGB', 'BGRx', 'RGBx', 'xBGR', 'xRGB', 'BGRA', 'RGBA', 'ARGB', 'ABGR'})
+_GRAY_FORMATS = frozenset({'GRAY8'})
+
+# Coste relativo de una conversión en CPU con videoconvert
+_COST_SWIZZLE = 1  # reordenar/quitar canales o planos
+_COST_MATRIX = 3  # YUV <-> RGB o cambio de submuestreo
+
+
+def conversion_cost(source: str, target: str) -> int:
+	if source == target:
+		return 0
+	if source in _RGB_FORMATS and target in _RGB_FORMATS:
+		return _COST_SWIZZLE
+	if source in YUV_FORMATS and target in YUV_FORMATS:
+		return _COST_SWIZZLE
+	if source in YUV_FORMATS and target in _GRAY_FORMATS:
+		return _COST_SWIZZLE
+	return _COST_MATRIX
+
+
+class GstPipelineComposer:
+	"""
+	Builds the nvarguscamerasrc capture string. nvvidconv (VIC) converts for free, so the
+	chain only falls back to a CPU videoconvert when the consumer accepts nothing nvvidconv
+	can output, and then starts from the nvvidconv format that is cheapest to convert.
+	"""
+
+	def __init__(
+		self,
+		sensor_id: int,
+		width: int,
+		height: int,
+		fps: int,
+		flip_method: int = 0,
+		source_format: NVArgusCameraSrcFormats = NVArgusCameraSrcFormats.NV12,
+	) -> None:
+		self.sensor_id = sensor_id
+		self.width = width
+		self.height = height
+		self.fps = fps
+		self.flip_method = flip_method
+		self.source_format = source_format
+		self.logger = Logger(name='gst_pipeline_composer')
+
+	def chains(self, accepts: Sequence[VideoConvertFormats]) -> list[CaptureChain]:
+		"""Candidate chains for every accepted appsink format, cheapest first."""
+		candidates: list[tuple[int, int, int, CaptureChain]] = []
+		for preference, output in enumerate(accepts):
+			if output not in APPSINK_FORMATS:
+				continue
+			for converter in NVVidConvFormats:
+				cost = conversion_cost(converter.value, output.value)
+				chain = CaptureChain(
+					source_format=self.source_format,
+					converter_format=converter,
+					output_format=output,
+					cpu_cost=cost,
+				)
+				candidates.append((chain.cpu_conversions, cost, preference, chain))
+		candidates.sort(key=lambda candidate: candidate[:3])
+		return [candidate[3] for candidate in candidates]
+
+	def best(self, accepts: Sequence[VideoConvertFormats]) -> CaptureChain:
+		chains = self.chains(accepts)
+		if not chains:
+			accepted = ', '.join(output.value for output in accepts)
+			raise ValueError(f'No capture chain can deliver any of: {accepted}')
+		return chains[0]
+
+	def pipeline(self, chain: CaptureChain) -> str:
+		return (
+			f'nvarguscamerasrc sensor-id={self.sensor_id} ! '
+			f'video/x-raw(memory:NVMM), '
+			f'width={self.width}, height={self.height}, '
+			f'format={chain.source_format.value}, framerate={self.fps}/1 ! '
+			f'{self._tail(chain, "nvvidconv", "appsink drop=1 max-buffers=1")}'
+		)
+
+	def test_pipeline(self, chain: CaptureChain, frames: int, converter: str = 'nvvidconv') -> str:
+		"""
+		Same chain fed by videotestsrc instead of the camera. Off-device pass
+		converter='videoconvert', which makes the first conversion a CPU one as well.
+		"""
+		return (
+			f'videotestsrc num-buffers={frames} pattern=ball ! '
+			f'video/x-raw, '
+			f'width={self.width}, height={self.height}, '
+			f'format={chain.source_format.value}, framerate={self.fps}/1 ! '
+			f'{self._tail(chain, converter, "appsink sync=false")}'
+		)
+
+	def benchmark(
+		self,
+		accepts: Sequence[VideoConvertFormats],
+		frames: int = 120,
+		converter: str = 'nvvidconv',
+		limit: int | None = 5,
+	) -> list[CaptureChainBenchmark]:
+		"""Times the cheapest `limit` candidate chains on a software source."""
+		results: list[CaptureChainBenchmark] = []
+		for chain in self.chains(accepts)[:limit]:
+			capture = cv.VideoCapture(self.test_pipeline(chain, frames, converter), cv.CAP_GSTREAMER)
+			if not capture.isOpened():
+				self.logger.warning(f'Cannot open benchmark pipeline for {chain}')
+				results.append(CaptureChainBenchmark(chain=chain, frames=0, ms_per_frame=None))
+				continue
+			if chain.output_format.value in YUV_FORMATS:
+				capture.set(cv.CAP_PROP_CONVERT_RGB, 0)
+
+			image = None
+			read = 0
+			t0 = time.perf_counter()
+			while read < frames:
+				retval, image = capture.read(image)
+				if not retval:
+					break
+				read += 1
+			elapsed = time.perf_counter() - t0
+			capture.release()
+
+			ms_per_frame = elapsed * 1000 / read if read else None
+			results.append(CaptureChainBenchmark(chain=chain, frames=read, ms_per_frame=ms_per_frame))
+			self.logger.info(f'capture chain {chain}: {ms_per_frame} ms/frame over {read} frames')
+		return results
+
+	def _tail(self, chain: CaptureChain, converter: str, sink: str) -> str:
+		flip = f' flip-method={self.flip_method}' if converter == 'nvvidconv' else ''
+		tail = f'{converter}{flip} ! video/x-raw, format={chain.converter_format.value} ! '
+		if chain.cpu_conversions:
+			tail += f'videoconvert ! video/x-raw, format={chain.output_format.value} ! '
+		return tail + sink
@@ -0,0 +1,252 @@
+import multiprocessing as mp
+import queue
+import time
+from collections import deque
+from collections.abc import Callable
+from functools import partial
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Event
+
+import numpy as np
+from numpy.typing import NDArray
+
+from app.infra.logger import Logger
+from app.infra.memory import lease, memory_budget
+from app.infra.metrics import metric_key, metrics
+from app.interfaces.capturer.camera import ICamera
+from app.models.capturer import Frame, FramePoolStats, PixelFormat, ProcessCaptureStats
+from config.settings import Settings
+
+CameraFactory = Callable[[], ICamera]
+
+
+def _slot(shm: SharedMemory, shape: tuple[int, ...], index: int) -> NDArray[np.uint8]:
+	nbytes = int(np.prod(shape))
+	return np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=index * nbytes)
+
+
+def _capture_worker(
+	factory: CameraFactory,
+	slots: int,
+	ready: Connection,
+	frames: 'mp.Queue[tuple[int, float, int]]',
+	free: 'mp.Queue[int]',
+	stop: Event,
+	dropped: 'mp.sharedctypes.Synchronized[int]',
+) -> None:
+	"""
+	Runs in the child process: reads straight into the shared-memory slot the main
+	process is not using and only sends (slot, timestamp, seq) back.
+	"""
+	logger = Logger(name='process_capture_worker')
+	camera = factory()
+	shape = camera.frame_shape()
+	nbytes = int(np.prod(shape))
+	shm = SharedMemory(create=True, size=slots * nbytes)
+	available: deque[int] = deque(range(slots))
+	scratch = np.empty(shape, dtype=np.uint8)
+	ready.send((shm.name, shape, camera.pixel_format.label, camera.framerate))
+
+	seq = 0
+	try:
+		while not stop.is_set():
+			while True:
+				try:
+					available.append(free.get_nowait())
+				except queue.Empty:
+					break
+
+			slot = available.popleft() if available else None
+			target = _slot(shm, shape, slot) if slot is not None else scratch
+			retval, data = camera.read(target)
+			del target
+			if not retval or data is None or data.shape != shape:
+				if slot is not None:
+					available.appendleft(slot)
+				if not retval:
+					logger.error('Failed to capture frame in capture worker')
+					time.sleep(1 / camera.framerate)
+				continue
+			if slot is None:
+				# El proceso principal retiene todos los slots: se descarta el frame
+				with dropped.get_lock():
+					dropped.value += 1
+				continue
+			frames.put((slot, time.time(), seq))
+			seq += 1
+	finally:
+		camera.stop()
+		shm.close()
+		shm.unlink()
+
+
+class ProcessCamera(ICamera):
+	"""
+	ICamera that captures in its own process and publishes frames through a
+	multiprocessing.shared_memory ring. Only slot indices and metadata cross the
+	process boundary; a slot is handed back once its Frame is released.
+	Each start() opens a new generation: slots leased before a stop() belong to the
+	old segment and are never handed to the new worker.
+	"""
+
+	def __init__(
+		self,
+		camera_index: int,
+		flip_method: int,
+		factory: CameraFactory | None = None,
+		slots: int | None = None,
+		timeout: float = 0.5,
+	) -> None:
+		from app.adapters.capturer.capturer_adapter import CapturerAdapter
+
+		self._camera_index = camera_index
+		self._factory: CameraFactory = factory or partial(
+			CapturerAdapter, camera_index, flip_method, isolated=False
+		)
+		self._slots: int = slots or Settings.capture.ring_slots
+		self._timeout = timeout
+		self._logger = Logger(name='process_adapter')
+		self._context = mp.get_context('spawn')
+		self._active = False
+		self._generation = 0
+		self._framerate: int = 0
+
+		self._process: mp.process.BaseProcess | None = None
+		self._shm: SharedMemory | None = None
+		self._shape: tuple[int, ...] = ()
+		self._pixel_format: PixelFormat = PixelFormat.BGR
+		self._frames: mp.Queue[tuple[int, float, int]] | None = None
+		self._free: mp.Queue[int] | None = None
+		self._stop: Event | None = None
+		self._dropped = self._context.Value('q', 0)
+
+		self._received = 0
+		self._reader_drops = 0
+		self._escaped = 0
+		metrics.collector(f'process_camera_{camera_index}', self._metrics)
+
+	def start(self) -> None:
+		if self._active:
+			return
+		ready_recv, ready_send = self._context.Pipe(duplex=False)
+		self._frames = self._context.Queue()
+		self._free = self._context.Queue()
+		self._stop = self._context.Event()
+		self._process = self._context.Process(
+			target=_capture_worker,
+			args=(self._factory, self._slots, ready_send, self._frames, self._free, self._stop, self._dropped),
+			name=f'capture_worker_{self._camera_index}',
+			daemon=True,
+		)
+		self._process.start()
+		if not ready_recv.poll(Settings.capture.start_timeout):
+			self._stop.set()
+			self._process.join(timeout=1.0)
+			raise RuntimeError(f'Capture worker for camera {self._camera_index} did not start')
+
+		name, shape, label, framerate = ready_recv.recv()
+		# El worker comparte el resource_tracker del padre y hace el unlink: aquí solo se adjunta
+		self._shm = SharedMemory(name=name)
+		self._shape = tuple(shape)
+		self._pixel_format = PixelFormat.from_label(label)
+		self._framerate = framerate
+		# El segmento ya existe: se carga sin posibilidad de rechazo
+		self._account = memory_budget.register(f'shm:camera_{self._camera_index}')
+		self._account.force(self._shm.size)
+		self._generation += 1
+		self._active = True
+		self._logger.info(f'Camera {self._camera_index} started in process {self._process.pid}')
+
+	def stop(self) -> None:
+		if not self._active:
+			return
+		self._active = False
+		assert self._stop is not None and self._process is not None
+		self._stop.set()
+		self._process.join(timeout=2.0)
+		if self._process.is_alive():
+			self._process.terminate()
+		if self._shm is not None:
+			try:
+				self._shm.close()
+			except BufferError:
+				self._logger.warning(f'Camera {self._camera_index} frames still alive at stop')
+			self._shm = None
+			self._account.close()
+		self._logger.info(f'Camera {self._camera_index} stopped')
+
+	def restart(self) -> None:
+		self.stop()
+		self.start()
+
+	def status(self) -> bool:
+		return self._active
+
+	def focus(self) -> None:
+		self._logger.info('Focus is handled by the capture worker')
+
+	def capture(self) -> Frame:
+		assert self._frames is not None and self._free is not None and self._shm is not None
+		slot, timestamp, _ = self._frames.get(timeout=self._timeout)
+		# Igual que la cola maxsize=1 de ICamera: solo interesa el último frame
+		while True:
+			try:
+				newer = self._frames.get_nowait()
+			except queue.Empty:
+				break
+			self._free.put(slot)
+			self._reader_drops += 1
+			slot, timestamp, _ = newer
+		self._received += 1
+		data = lease(_slot(self._shm, self._shape, slot), partial(self._release, self._generation, slot))
+		return Frame(data=data, timestamp=timestamp, format=self._pixel_format)
+
+	def read(self, buffer: NDArray[np.uint8] | None = None) -> tuple[bool, NDArray[np.uint8] | None]:
+		"""Copies the latest frame into `buffer` when its shape matches; the worker owns the device."""
+		try:
+			frame = self.capture()
+		except queue.Empty:
+			return False, None
+		if buffer is not None and buffer.shape == frame.data.shape:
+			np.copyto(buffer, frame.data)
+			return True, buffer
+		return True, frame.data.copy()
+
+	def frame_shape(self) -> tuple[int, ...]:
+		return self._shape
+
+	def pool_stats(self) -> FramePoolStats:
+		# Los frames viven en la memoria compartida del worker, no en un FramePool
+		return FramePoolStats(0, 0, self._escaped, 0, 0, 0, 0, 0)
+
+	def stats(self) -> ProcessCaptureStats:
+		return ProcessCaptureStats(
+			frames=self._received,
+			worker_drops=self._dropped.value,
+			reader_drops=self._reader_drops,
+			escaped=self._escaped,
+			slots=self._slots,
+			slot_bytes=int(np.prod(self._shape)) if self._shape else 0,
+		)
+
+	def _metrics(self) -> dict[str, float]:
+		stats = self.stats()
+		camera = self._camera_index
+		return {
+			metric_key('camera_frames_total', camera=camera): stats.frames,
+			metric_key('camera_worker_drops_total', camera=camera): stats.worker_drops,
+			metric_key('camera_reader_drops_total', camera=camera): stats.reader_drops,
+		}
+
+	def _pipeline(self) -> str:
+		return f'process:camera_{self._camera_index}'
+
+	def _release(self, generation: int, slot: int, _owner: NDArray[np.uint8], escaped: bool) -> None:
+		if escaped:
+			# Alguien conserva una vista del slot: no se puede reutilizar
+			self._escaped += 1
+			return
+		# Un slot de un worker anterior no existe en el actual: devolverlo duplicaría un slot vivo
+		if self._active and generation == self._generation and self._free is not None:
+			self._free.put(slot)
@@ -0,0 +1,4 @@
+from .classical_adapter import ClassicalTracker
+from .tracker_adapter import TrackerAdapter
+
+__all__ = ['ClassicalTracker', 'TrackerAdapter']
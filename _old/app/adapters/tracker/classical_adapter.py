@@ -0,0 +1,150 @@
+from math import pi
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from app.infra.logger import Logger
+from app.interfaces.tracker import ITracker
+from app.models.capturer import Frame
+from app.models.tracker import DetectionData
+from app.models.tracker.boundaries import Court, Point
+from app.models.tracker.detection import BallDetection, CourtDetection, PlayerDetections
+from app.services.tracker.court import CourtService, hsv
+from config.settings import Settings
+
+
+def _components(mask: NDArray[np.uint8]) -> tuple[int, NDArray[np.uint16], NDArray[np.int32], NDArray[np.float64]]:
+	# Etiquetas de 16 bits: un tercio del tiempo; con 8-conectividad caben si hay < 2*65535 píxeles
+	ltype = cv2.CV_16U if mask.size < 2 * 65535 else cv2.CV_32S
+	return cv2.connectedComponentsWithStats(mask, connectivity=8, ltype=ltype)
+
+
+class ClassicalTracker(ITracker):
+	"""
+	Model-free CPU detector on a copy of the frame `detect_width` pixels wide (a Frame
+	level, so it is shared with any other consumer of that size).
+	- Ball: yellow connected components scored by roundness and size, with a bonus for
+	  the pixels that differ from a running-average background.
+	- Players: large blobs of the background difference, reported at their feet.
+	- Court: served by a CourtService cache; its mask limits both searches to the court.
+	Every per-pixel step is one OpenCV call; per-component scoring is vectorized over the
+	stats arrays. Coordinates come back in pixels of the input frame.
+	Frames smaller than the first one (ROI crops) have no background: only the ball is searched.
+	"""
+
+	def __init__(self, name: str | None = None) -> None:
+		tracking = Settings.tracking
+		self.name = name or 'classical'
+		self.logger = Logger(name=f'classical_tracker_{self.name}')
+		self._width: int = tracking.detect_width
+		self._ball_low = np.array([tracking.ball_hue[0], tracking.ball_min_saturation, tracking.ball_min_value], dtype=np.uint8)
+		self._ball_high = np.array([tracking.ball_hue[1], 255, 255], dtype=np.uint8)
+		self._ball_size: tuple[float, float] = (
+			tracking.ball_size[0] * self._width,
+			tracking.ball_size[1] * self._width,
+		)
+		self._player_area: float = tracking.player_min_area
+		self._rate: float = tracking.background_rate
+		self._threshold: int = tracking.motion_threshold
+		self._kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+
+		self._full_size: tuple[int, int] | None = None
+		self._scale: float = 1.0  # px de trabajo por px de entrada
+		self._background: NDArray[np.uint8] | None = None
+		self.court = CourtService(name=self.name)
+		self._last_ball = Point(0.0, 0.0)
+
+	def start(self) -> None:
+		self.reset()
+		self.logger.info('Classical tracker %s started', self.name)
+
+	def stop(self) -> None:
+		self.reset()
+		self.logger.info('Classical tracker %s stopped', self.name)
+
+	def reset(self) -> None:
+		self._full_size = None
+		self._background = None
+		self.court.reset()
+
+	def detect(self, frame: Frame) -> DetectionData:
+		size = (frame.width, frame.height)
+		if self._full_size is None:
+			self._full_size = size
+			self._scale = min(1.0, self._width / frame.width)
+		full = size == self._full_size
+
+		work = frame.level(scale=self._scale) if self._scale < 1.0 else frame
+		image = hsv(work)
+		geometry = self.court.update(frame, image) if full else None
+		# Los recortes ROI ya están alrededor de la bola: la máscara solo aplica al frame completo
+		court_mask = self.court.mask((work.width, work.height)) if geometry is not None else None
+		motion = self._motion(image, court_mask) if full else None
+
+		ball = self._ball(image, motion, court_mask)
+		players = self._players(motion) if motion is not None else PlayerDetections()
+		court = geometry.detection if geometry is not None else self._unknown_court(frame)
+		return DetectionData(ball=ball, court=court, players=players)
+
+	def _motion(self, image: NDArray[np.uint8], court_mask: NDArray[np.uint8] | None) -> NDArray[np.uint8] | None:
+		"""On-court pixels whose brightness differs from the background; updates the background."""
+		value = cv2.extractChannel(image, 2)
+		if self._background is None:
+			self._background = value
+			return None
+		difference = cv2.absdiff(value, self._background)
+		_, moving = cv2.threshold(difference, self._threshold, 255, cv2.THRESH_BINARY)
+		cv2.addWeighted(value, self._rate, self._background, 1 - self._rate, 0, dst=self._background)
+		if court_mask is not None:
+			cv2.bitwise_and(moving, court_mask, dst=moving)
+		return moving
+
+	def _ball(
+		self, image: NDArray[np.uint8], motion: NDArray[np.uint8] | None, court_mask: NDArray[np.uint8] | None
+	) -> BallDetection:
+		mask = cv2.inRange(image, self._ball_low, self._ball_high)
+		if court_mask is not None:
+			cv2.bitwise_and(mask, court_mask, dst=mask)
+		count, labels, stats, centroids = _components(mask)
+		if count < 2:
+			return BallDetection(self._last_ball, 0.0)
+
+		width, height, area = stats[1:, cv2.CC_STAT_WIDTH], stats[1:, cv2.CC_STAT_HEIGHT], stats[1:, cv2.CC_STAT_AREA]
+		diameter = np.maximum(width, height)
+		# Un disco lleno ocupa pi/4 de su caja; la caja de una bola es cuadrada
+		roundness = np.minimum(area / (pi / 4 * width * height), 1.0)
+		squareness = np.minimum(width, height) / diameter
+		score = roundness * squareness
+		score[(diameter < self._ball_size[0]) | (diameter > self._ball_size[1])] = 0.0
+		if motion is not None:
+			moving = np.bincount(labels[motion > 0], minlength=count)[1:] / area
+			score *= 0.6 + 0.4 * moving
+
+		best = int(np.argmax(score))
+		if score[best] <= 0.0:
+			return BallDetection(self._last_ball, 0.0)
+		x, y = centroids[best + 1]
+		self._last_ball = Point(float(x / self._scale), float(y / self._scale))
+		return BallDetection(self._last_ball, float(score[best]))
+
+	def _players(self, motion: NDArray[np.uint8]) -> PlayerDetections:
+		# Un jugador ocupa decenas de píxeles de trabajo: basta la máscara a la mitad
+		height, width = motion.shape
+		blobs = cv2.resize(motion, (width // 2, height // 2), interpolation=cv2.INTER_AREA)
+		cv2.morphologyEx(blobs, cv2.MORPH_CLOSE, self._kernel, dst=blobs)
+		_, _, stats, _ = _components(blobs)
+		stats = stats[1:]
+		width, height, area = stats[:, cv2.CC_STAT_WIDTH], stats[:, cv2.CC_STAT_HEIGHT], stats[:, cv2.CC_STAT_AREA]
+		# De pie: más alto que ancho; se descartan la bola y el ruido por área
+		keep = (area >= self._player_area * blobs.size) & (height >= 0.8 * width)
+		boxes = stats[keep, :4] * (2 / self._scale)
+		feet = boxes[:, :2] + boxes[:, 2:] * (0.5, 1.0)
+		fill = np.minimum(area[keep] / (width[keep] * height[keep]) / 0.5, 1.0)
+		return PlayerDetections(feet, fill, boxes)
+
+	def _unknown_court(self, frame: Frame) -> CourtDetection:
+		right, bottom = float(frame.width), float(frame.height)
+		return CourtDetection(
+			Court(Point(0.0, 0.0), Point(right, 0.0), Point(0.0, bottom), Point(right, bottom)), 0.0
+		)
@@ -0,0 +1,13 @@
+from app.interfaces.tracker import ITracker
+from config.settings import Settings
+
+
+def TrackerAdapter(camera_index: int) -> ITracker:
+	detector = Settings.tracking.detector
+	match detector:
+		case 'classical':
+			from app.adapters.tracker.classical_adapter import ClassicalTracker
+
+			return ClassicalTracker(name=f'camera_{camera_index}')
+		case _:
+			raise ValueError(f'Unsupported detector: {detector}')
@@ -1,3 +1,3 @@
-from .loger_adapter import Logger
+from .loger_adapter import LogLevel, Logger
 
-__all__ = ['Logger']
+__all__ = ['Logger', 'LogLevel']
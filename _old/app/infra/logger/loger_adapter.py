@@ -1,6 +1,13 @@
+import atexit
 import logging
+import queue
+import sys
+import threading
+from collections.abc import Callable
 from enum import Enum
 
+from config.settings import Settings
+
 
 class LogLevel(Enum):
 	INFO = ('INFO', logging.INFO, '\033[92m')
@@ -13,34 +20,167 @@ class LogLevel(Enum):
 		self.log_level = log_level
 		self.color = color
 
+	@classmethod
+	def from_label(cls, label: str) -> 'LogLevel':
+		for level in cls:
+			if level.label == label.upper():
+				return level
+		raise ValueError(f'Unknown log level: {label}')
+
+
+# Marcador de flush(): el writer lo activa al llegar a él, sin detenerse
+_Drain = threading.Event
+
+
+class _LogWriter:
+	"""
+	Single background thread that prints log lines. Producers format their record (so
+	mutable arguments are rendered at call time, on the calling thread) and only do a
+	put_nowait() of the finished string on a bounded queue, so a slow stdout/journal never
+	stalls a capture or encode thread; lines that do not fit are counted and dropped.
+	Records that fail to format are counted apart and leave a one-line trace on stderr.
+	"""
+
+	def __init__(self, maxsize: int) -> None:
+		self._queue: queue.Queue[str | _Drain | None] = queue.Queue(maxsize=maxsize)
+		self._lock = threading.Lock()
+		self._thread: threading.Thread | None = None
+		# Varios productores cuentan a la vez: += no es atómico
+		self._counts_lock = threading.Lock()
+		self.dropped = 0
+		self.failed = 0
+
+	def submit(self, level: LogLevel, name: str | None, msg: object, args: tuple[object, ...]) -> None:
+		# msg puede ser un callable: solo se evalúa aquí, con el nivel ya habilitado
+		try:
+			line = _format(level, name, msg, args)
+		except Exception as error:  # noqa: BLE001 - un mensaje roto no debe romper a quien loguea
+			with self._counts_lock:
+				self.failed += 1
+			sys.stderr.write(f'log record {level.label} [{name}] {msg!r} could not be formatted: {error!r}\n')
+			return
+		if self._thread is None or not self._thread.is_alive():
+			self._start()
+		try:
+			self._queue.put_nowait(line)
+		except queue.Full:
+			self._drop()
+
+	def flush(self, timeout: float = 1.0) -> None:
+		"""Waits until every line queued so far has been written; the writer keeps running."""
+		thread = self._thread
+		if thread is None or not thread.is_alive():
+			return
+		drained = _Drain()
+		try:
+			self._queue.put(drained, timeout=timeout)
+		except queue.Full:
+			return
+		drained.wait(timeout)
+
+	def close(self, timeout: float = 1.0) -> None:
+		"""Writes what is queued and stops the writer (at exit)."""
+		thread = self._thread
+		if thread is None or not thread.is_alive():
+			return
+		try:
+			self._queue.put(None, timeout=timeout)
+		except queue.Full:
+			return
+		thread.join(timeout=timeout)
+		with self._lock:
+			# Solo se olvida el hilo si de verdad terminó: otro writer en paralelo desordenaría la salida
+			if self._thread is thread and not thread.is_alive():
+				self._thread = None
+
+	def _start(self) -> None:
+		with self._lock:
+			if self._thread is None or not self._thread.is_alive():
+				self._thread = threading.Thread(target=self._run, name='log_writer', daemon=True)
+				self._thread.start()
+
+	def _drop(self) -> None:
+		with self._counts_lock:
+			self.dropped += 1
+
+	def _run(self) -> None:
+		while True:
+			line = self._queue.get()
+			if line is None:
+				break
+			if isinstance(line, _Drain):
+				sys.stdout.flush()
+				line.set()
+				continue
+			try:
+				sys.stdout.write(line + '\n')
+				if self._queue.empty():
+					sys.stdout.flush()
+			except Exception:  # noqa: BLE001 - un stdout roto no debe matar el writer
+				self._drop()
+
+
+def _format(level: LogLevel, name: str | None, msg: object, args: tuple[object, ...]) -> str:
+	endc = '\033[0m'
+	if callable(msg):
+		msg = msg()
+	if args:
+		msg = str(msg) % args
+	name_str = f'[{name}] ' if name else ''
+	return f'{level.color}{level.label}{endc}: {name_str}{msg}'
+
+
+_writer = _LogWriter(maxsize=Settings.log.queue_size)
+atexit.register(_writer.close)
+
 
 class Logger:
+	"""
+	Printf-style lazy logger: `logger.debug('camera %d retval %s', idx, retval)` or
+	`logger.debug(lambda: ...)` costs one level check when DEBUG is disabled.
+	"""
+
+	level: LogLevel = LogLevel.from_label(Settings.log.level)
+
 	def __init__(self, name: str | None = None) -> None:
 		name_logger = 'uvicorn.error'
 		self.logger = logging.getLogger(name_logger)
-		self.logger.setLevel(LogLevel.INFO.log_level)
+		self.logger.setLevel(self.level.log_level)
 		self.name = name
 
-	def _format_msg(self, level: LogLevel, msg: object, args: tuple[object, ...]) -> str:
-		endc = '\033[0m'
-		args_str = f' {args}' if args else ''
-		name_str = f'[{self.name}] ' if self.name else ''
-		return f'{level.color}{level.label}{endc}: {name_str}{msg}{args_str}'
+	@classmethod
+	def set_level(cls, level: LogLevel) -> None:
+		cls.level = level
+
+	@classmethod
+	def dropped(cls) -> int:
+		return _writer.dropped
+
+	@classmethod
+	def failed(cls) -> int:
+		return _writer.failed
+
+	@classmethod
+	def flush(cls) -> None:
+		_writer.flush()
+
+	def enabled(self, level: LogLevel) -> bool:
+		return level.log_level >= self.level.log_level
 
-	def _log(self, level: LogLevel, msg: object, *args: object) -> None:
-		#self.logger.log(level.log_level, msg, *args)
-		print(self._format_msg(level, msg, args), 
-		flush=True)
+	def _log(self, level: LogLevel, msg: object | Callable[[], object], *args: object) -> None:
+		if level.log_level < self.level.log_level:
+			return
+		_writer.submit(level, self.name, msg, args)
 
 	# Optional convenience methods
-	def info(self, msg: object, *args: object) -> None:
+	def info(self, msg: object | Callable[[], object], *args: object) -> None:
 		self._log(LogLevel.INFO, msg, *args)
 
-	def error(self, msg: object, *args: object) -> None:
+	def error(self, msg: object | Callable[[], object], *args: object) -> None:
 		self._log(LogLevel.ERROR, msg, *args)
 
-	def warning(self, msg: object, *args: object) -> None:
+	def warning(self, msg: object | Callable[[], object], *args: object) -> None:
 		self._log(LogLevel.WARNING, msg, *args)
 
-	def debug(self, msg: object, *args: object) -> None:
+	def debug(self, msg: object | Callable[[], object], *args: object) -> None:
 		self._log(LogLevel.DEBUG, msg, *args)
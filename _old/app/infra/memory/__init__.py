@@ -0,0 +1,4 @@
+from .budget import MemoryAccount, MemoryBudget, memory_budget
+from .frame_pool import FramePool, lease, leased
+
+__all__ = ['FramePool', 'MemoryAccount', 'MemoryBudget', 'lease', 'leased', 'memory_budget']
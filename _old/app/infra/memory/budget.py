@@ -0,0 +1,143 @@
+import threading
+import weakref
+from collections.abc import Callable
+
+from app.models.memory import MemoryAccountStats, MemoryBudgetStats
+from config.settings import Settings
+
+# Recibe los bytes que hay que liberar y devuelve los que liberó
+Reclaimer = Callable[[int], int]
+
+
+class MemoryAccount:
+	"""Bytes held by one frame-holding component, charged against a MemoryBudget."""
+
+	def __init__(self, budget: 'MemoryBudget', name: str, reclaim: Reclaimer | None) -> None:
+		self.name = name
+		self._budget = budget
+		# Referencia débil a los métodos: la cuenta no debe mantener vivo a su dueño
+		self._reclaim: Callable[[], Reclaimer | None] | None = None
+		if reclaim is not None:
+			self._reclaim = weakref.WeakMethod(reclaim) if hasattr(reclaim, '__self__') else lambda: reclaim
+		self.current = 0
+		self.peak = 0
+		self.refused = 0
+		self.closed = False
+
+	def charge(self, nbytes: int) -> bool:
+		"""
+		Charges `nbytes` if they fit, asking the other accounts to reclaim first when
+		they do not. Returns False (and charges nothing) when the budget is exhausted;
+		the caller then applies its drop policy.
+		"""
+		return self._budget._charge(self, nbytes, force=False)
+
+	def force(self, nbytes: int) -> None:
+		"""Charges memory that is already allocated and cannot be refused."""
+		self._budget._charge(self, nbytes, force=True)
+
+	def release(self, nbytes: int) -> None:
+		self._budget._release(self, nbytes)
+
+	def close(self) -> None:
+		self._budget.unregister(self)
+
+	def stats(self) -> MemoryAccountStats:
+		return MemoryAccountStats(name=self.name, current=self.current, peak=self.peak, refused=self.refused)
+
+
+class MemoryBudget:
+	"""
+	Global byte budget for frame queues, rings and pools. Reclaimers run outside the
+	budget lock, so a component may take its own lock inside them.
+	"""
+
+	def __init__(self, limit: int) -> None:
+		self.limit = limit
+		self._lock = threading.Lock()
+		self._accounts: list[MemoryAccount] = []
+		self._current = 0
+		self._peak = 0
+		self._refused = 0
+		self._reclaimed = 0
+
+	def register(self, name: str, reclaim: Reclaimer | None = None, owner: object | None = None) -> MemoryAccount:
+		"""New account; with `owner` it is closed automatically when the owner is collected."""
+		account = MemoryAccount(self, name, reclaim)
+		with self._lock:
+			self._accounts.append(account)
+		if owner is not None:
+			weakref.finalize(owner, account.close)
+		return account
+
+	def unregister(self, account: MemoryAccount) -> None:
+		with self._lock:
+			if account in self._accounts:
+				self._accounts.remove(account)
+				self._current -= account.current
+			account.current = 0
+			account.closed = True
+
+	@property
+	def current(self) -> int:
+		return self._current
+
+	def stats(self) -> MemoryBudgetStats:
+		with self._lock:
+			return MemoryBudgetStats(
+				limit=self.limit,
+				current=self._current,
+				peak=self._peak,
+				refused=self._refused,
+				reclaimed=self._reclaimed,
+				accounts=tuple(account.stats() for account in self._accounts),
+			)
+
+	def reclaim(self, nbytes: int, exclude: MemoryAccount | None = None) -> int:
+		"""Asks the accounts holding the most memory to free `nbytes` in total."""
+		with self._lock:
+			candidates = sorted(
+				(a for a in self._accounts if a._reclaim is not None and a is not exclude and a.current),
+				key=lambda a: a.current,
+				reverse=True,
+			)
+		freed = 0
+		for account in candidates:
+			if freed >= nbytes:
+				break
+			assert account._reclaim is not None
+			reclaimer = account._reclaim()
+			if reclaimer is not None:
+				freed += reclaimer(nbytes - freed)
+		with self._lock:
+			self._reclaimed += freed
+		return freed
+
+	def _charge(self, account: MemoryAccount, nbytes: int, force: bool) -> bool:
+		for attempt in range(2):
+			with self._lock:
+				if account.closed:
+					return force
+				overage = self._current + nbytes - self.limit
+				if force or overage <= 0 or attempt:
+					if not force and overage > 0:
+						account.refused += 1
+						self._refused += 1
+						return False
+					account.current += nbytes
+					account.peak = max(account.peak, account.current)
+					self._current += nbytes
+					self._peak = max(self._peak, self._current)
+					return True
+			self.reclaim(overage, exclude=account)
+		return False
+
+	def _release(self, account: MemoryAccount, nbytes: int) -> None:
+		with self._lock:
+			if account.closed:
+				return
+			account.current -= nbytes
+			self._current -= nbytes
+
+
+memory_budget = MemoryBudget(limit=Settings.memory.budget_mb * 1024 * 1024)
@@ -0,0 +1,184 @@
+import sys
+import threading
+import weakref
+from collections import deque
+from collections.abc import Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from app.models.capturer import FramePoolStats
+
+from .budget import MemoryBudget, memory_budget
+
+
+def _finalizer_refs() -> int:
+	# Referencias que mantiene weakref.finalize sobre el buffer dueño mientras corre el callback.
+	seen: list[int] = []
+	owner = np.empty(1, dtype=np.uint8)
+	view = owner.view()
+	weakref.finalize(view, lambda buffer: seen.append(sys.getrefcount(buffer)), owner)
+	del owner
+	del view
+	return seen[0]
+
+
+_FINALIZER_REFS: int = _finalizer_refs()
+# id del buffer dueño -> vistas prestadas vivas; el finalizador mantiene vivo al dueño, así que el id no se reutiliza
+_leases: dict[int, int] = {}
+_leases_lock = threading.Lock()
+
+
+def lease(
+	owner: NDArray[np.uint8], on_release: Callable[[NDArray[np.uint8], bool], None]
+) -> NDArray[np.uint8]:
+	"""
+	Returns a view of `owner` and calls `on_release(owner, escaped)` once the view is gone.
+	`escaped` is True when some other array (a slice, or another Frame built from the same
+	data) still references `owner`, in which case it must not be reused.
+	"""
+	view = owner.view()
+	with _leases_lock:
+		_leases[id(owner)] = _leases.get(id(owner), 0) + 1
+	weakref.finalize(view, _release, owner, on_release)
+	return view
+
+
+def leased(data: NDArray[np.uint8]) -> bool:
+	"""
+	True when `data` is (a view of) a leased buffer. Its bytes are already charged to the
+	account of whoever leased it, so holders such as rings must not charge them again.
+	"""
+	base: object = data
+	while isinstance(base, np.ndarray):
+		if id(base) in _leases:
+			return True
+		base = base.base
+	return False
+
+
+def _release(
+	owner: NDArray[np.uint8], on_release: Callable[[NDArray[np.uint8], bool], None]
+) -> None:
+	with _leases_lock:
+		count = _leases.pop(id(owner)) - 1
+		if count:
+			_leases[id(owner)] = count
+	escaped = sys.getrefcount(owner) > _FINALIZER_REFS
+	on_release(owner, escaped)
+
+
+class FramePool:
+	def __init__(
+		self,
+		shape: tuple[int, ...],
+		dtype: type[np.uint8] = np.uint8,
+		capacity: int = 4,
+		name: str | None = None,
+		budget: MemoryBudget | None = None,
+	) -> None:
+		self.name = name
+		self._shape: tuple[int, ...] = shape
+		self._dtype = np.dtype(dtype)
+		self._capacity: int = capacity
+		self._free: deque[NDArray[np.uint8]] = deque()
+		self._lock = threading.Lock()
+
+		self._hits = 0
+		self._misses = 0
+		self._escaped = 0
+		self._refused = 0
+		self._live_buffers = 0
+		self._live_bytes = 0
+		self._account = (budget or memory_budget).register(
+			f'pool:{name or hex(id(self))}', reclaim=self._trim, owner=self
+		)
+
+	@property
+	def shape(self) -> tuple[int, ...]:
+		return self._shape
+
+	def resize(self, shape: tuple[int, ...]) -> None:
+		with self._lock:
+			if shape == self._shape:
+				return
+			self._shape = shape
+			idle = self._drain_idle()
+		self._account.release(idle)
+
+	def acquire(self) -> NDArray[np.uint8] | None:
+		"""
+		Returns a buffer of the pool shape. It goes back to the pool when every reference
+		to it (the Frame holding it and any slice of it) has been dropped.
+		Returns None when a new buffer is needed and the memory budget refuses it.
+		"""
+		with self._lock:
+			owner = self._free.pop() if self._free else None
+			shape = self._shape
+		if owner is None:
+			# El cargo se hace fuera del lock: el presupuesto puede llamar a _trim de otros pools
+			if not self._account.charge(int(np.prod(shape)) * self._dtype.itemsize):
+				with self._lock:
+					self._refused += 1
+				return None
+			owner = np.empty(shape, dtype=self._dtype)
+			hit = False
+		else:
+			hit = True
+		with self._lock:
+			if hit:
+				self._hits += 1
+			else:
+				self._misses += 1
+			self._live_buffers += 1
+			self._live_bytes += owner.nbytes
+		return lease(owner, self._recycle)
+
+	def clear(self) -> None:
+		with self._lock:
+			idle = self._drain_idle()
+		self._account.release(idle)
+
+	def close(self) -> None:
+		self.clear()
+		self._account.close()
+
+	def stats(self) -> FramePoolStats:
+		with self._lock:
+			idle_buffers = len(self._free)
+			idle_bytes = sum(buffer.nbytes for buffer in self._free)
+			return FramePoolStats(
+				hits=self._hits,
+				misses=self._misses,
+				escaped=self._escaped,
+				refused=self._refused,
+				live_buffers=self._live_buffers,
+				live_bytes=self._live_bytes,
+				idle_buffers=idle_buffers,
+				idle_bytes=idle_bytes,
+			)
+
+	def _recycle(self, owner: NDArray[np.uint8], escaped: bool) -> None:
+		with self._lock:
+			self._live_buffers -= 1
+			self._live_bytes -= owner.nbytes
+			if escaped:
+				self._escaped += 1
+			elif owner.shape == self._shape and len(self._free) < self._capacity:
+				self._free.append(owner)
+				return
+		# El buffer sale del pool: deja de contar para el presupuesto
+		self._account.release(owner.nbytes)
+
+	def _drain_idle(self) -> int:
+		idle = sum(buffer.nbytes for buffer in self._free)
+		self._free.clear()
+		return idle
+
+	def _trim(self, nbytes: int) -> int:
+		freed = 0
+		with self._lock:
+			while self._free and freed < nbytes:
+				freed += self._free.popleft().nbytes
+		self._account.release(freed)
+		return freed
@@ -0,0 +1,14 @@
+from .registry import LATENCY_BUCKETS, Counter, Gauge, Histogram, MetricsRegistry, metric_key, metrics
+from .server import MetricsServer, serve_metrics
+
+__all__ = [
+	'Counter',
+	'Gauge',
+	'Histogram',
+	'LATENCY_BUCKETS',
+	'MetricsRegistry',
+	'MetricsServer',
+	'metric_key',
+	'metrics',
+	'serve_metrics',
+]
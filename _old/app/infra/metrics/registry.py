@@ -0,0 +1,172 @@
+import bisect
+import json
+import threading
+from collections.abc import Callable, Sequence
+from typing import TypeVar
+
+import numpy as np
+from numpy.typing import NDArray
+
+Labels = tuple[tuple[str, str], ...]
+# Devuelve {nombre: valor} en el momento del snapshot (p. ej. stats de pools o del presupuesto)
+Collector = Callable[[], dict[str, float]]
+
+# Segundos: de 0.5 ms a 1 s, suficiente para latencias de etapa y de tick
+LATENCY_BUCKETS: tuple[float, ...] = (
+	0.0005, 0.001, 0.002, 0.004, 0.008, 0.016, 0.033, 0.066, 0.1, 0.25, 0.5, 1.0,
+)
+
+
+def _key(name: str, labels: Labels) -> str:
+	if not labels:
+		return name
+	return name + '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+
+def _finite(value: float) -> float | None:
+	return value if value != float('inf') else None
+
+
+def metric_key(name: str, **labels: object) -> str:
+	"""Exposition key for collector values, e.g. pool_live_bytes{camera="0"}."""
+	return _key(name, tuple((k, str(v)) for k, v in sorted(labels.items())))
+
+
+class Counter:
+	__slots__ = ('key', 'value')
+
+	def __init__(self, key: str) -> None:
+		self.key = key
+		self.value = 0
+
+	def inc(self, amount: int = 1) -> None:
+		# Un solo hilo escribe cada métrica; con el GIL basta con la asignación
+		self.value += amount
+
+
+class Gauge:
+	__slots__ = ('key', 'value')
+
+	def __init__(self, key: str) -> None:
+		self.key = key
+		self.value = 0.0
+
+	def set(self, value: float) -> None:
+		self.value = value
+
+
+class Histogram:
+	"""Fixed buckets over a preallocated count array; observe() never allocates."""
+
+	__slots__ = ('key', 'bounds', 'counts', 'count', 'sum')
+
+	def __init__(self, key: str, bounds: Sequence[float]) -> None:
+		self.key = key
+		self.bounds: tuple[float, ...] = tuple(sorted(bounds))
+		self.counts: NDArray[np.int64] = np.zeros(len(self.bounds) + 1, dtype=np.int64)
+		self.count = 0
+		self.sum = 0.0
+
+	def observe(self, value: float) -> None:
+		self.counts[bisect.bisect_left(self.bounds, value)] += 1
+		self.count += 1
+		self.sum += value
+
+	def quantile(self, q: float) -> float:
+		"""Upper bound of the bucket holding the q-quantile (inf for the overflow bucket)."""
+		if not self.count:
+			return 0.0
+		index = int(np.searchsorted(np.cumsum(self.counts), q * self.count))
+		return self.bounds[index] if index < len(self.bounds) else float('inf')
+
+
+_Metric = TypeVar('_Metric', Counter, Gauge)
+
+
+class MetricsRegistry:
+	def __init__(self) -> None:
+		self._lock = threading.Lock()
+		self._counters: dict[str, Counter] = {}
+		self._gauges: dict[str, Gauge] = {}
+		self._histograms: dict[str, Histogram] = {}
+		self._collectors: dict[str, Collector] = {}
+
+	def counter(self, name: str, **labels: object) -> Counter:
+		return self._get(self._counters, Counter, name, labels)
+
+	def gauge(self, name: str, **labels: object) -> Gauge:
+		return self._get(self._gauges, Gauge, name, labels)
+
+	def histogram(self, name: str, bounds: Sequence[float] = LATENCY_BUCKETS, **labels: object) -> Histogram:
+		key = metric_key(name, **labels)
+		with self._lock:
+			if key not in self._histograms:
+				self._histograms[key] = Histogram(key, bounds)
+			return self._histograms[key]
+
+	def collector(self, name: str, collect: Collector) -> None:
+		"""Registers (or replaces) a callable sampled into the gauges on every snapshot."""
+		with self._lock:
+			self._collectors[name] = collect
+
+	def remove_collector(self, name: str) -> None:
+		with self._lock:
+			self._collectors.pop(name, None)
+
+	def snapshot(self) -> dict[str, dict[str, object]]:
+		with self._lock:
+			counters = list(self._counters.values())
+			gauges = list(self._gauges.values())
+			histograms = list(self._histograms.values())
+			collectors = list(self._collectors.values())
+
+		gauge_values: dict[str, object] = {gauge.key: gauge.value for gauge in gauges}
+		for collect in collectors:
+			gauge_values.update(collect())
+		return {
+			'counters': {counter.key: counter.value for counter in counters},
+			'gauges': gauge_values,
+			'histograms': {
+				histogram.key: {
+					'count': histogram.count,
+					'sum': histogram.sum,
+					'p50': _finite(histogram.quantile(0.5)),
+					'p99': _finite(histogram.quantile(0.99)),
+					'buckets': dict(zip([*map(str, histogram.bounds), '+Inf'], histogram.counts.tolist())),
+				}
+				for histogram in histograms
+			},
+		}
+
+	def to_json(self) -> str:
+		return json.dumps(self.snapshot(), indent=2)
+
+	def to_text(self) -> str:
+		"""Prometheus-like text exposition."""
+		snapshot = self.snapshot()
+		lines: list[str] = []
+		for key, value in {**snapshot['counters'], **snapshot['gauges']}.items():
+			lines.append(f'{key} {value}')
+		for key, data in snapshot['histograms'].items():
+			assert isinstance(data, dict)
+			name, _, labels = key.partition('{')
+			labels = labels.rstrip('}')
+			cumulative = 0
+			for bound, count in data['buckets'].items():
+				cumulative += count
+				bucket_labels = ','.join(filter(None, (labels, f'le="{bound}"')))
+				lines.append(f'{name}_bucket{{{bucket_labels}}} {cumulative}')
+			suffix = f'{{{labels}}}' if labels else ''
+			lines.append(f'{name}_count{suffix} {data["count"]}')
+			lines.append(f'{name}_sum{suffix} {data["sum"]}')
+		return '\n'.join(lines) + '\n'
+
+	def _get(self, metrics: dict[str, _Metric], kind: type[_Metric], name: str, labels: dict[str, object]) -> _Metric:
+		key = metric_key(name, **labels)
+		with self._lock:
+			if key not in metrics:
+				metrics[key] = kind(key)
+			return metrics[key]
+
+
+metrics = MetricsRegistry()
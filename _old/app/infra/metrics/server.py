@@ -0,0 +1,73 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.infra.logger import Logger
+
+from .registry import MetricsRegistry, metrics
+
+
+class MetricsServer:
+	"""Local exposition endpoint: GET /metrics (text) and /metrics.json."""
+
+	def __init__(self, host: str, port: int, registry: MetricsRegistry | None = None) -> None:
+		self.host = host
+		self.port = port
+		self.registry = registry or metrics
+		self.logger = Logger(name='metrics_server')
+		self._server: ThreadingHTTPServer | None = None
+		self._thread: threading.Thread | None = None
+
+	def start(self) -> None:
+		if self._server is not None:
+			return
+		registry = self.registry
+
+		class Handler(BaseHTTPRequestHandler):
+			def do_GET(self) -> None:  # noqa: N802
+				match self.path:
+					case '/metrics':
+						body, content_type = registry.to_text(), 'text/plain; version=0.0.4'
+					case '/metrics.json':
+						body, content_type = registry.to_json(), 'application/json'
+					case _:
+						self.send_error(404)
+						return
+				payload = body.encode()
+				self.send_response(200)
+				self.send_header('Content-Type', content_type)
+				self.send_header('Content-Length', str(len(payload)))
+				self.end_headers()
+				self.wfile.write(payload)
+
+			def log_message(self, format: str, *args: object) -> None:
+				pass
+
+		try:
+			self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+		except OSError as e:
+			self.logger.warning('Metrics endpoint not started on %s:%d: %s', self.host, self.port, e)
+			return
+		self._server.daemon_threads = True
+		self._thread = threading.Thread(target=self._server.serve_forever, name='metrics_server', daemon=True)
+		self._thread.start()
+		self.logger.info('Metrics endpoint on http://%s:%d/metrics', self.host, self.port)
+
+	def stop(self) -> None:
+		if self._server is None:
+			return
+		self._server.shutdown()
+		self._server.server_close()
+		self._server = None
+		self._thread = None
+
+
+_server: MetricsServer | None = None
+
+
+def serve_metrics(host: str, port: int) -> MetricsServer:
+	"""Starts the process-wide metrics endpoint once."""
+	global _server
+	if _server is None:
+		_server = MetricsServer(host, port)
+		_server.start()
+	return _server
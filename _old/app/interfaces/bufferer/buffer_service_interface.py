@@ -1,12 +1,16 @@
 from abc import ABC, abstractmethod
 from collections.abc import Generator
+from typing import TYPE_CHECKING
 
 from app.models.capturer.frame_model import Frame
 
+if TYPE_CHECKING:
+	from app.services.bufferer import FrameCursor
+
 
 class IBufferService(ABC):
 	@abstractmethod
-	def buffer(self, feed: Generator[Frame, None, None]) -> Generator[Frame, None, None]: ...
+	def buffer(self, feed: 'Generator[Frame, None, None] | FrameCursor') -> Generator[Frame, None, None]: ...
 
 	@abstractmethod
 	def start(self) -> None: ...
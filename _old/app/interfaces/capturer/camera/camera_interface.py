@@ -5,9 +5,13 @@ from abc import ABC, abstractmethod
 from typing import Final
 
 import cv2 as cv
+import numpy as np
+from numpy.typing import NDArray
 
 from app.infra.logger import Logger
-from app.models.capturer import CaptureFormat, Frame
+from app.infra.memory import FramePool
+from app.infra.metrics import metric_key, metrics
+from app.models.capturer import CaptureFormat, Frame, FramePoolStats, PixelFormat
 from config.settings import Settings
 
 from .lense_interface import ILense
@@ -24,6 +28,7 @@ class ICamera(ABC):
 		sensor: ISensor,
 		lense: ILense,
 		timeout: float = 0.5,
+		pool_capacity: int = 4,
 	) -> None:
 		self._active: bool = False
 		self._camera_index: int = camera_index
@@ -37,11 +42,24 @@ class ICamera(ABC):
 		self._capture_width: int = self._sensor.resolution[0]
 		self._capture_height: int = self._sensor.resolution[1]
 		self._format: CaptureFormat = self._sensor.format
+		self._pixel_format: PixelFormat = self._output_format()
 
 		self._timeout: float = timeout
 		self._frame_queue: queue.Queue[Frame] = queue.Queue(maxsize=1)
 		self._thread: threading.Thread | None = None
-		self._capturer = cv.VideoCapture(self._pipeline(), cv.CAP_GSTREAMER)
+		self._frame_pool: Final[FramePool] = FramePool(
+			shape=self._frame_shape(),
+			capacity=pool_capacity,
+			name=f'camera_{self._camera_index}',
+		)
+		self._capturer = self._open_capturer()
+
+		self._frames_total = metrics.counter('camera_frames_total', camera=camera_index)
+		self._errors_total = metrics.counter('camera_capture_errors_total', camera=camera_index)
+		self._queue_drops_total = metrics.counter('camera_queue_drops_total', camera=camera_index)
+		self._budget_drops_total = metrics.counter('camera_budget_drops_total', camera=camera_index)
+		self._read_seconds = metrics.histogram('camera_read_seconds', camera=camera_index)
+		metrics.collector(f'camera_{camera_index}_pool', self._pool_metrics)
 		self._logger.info(f'Camera {self._camera_index} initialized')
 		self._logger.debug(f'Camera {self._camera_index} pipeline: {self._pipeline()}')
 		self._logger.debug(f'Camera {self._camera_index} capturer: {self._capturer}')
@@ -69,6 +87,24 @@ class ICamera(ABC):
 	def status(self) -> bool:
 		return self._active
 
+	def pool_stats(self) -> FramePoolStats:
+		return self._frame_pool.stats()
+
+	@property
+	def pixel_format(self) -> PixelFormat:
+		return self._pixel_format
+
+	@property
+	def framerate(self) -> int:
+		return self._framerate
+
+	def frame_shape(self) -> tuple[int, ...]:
+		return self._frame_shape()
+
+	def read(self, buffer: NDArray[np.uint8] | None = None) -> tuple[bool, NDArray[np.uint8] | None]:
+		"""Reads one frame into `buffer` when its shape matches, bypassing the capture thread."""
+		return self._capturer.read(buffer)
+
 	@abstractmethod
 	def focus(self) -> None: ...
 
@@ -77,24 +113,63 @@ class ICamera(ABC):
 
 	def _capture(self) -> None:
 		while self._active:
-			retval, data = self._capturer.read()
-			self._logger.debug(f'Camera {self._camera_index} capture retval: {retval} data: {type(data)}')
+			buffer = self._frame_pool.acquire()
+			if buffer is None:
+				# Presupuesto de memoria agotado: se descarta el frame en vez de reservar otro buffer
+				self._budget_drops_total.inc()
+				self._logger.warning('Camera %d frame dropped: memory budget exhausted', self._camera_index)
+				time.sleep(1 / self._framerate)
+				continue
+			t0 = time.perf_counter()
+			retval, data = self.read(buffer)
+			self._read_seconds.observe(time.perf_counter() - t0)
+			self._logger.debug('Camera %d capture retval: %s data: %s', self._camera_index, retval, type(data))
 			if not retval:
-				self._logger.error(f'Failed to capture frame from camera {self._camera_index}')
+				self._errors_total.inc()
+				self._logger.error('Failed to capture frame from camera %d', self._camera_index)
 				time.sleep(1 / self._framerate)
 				continue
+			if data is not buffer:
+				# El pipeline entregó otra geometría: el pool se adapta para el próximo frame
+				self._frame_pool.resize(data.shape)
 
-			frame = Frame(data=data, timestamp=time.time())
+			frame = Frame(data=data, timestamp=time.time(), format=self._pixel_format)
+			self._frames_total.inc()
 
 			try:
 				self._frame_queue.put(frame, timeout=self._timeout)
 			except queue.Full:
+				self._queue_drops_total.inc()
 				try:
 					_ = self._frame_queue.get_nowait()
 					self._frame_queue.put(frame, timeout=self._timeout)
 				except queue.Empty:
 					pass
-				self._logger.warning(f'Frame queue is empty for camera {self._camera_index}')
+				self._logger.warning('Frame queue is empty for camera %d', self._camera_index)
+
+	def _pool_metrics(self) -> dict[str, float]:
+		stats = self._frame_pool.stats()
+		camera = self._camera_index
+		return {
+			metric_key('camera_pool_live_bytes', camera=camera): stats.live_bytes,
+			metric_key('camera_pool_idle_bytes', camera=camera): stats.idle_bytes,
+			metric_key('camera_pool_escaped', camera=camera): stats.escaped,
+			metric_key('camera_pool_refused', camera=camera): stats.refused,
+			metric_key('camera_queue_depth', camera=camera): self._frame_queue.qsize(),
+		}
+
+	def _open_capturer(self) -> cv.VideoCapture:
+		capturer = cv.VideoCapture(self._pipeline(), cv.CAP_GSTREAMER)
+		if self._pixel_format.yuv:
+			# Sin esto OpenCV convierte a BGR en CPU dentro de read()
+			capturer.set(cv.CAP_PROP_CONVERT_RGB, 0)
+		return capturer
+
+	def _output_format(self) -> PixelFormat:
+		return PixelFormat.BGR
+
+	def _frame_shape(self) -> tuple[int, ...]:
+		return self._pixel_format.shape(self._capture_width, self._capture_height)
 
 	@abstractmethod
 	def _pipeline(self) -> str: ...
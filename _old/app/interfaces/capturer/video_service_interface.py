@@ -1,9 +1,14 @@
 from abc import ABC, abstractmethod
 from collections.abc import Generator
+from typing import TYPE_CHECKING
 
 from app.interfaces.capturer.camera import ICamera
 from app.models.capturer.frame_model import Frame
 
+if TYPE_CHECKING:
+	from app.models.pipeline import PipelineItem
+	from app.services.bufferer import FrameCursor, ReadPolicy
+
 
 class IVideoService(ABC):
 	@abstractmethod
@@ -22,22 +27,25 @@ class IVideoService(ABC):
 	def focus(self) -> None: ...
 
 	@abstractmethod
-	def _get_frames(self) -> None: ...
+	def _get_frames(self) -> 'PipelineItem | None': ...
 
 	@abstractmethod
-	def _preprocess(self) -> list[Frame]: ...
+	def _preprocess(self, item: 'PipelineItem') -> 'PipelineItem': ...
 
 	@abstractmethod
-	def _postprocess(self) -> Frame: ...
+	def _postprocess(self, item: 'PipelineItem') -> 'PipelineItem': ...
 
 	@abstractmethod
-	def _transform(self) -> None: ...
+	def _transform(self, item: 'PipelineItem') -> 'PipelineItem': ...
 
 	@abstractmethod
-	def _track(self) -> None: ...
+	def _track(self, item: 'PipelineItem') -> 'PipelineItem': ...
 
 	@abstractmethod
 	def frames(self) -> Generator[Frame, None, None]: ...
 
 	@abstractmethod
 	def feed(self) -> Generator[Frame, None, None]: ...
+
+	@abstractmethod
+	def subscribe(self, policy: 'ReadPolicy | None' = None, name: str | None = None) -> 'FrameCursor': ...
@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
 from collections.abc import Generator
+from typing import TYPE_CHECKING
 
 from app.models.capturer import Frame
 from app.models.streamer import StreamProtocol
 
+if TYPE_CHECKING:
+	from app.services.bufferer import FrameSource
+
 
 class IStreamProvider(ABC):
 	@abstractmethod
@@ -12,7 +16,7 @@ class IStreamProvider(ABC):
 	@abstractmethod
 	def start(
 		self,
-		feed: Generator[Frame, None, None],
+		feed: 'FrameSource',
 		url: str,
 	) -> None: ...
 
@@ -0,0 +1,9 @@
+from .gap_fill_model import GapFill
+from .pacer_stats_model import PacerStats
+from .ring_stats_model import RingStats
+
+__all__: list[str] = [
+	'GapFill',
+	'PacerStats',
+	'RingStats',
+]
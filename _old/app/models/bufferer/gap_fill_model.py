@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class GapFill(Enum):
+	REPEAT = 'repeat'  # re-emite el último frame
+	SKIP = 'skip'  # no emite nada en el tick (consumidores que usan frame.timestamp)
+	BLEND = 'blend'  # mezcla el último frame emitido con el siguiente (+1 tick de latencia)
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PacerStats:
+	ticks: int
+	late_ticks: int
+	resyncs: int
+	missed_ticks: int  # ticks saltados al resincronizar tras un atasco
+	jitter_p50: float  # segundos de retraso respecto al deadline
+	jitter_p95: float
+	jitter_p99: float
+	jitter_max: float
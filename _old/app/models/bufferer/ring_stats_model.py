@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RingStats:
+	capacity: int
+	written: int
+	read: int
+	skipped: int  # saltados por lecturas latest()
+	overwritten: int  # pisados por el productor antes de que next() los leyera
+	pending: int
+	refused: int  # frames descartados al publicar por falta de presupuesto de memoria
@@ -1,7 +1,16 @@
+import hashlib
+import json
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any, TypeVar, Union
 
+import numpy as np
+from numpy.typing import NDArray
+
+CAMERA_MATRIX = 'camera_matrix'
+DISTORTION_COEFFICIENTS = 'distortion_coefficients'
+RESOLUTION = 'resolution'
+
 
 class BaseCalibrationParameters(ABC):
 	@abstractmethod
@@ -25,6 +34,39 @@ class CameraCalibrationParameters(BaseCalibrationParameters):
 	def from_dict(cls, data: dict[str, Any]) -> 'CameraCalibrationParameters':
 		return cls(parameters=data)
 
+	@classmethod
+	def from_firmware(cls, data: dict[str, Any]) -> 'CameraCalibrationParameters':
+		"""Reads the firmware calibration.json layout (cameras.device[].intrinsic_matrix, ...)."""
+		cameras = data.get('cameras', {})
+		resolution = [[float(cameras.get('width', 0)), float(cameras.get('height', 0))]]
+		parameters: dict[str, dict[str, list[list[float]]]] = {}
+		for device in cameras.get('device', []):
+			entry: dict[str, list[list[float]]] = {RESOLUTION: resolution}
+			if 'intrinsic_matrix' in device:
+				values = [float(v) for v in device['intrinsic_matrix']]
+				entry[CAMERA_MATRIX] = [values[0:3], values[3:6], values[6:9]]
+			if 'distortion_coefficients' in device:
+				entry[DISTORTION_COEFFICIENTS] = [[float(v) for v in device['distortion_coefficients']]]
+			parameters[f'camera_{device.get("id", len(parameters))}'] = entry
+		return cls(parameters=parameters)
+
+	def digest(self) -> str:
+		return hashlib.sha1(json.dumps(self.parameters, sort_keys=True).encode()).hexdigest()
+
+	def camera_matrix(self, camera: str) -> NDArray[np.float64] | None:
+		values = self.parameters.get(camera, {}).get(CAMERA_MATRIX)
+		return np.array(values, dtype=np.float64).reshape(3, 3) if values else None
+
+	def distortion(self, camera: str) -> NDArray[np.float64] | None:
+		values = self.parameters.get(camera, {}).get(DISTORTION_COEFFICIENTS)
+		return np.array(values, dtype=np.float64).ravel() if values else None
+
+	def resolution(self, camera: str) -> tuple[int, int] | None:
+		values = self.parameters.get(camera, {}).get(RESOLUTION)
+		if not values or not values[0][0] or not values[0][1]:
+			return None
+		return int(values[0][0]), int(values[0][1])
+
 
 @dataclass
 class CalibrationParameter:
@@ -1,8 +1,28 @@
+from .capture_chain_model import CaptureChain, CaptureChainBenchmark
 from .capture_format_model import CaptureFormat
 from .capture_mode_model import CaptureMode
 from .fps_model import FPS
 from .frame_model import Frame
+from .frame_pool_stats_model import FramePoolStats
 from .hdr_model import HDR
+from .pixel_format_model import PixelFormat
+from .process_capture_stats_model import ProcessCaptureStats
+from .pyramid_stats_model import PyramidStats
 from .resolution_model import Resolution
+from .sync_stats_model import SyncStats
 
-__all__: list[str] = ['Frame', 'CaptureFormat', 'CaptureMode', 'FPS', 'HDR', 'Resolution']
+__all__: list[str] = [
+	'Frame',
+	'PixelFormat',
+	'FramePoolStats',
+	'SyncStats',
+	'ProcessCaptureStats',
+	'PyramidStats',
+	'CaptureChain',
+	'CaptureChainBenchmark',
+	'CaptureFormat',
+	'CaptureMode',
+	'FPS',
+	'HDR',
+	'Resolution',
+]
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+
+from .formats import NVArgusCameraSrcFormats, NVVidConvFormats, VideoConvertFormats
+
+
+@dataclass(frozen=True, slots=True)
+class CaptureChain:
+	source_format: NVArgusCameraSrcFormats
+	converter_format: NVVidConvFormats
+	output_format: VideoConvertFormats
+	cpu_cost: int
+
+	@property
+	def cpu_conversions(self) -> int:
+		return 0 if self.converter_format.value == self.output_format.value else 1
+
+	def __str__(self) -> str:
+		steps = [self.source_format.value, self.converter_format.value]
+		if self.cpu_conversions:
+			steps.append(self.output_format.value)
+		return ' -> '.join(steps)
+
+
+@dataclass(frozen=True, slots=True)
+class CaptureChainBenchmark:
+	chain: CaptureChain
+	frames: int
+	ms_per_frame: float | None
@@ -1,10 +1,99 @@
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
+from typing import ClassVar
 
 import numpy as np
 from numpy.typing import NDArray
 
+from .pixel_format_model import PixelFormat
+from .pyramid_stats_model import PyramidStats
 
-@dataclass
+
+@dataclass(slots=True)
 class Frame:
 	data: NDArray[np.uint8]
 	timestamp: float
+	format: PixelFormat = PixelFormat.BGR
+	# Niveles reducidos por tamaño (ancho, alto); se liberan junto con el frame. El dict se crea
+	# con el primer nivel: la mayoría de frames (niveles, recortes) nunca tiene uno
+	_levels: dict[tuple[int, int], 'Frame'] | None = field(default=None, init=False, repr=False, compare=False)
+
+	_pyramid_lock: ClassVar[threading.Lock] = threading.Lock()
+	_resizes: ClassVar[int] = 0
+	_reused: ClassVar[int] = 0
+	_cascaded: ClassVar[int] = 0
+
+	@property
+	def width(self) -> int:
+		return self.format.size(self.data)[0]
+
+	@property
+	def height(self) -> int:
+		return self.format.size(self.data)[1]
+
+	def planes(self) -> tuple[NDArray[np.uint8], ...]:
+		return self.format.planes(self.data)
+
+	def level(
+		self,
+		scale: float | None = None,
+		size: tuple[int, int] | None = None,
+		out: NDArray[np.uint8] | None = None,
+	) -> 'Frame':
+		"""
+		Downscaled copy of this frame (by `scale` or to an explicit `size`), computed at most
+		once and shared by every consumer. It is derived from the closest larger level already
+		computed. `out` is only written when the level does not exist yet. YUV levels are I420.
+		"""
+		size = self._level_size(scale, size)
+		if size == (self.width, self.height) and self.format is not PixelFormat.NV12:
+			return self
+
+		with Frame._pyramid_lock:
+			levels = self._levels
+			cached = levels.get(size) if levels else None
+			if cached is not None:
+				Frame._reused += 1
+				return cached
+			larger = [level for key, level in levels.items() if key[0] >= size[0] and key[1] >= size[1]] if levels else []
+		source = min(larger, key=lambda level: level.data.size) if larger else self
+
+		from app.services.processor.utils import resize  # evita el import circular models <-> services
+
+		level = resize(source, size, out=out)
+		with Frame._pyramid_lock:
+			if self._levels is None:
+				self._levels = {}
+			# Si otro consumidor lo calculó a la vez, se queda el primero
+			existing = self._levels.setdefault(size, level)
+			if existing is level:
+				Frame._resizes += 1
+				Frame._cascaded += source is not self
+			else:
+				Frame._reused += 1
+		return existing
+
+	def cached_level(self, scale: float | None = None, size: tuple[int, int] | None = None) -> 'Frame | None':
+		"""The level `level()` would return if it is already available, else None (nothing is computed)."""
+		size = self._level_size(scale, size)
+		if size == (self.width, self.height) and self.format is not PixelFormat.NV12:
+			return self
+		with Frame._pyramid_lock:
+			cached = self._levels.get(size) if self._levels else None
+			if cached is not None:
+				Frame._reused += 1
+			return cached
+
+	def _level_size(self, scale: float | None, size: tuple[int, int] | None) -> tuple[int, int]:
+		if size is None:
+			if scale is None:
+				raise ValueError('Frame.level needs a scale or a size')
+			size = (int(self.width * scale), int(self.height * scale))
+		if self.format.yuv:
+			size = (size[0] & ~1, size[1] & ~1)
+		return size
+
+	@classmethod
+	def pyramid_stats(cls) -> PyramidStats:
+		with cls._pyramid_lock:
+			return PyramidStats(resizes=cls._resizes, reused=cls._reused, cascaded=cls._cascaded)
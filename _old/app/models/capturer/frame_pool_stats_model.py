@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class FramePoolStats:
+	hits: int
+	misses: int
+	escaped: int
+	refused: int
+	live_buffers: int
+	live_bytes: int
+	idle_buffers: int
+	idle_bytes: int
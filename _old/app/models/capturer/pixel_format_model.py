@@ -0,0 +1,52 @@
+from enum import Enum
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class PixelFormat(Enum):
+	BGR = ('BGR', 'bgr24', False)
+	RGB = ('RGB', 'rgb24', False)
+	NV12 = ('NV12', 'nv12', True)
+	I420 = ('I420', 'yuv420p', True)
+
+	def __init__(self, label: str, ffmpeg: str, yuv: bool):
+		self.label = label
+		self.ffmpeg = ffmpeg
+		self.yuv = yuv
+
+	@classmethod
+	def from_label(cls, label: str) -> 'PixelFormat':
+		for pixel_format in cls:
+			if pixel_format.label == label:
+				return pixel_format
+		raise ValueError(f'Unsupported pixel format: {label}')
+
+	def shape(self, width: int, height: int) -> tuple[int, ...]:
+		if self.yuv:
+			return (height * 3 // 2, width)
+		return (height, width, 3)
+
+	def size(self, data: NDArray[np.uint8]) -> tuple[int, int]:
+		"""(width, height) of the picture stored in `data`."""
+		if self.yuv:
+			return data.shape[1], data.shape[0] * 2 // 3
+		return data.shape[1], data.shape[0]
+
+	def planes(self, data: NDArray[np.uint8]) -> tuple[NDArray[np.uint8], ...]:
+		"""
+		Views over `data`: (packed,) for BGR/RGB, (Y, UV) for NV12 with UV as
+		(h/2, w/2, 2), and (Y, U, V) for I420.
+		"""
+		if not self.yuv:
+			return (data,)
+		width, height = self.size(data)
+		luma = data[:height]
+		if self is PixelFormat.NV12:
+			return luma, data[height:].reshape(height // 2, width // 2, 2)
+		chroma = (height // 2) * (width // 2)
+		flat = data.reshape(-1)
+		start = height * width
+		u = flat[start : start + chroma].reshape(height // 2, width // 2)
+		v = flat[start + chroma : start + 2 * chroma].reshape(height // 2, width // 2)
+		return luma, u, v
@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class ProcessCaptureStats:
+	frames: int
+	worker_drops: int
+	reader_drops: int
+	escaped: int
+	slots: int
+	slot_bytes: int
@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class PyramidStats:
+	resizes: int  # niveles calculados
+	reused: int  # peticiones servidas desde un nivel ya calculado (resizes evitados)
+	cascaded: int  # niveles calculados desde otro nivel en vez del frame completo
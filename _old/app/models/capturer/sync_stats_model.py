@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class SyncStats:
+	pairs: int
+	unmatched: tuple[int, int]
+	dropped: tuple[int, int]
+	skew_last: float
+	skew_mean: float
+	skew_max: float
+	latency_last: float
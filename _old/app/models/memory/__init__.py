@@ -0,0 +1,6 @@
+from .memory_budget_stats_model import MemoryAccountStats, MemoryBudgetStats
+
+__all__: list[str] = [
+	'MemoryAccountStats',
+	'MemoryBudgetStats',
+]
@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class MemoryAccountStats:
+	name: str
+	current: int
+	peak: int
+	refused: int  # cargos rechazados por falta de presupuesto
+
+
+@dataclass(frozen=True)
+class MemoryBudgetStats:
+	limit: int
+	current: int
+	peak: int
+	refused: int
+	reclaimed: int
+	accounts: tuple[MemoryAccountStats, ...]
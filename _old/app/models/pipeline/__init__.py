@@ -0,0 +1,7 @@
+from .pipeline_item_model import PipelineItem
+from .stage_stats_model import StageStats
+
+__all__: list[str] = [
+	'PipelineItem',
+	'StageStats',
+]
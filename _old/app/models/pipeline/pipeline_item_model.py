@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+
+from app.models.capturer import Frame
+from app.models.tracker import DetectionData, MotionData, ZoomData
+
+
+@dataclass
+class PipelineItem:
+	"""
+	State of one synchronized pair while it moves through the processing stages. With `roi`
+	set, frame0/frame1 are still raw and `frame` holds only that region, already processed.
+	"""
+
+	frame0: Frame
+	frame1: Frame
+	frame: Frame | None = None
+	side: int | None = None  # cámara elegida por el tracker
+	roi: tuple[int, int, int, int] | None = None  # región del frame completo que cubre `frame`
+	roi_side: int | None = None  # cámara de la que sale `roi`
+	analysis: tuple[Frame, Frame] | None = None  # niveles reducidos (sin realce) para el tracker
+	detection: DetectionData | None = None
+	motion: MotionData | None = None
+	zoom: ZoomData | None = None
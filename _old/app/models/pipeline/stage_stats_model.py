@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class StageStats:
+	name: str
+	workers: int
+	processed: int
+	dropped: int  # items para los que la etapa devolvió None
+	queue_depth: int
+	queue_capacity: int
+	busy: float  # fracción del tiempo que los workers pasaron procesando
+	latency_mean: float
+	latency_max: float
@@ -1,12 +1,18 @@
+from .court_geometry import CourtGeometry
 from .detection_data import (
     DetectionData,
 )
+from .detection_mode import DetectionMode
 from .motion_data import MotionData
+from .scheduler_stats import SchedulerStats
 from .side_decision_data import SideDecisionData
 from .zoom_data import ZoomData
 
 __all__ = [
+    "CourtGeometry",
     "DetectionData",
+    "DetectionMode",
+    "SchedulerStats",
     "SideDecisionData",
     "MotionData",
     "ZoomData",
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from .point_model import Point
 
 
-@dataclass
+@dataclass(slots=True)
 class Court:
 	top_left: Point
 	top_right: Point
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+from app.models.tracker.boundaries import Point
+from app.models.tracker.detection import CourtDetection
+
+
+@dataclass(slots=True)
+class CourtGeometry:
+	detection: CourtDetection  # esquinas en px del frame de entrada
+	# Imagen -> pista normalizada: (0, 0) esquina superior izquierda, (1, 1) inferior derecha
+	homography: NDArray[np.float64]
+	mask: NDArray[np.uint8]  # 255 dentro de la pista (con margen), a Settings.processing.analysis_resolution
+	size: tuple[int, int]  # (ancho, alto) del frame de entrada
+	timestamp: float
+
+	def to_court(self, point: Point) -> Point:
+		"""Image pixel -> normalized court coordinates."""
+		x, y, w = self.homography @ (point.x, point.y, 1.0)
+		return Point(float(x / w), float(y / w))
@@ -1,5 +1,6 @@
 from .ball_model import BallDetection
 from .court_model import CourtDetection
 from .player_model import PlayerDetection
+from .players_model import PlayerDetections
 
-__all__ = ['BallDetection', 'CourtDetection', 'PlayerDetection']
+__all__ = ['BallDetection', 'CourtDetection', 'PlayerDetection', 'PlayerDetections']
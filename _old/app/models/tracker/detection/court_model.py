@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from app.models.tracker.boundaries import Court
 
 
-@dataclass
+@dataclass(slots=True)
 class CourtDetection:
 	court: Court
 	confidence: float
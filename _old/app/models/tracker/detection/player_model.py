@@ -5,7 +5,7 @@ from app.models.tracker.boundaries import Point
 from .ball_model import BallDetection
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerDetection:
 	position: Point
 	confidence: float
@@ -0,0 +1,89 @@
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import overload
+
+import numpy as np
+from numpy.typing import NDArray
+
+from app.models.tracker.boundaries import Point
+
+from .player_model import PlayerDetection
+
+
+@dataclass(eq=False, slots=True)
+class PlayerDetections(Sequence[PlayerDetection]):
+	"""
+	Players of one frame as arrays: positions (N, 2), confidences (N,) and optional boxes
+	(N, 4) as x, y, width, height. Distance, count and centroid queries are vectorized;
+	indexing and iteration still yield PlayerDetection, built only when asked for.
+	"""
+
+	positions: NDArray[np.float64] = field(default_factory=lambda: np.empty((0, 2), dtype=np.float64))
+	confidences: NDArray[np.float64] = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+	boxes: NDArray[np.float64] | None = None
+
+	def __post_init__(self) -> None:
+		self.positions = np.asarray(self.positions, dtype=np.float64).reshape(-1, 2)
+		self.confidences = np.asarray(self.confidences, dtype=np.float64).reshape(-1)
+		if len(self.confidences) != len(self.positions):
+			raise ValueError('PlayerDetections needs one confidence per position')
+		if self.boxes is not None:
+			self.boxes = np.asarray(self.boxes, dtype=np.float64).reshape(-1, 4)
+
+	@classmethod
+	def from_list(cls, players: Iterable[PlayerDetection]) -> 'PlayerDetections':
+		players = list(players)
+		return cls(
+			positions=np.array([(p.position.x, p.position.y) for p in players], dtype=np.float64),
+			confidences=np.array([p.confidence for p in players], dtype=np.float64),
+		)
+
+	def __len__(self) -> int:
+		return len(self.positions)
+
+	@overload
+	def __getitem__(self, index: int) -> PlayerDetection: ...
+
+	@overload
+	def __getitem__(self, index: slice) -> 'PlayerDetections': ...
+
+	def __getitem__(self, index: int | slice) -> 'PlayerDetection | PlayerDetections':
+		if isinstance(index, slice):
+			return self._select(index)
+		x, y = self.positions[index]
+		return PlayerDetection(Point(float(x), float(y)), float(self.confidences[index]))
+
+	def __iter__(self) -> Iterator[PlayerDetection]:
+		for index in range(len(self)):
+			yield self[index]
+
+	def distances(self, point: Point) -> NDArray[np.float64]:
+		"""Distance in px from every player to `point`."""
+		return np.hypot(self.positions[:, 0] - point.x, self.positions[:, 1] - point.y)
+
+	def count_near(self, point: Point, radius: float) -> int:
+		return int(np.count_nonzero(self.distances(point) < radius))
+
+	def centroid(self, weighted: bool = True) -> Point | None:
+		"""Mean position (confidence-weighted by default); None without players."""
+		if not len(self):
+			return None
+		weights = self.confidences if weighted and self.confidences.sum() > 0 else None
+		x, y = np.average(self.positions, axis=0, weights=weights)
+		return Point(float(x), float(y))
+
+	def confident(self, threshold: float) -> 'PlayerDetections':
+		return self._select(self.confidences >= threshold)
+
+	def transformed(self, dx: float, dy: float, scale: float) -> 'PlayerDetections':
+		"""(position + (dx, dy)) * scale, e.g. from ROI crop to output coordinates."""
+		boxes = None
+		if self.boxes is not None:
+			boxes = self.boxes.copy()
+			boxes[:, :2] += (dx, dy)
+			boxes *= scale
+		return PlayerDetections((self.positions + (dx, dy)) * scale, self.confidences.copy(), boxes)
+
+	def _select(self, index: slice | NDArray[np.bool_]) -> 'PlayerDetections':
+		boxes = self.boxes[index] if self.boxes is not None else None
+		return PlayerDetections(self.positions[index], self.confidences[index], boxes)
@@ -1,10 +1,11 @@
 from dataclasses import dataclass
 
-from app.models.tracker.detection import BallDetection, CourtDetection, PlayerDetection
+from app.models.tracker.detection import BallDetection, CourtDetection, PlayerDetections
 
 
-@dataclass
+@dataclass(slots=True)
 class DetectionData:
 	ball: BallDetection
 	court: CourtDetection
-	players: list[PlayerDetection]
+	# Una lista de PlayerDetection se convierte con PlayerDetections.from_list
+	players: PlayerDetections
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class DetectionMode(Enum):
+	FULL = 'full'  # detector sobre el frame completo
+	ROI = 'roi'  # detector solo alrededor de la posición prevista
+	SKIP = 'skip'  # sin detector: se reutiliza la predicción del filtro
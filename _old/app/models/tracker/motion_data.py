@@ -1,13 +1,24 @@
 from dataclasses import dataclass
 
+import numpy as np
+from numpy.typing import NDArray
+
 from app.models.tracker.boundaries import Point
 
 
-@dataclass
+@dataclass(slots=True)
 class MotionData:
 	position: Point
 	velocity: Point
 	acceleration: Point
+	# Covarianza 3x3 de (posición, velocidad, aceleración), la misma para x e y
+	covariance: NDArray[np.float64] | None = None
+	timestamp: float | None = None
+	predicted: bool = False  # True si no hubo detección en este frame
+
+	def position_sigma(self) -> float:
+		"""1-sigma position uncertainty in px (0 when unknown)."""
+		return float(np.sqrt(self.covariance[0, 0])) if self.covariance is not None else 0.0
 
 	def speed(self) -> float:
 		return (self.velocity.x**2 + self.velocity.y**2) ** 0.5
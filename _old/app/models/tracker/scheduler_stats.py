@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class SchedulerStats:
+	frames: int
+	full: int
+	roi: int
+	skipped: int
+	detection_rate: float  # fracción de frames con detector (full + roi)
+	overruns: int  # frames cuyo coste de detección superó el presupuesto
+	budget_ms: float
+	cost_full_ms: float  # media móvil del coste por modo
+	cost_roi_ms: float
+	lost: int  # frames sin track ni presupuesto para buscar la bola
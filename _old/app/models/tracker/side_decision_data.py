@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from app.models.general.sides_model import Sides
 
 
-@dataclass
+@dataclass(slots=True)
 class SideDecisionData:
 	side: Sides
 	confidence: float = 0.0
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from app.models.tracker.boundaries import Point
 
 
-@dataclass
+@dataclass(slots=True)
 class ZoomData:
 	center: Point
 	zoom_level: float
@@ -1,3 +1,6 @@
-from .buffer import BufferService
+from .broadcast import FrameBroadcast, FrameCursor, ReadPolicy, RingClosed
+from .buffer import BufferService, FrameSource
+from .pacer import Pacer
+from .ring import FrameRing
 
-__all__ = ['BufferService']
+__all__ = ['BufferService', 'FrameBroadcast', 'FrameCursor', 'FrameRing', 'FrameSource', 'Pacer', 'ReadPolicy', 'RingClosed']
@@ -0,0 +1,214 @@
+import threading
+import time
+from enum import Enum
+
+from app.infra.memory import MemoryBudget, leased, memory_budget
+from app.models.bufferer import RingStats
+from app.models.capturer import Frame
+
+
+class RingClosed(Exception):
+	pass
+
+
+def held_bytes(frame: Frame) -> int:
+	"""Bytes a ring charges for holding `frame`: none when a pool lease already accounts for them."""
+	return 0 if leased(frame.data) else frame.data.nbytes
+
+
+class ReadPolicy(Enum):
+	LATEST = 'latest'  # salta al frame más nuevo (preview, tracker, stream en vivo)
+	NEXT = 'next'  # lee en orden y solo pierde lo que el productor ya pisó (grabación)
+
+
+class FrameBroadcast:
+	"""
+	Single-writer ring shared by any number of readers. publish() stores (seq, frame)
+	by reference and bumps `_head`; each FrameCursor keeps its own tail, so a slow
+	consumer only ever loses its own frames and never holds the writer back. Slots every
+	cursor has read are cleared on the next publish, so only unread frames stay charged
+	to the memory budget (pooled frames are already charged to their pool).
+	No store needs a lock: every slot, head and tail update is a single GIL-atomic
+	assignment, and a reader only parks on its Event when it has caught up.
+	"""
+
+	_kind: str = 'broadcast'  # prefijo de la cuenta de memoria y de los errores
+
+	def __init__(self, capacity: int, name: str | None = None, budget: MemoryBudget | None = None) -> None:
+		if capacity <= 0:
+			raise ValueError(f'{type(self).__name__} capacity must be positive')
+		self._capacity = capacity
+		self._slots: list[tuple[int, Frame, int] | None] = [None] * capacity
+		self._head = 0
+		self._cleared = 0
+		self._refused = 0
+		self._closed = False
+		self._lock = threading.Lock()
+		# Copy-on-write: publish() recorre la tupla sin tomar el lock
+		self._cursors: tuple['FrameCursor', ...] = ()
+		self._account = (budget or memory_budget).register(f'{self._kind}:{name or hex(id(self))}', owner=self)
+
+	@property
+	def capacity(self) -> int:
+		return self._capacity
+
+	@property
+	def closed(self) -> bool:
+		return self._closed
+
+	@property
+	def refused(self) -> int:
+		return self._refused
+
+	def publish(self, frame: Frame) -> int:
+		"""Publishes `frame`. Returns its seq, or -1 when the memory budget refused it."""
+		cursors = self._cursors
+		self._clear_consumed(min((cursor._tail for cursor in cursors), default=self._head))
+		seq = self._head
+		index = seq % self._capacity
+		previous = self._slots[index]
+		nbytes = held_bytes(frame)
+		if not self._account.charge(nbytes):
+			self._refused += 1
+			return -1
+		self._slots[index] = (seq, frame, nbytes)
+		self._head = seq + 1
+		if previous is not None:
+			self._account.release(previous[2])
+		for cursor in cursors:
+			if cursor._waiting:
+				cursor._ready.set()
+		return seq
+
+	def subscribe(self, policy: ReadPolicy = ReadPolicy.LATEST, name: str | None = None) -> 'FrameCursor':
+		"""New cursor starting at the next published frame."""
+		cursor = FrameCursor(self, policy, name)
+		with self._lock:
+			self._cursors = (*self._cursors, cursor)
+		if self._closed:
+			cursor._ready.set()
+		return cursor
+
+	def unsubscribe(self, cursor: 'FrameCursor') -> None:
+		with self._lock:
+			self._cursors = tuple(c for c in self._cursors if c is not cursor)
+
+	def close(self) -> None:
+		self._closed = True
+		for cursor in self._cursors:
+			cursor._ready.set()
+
+	def cursors(self) -> dict[str, RingStats]:
+		return {cursor.name: cursor.stats() for cursor in self._cursors}
+
+	def _clear_consumed(self, tail: int) -> None:
+		# Solo el productor escribe slots; los seq < tail ya no los lee ningún cursor
+		oldest = max(self._cleared, self._head - self._capacity)
+		for seq in range(oldest, min(tail, self._head)):
+			index = seq % self._capacity
+			entry = self._slots[index]
+			if entry is not None and entry[0] == seq:
+				self._slots[index] = None
+				self._account.release(entry[2])
+		self._cleared = max(self._cleared, tail)
+
+
+class FrameCursor:
+	"""One consumer's read position on a FrameBroadcast, with its own drop counters."""
+
+	def __init__(self, broadcast: FrameBroadcast, policy: ReadPolicy, name: str | None = None) -> None:
+		self.policy = policy
+		self.name = name or f'cursor_{id(self):x}'
+		self._broadcast = broadcast
+		self._tail = broadcast._head
+		self._waiting = False
+		self._ready = threading.Event()
+
+		self._read = 0
+		self._skipped = 0
+		self._overwritten = 0
+
+	@property
+	def closed(self) -> bool:
+		return self._broadcast.closed
+
+	def __len__(self) -> int:
+		return min(self._broadcast._head - self._tail, self._broadcast._capacity)
+
+	def read(self, timeout: float | None = None) -> Frame | None:
+		"""Reads with the cursor's policy. Returns None on timeout; raises RingClosed."""
+		if self.policy is ReadPolicy.NEXT:
+			return self.next(timeout)
+		return self.latest(timeout)
+
+	def next(self, timeout: float | None = None) -> Frame | None:
+		"""Oldest unread frame. Frames the producer already overwrote are counted and skipped."""
+		broadcast = self._broadcast
+		while True:
+			if broadcast._head == self._tail and not self._wait(timeout):
+				return None
+			tail = self._tail
+			oldest = broadcast._head - broadcast._capacity
+			if tail < oldest:
+				self._overwritten += oldest - tail
+				tail = oldest
+			entry = broadcast._slots[tail % broadcast._capacity]
+			if entry is None or entry[0] != tail:
+				# El productor pisó el slot mientras leíamos: reintenta desde el nuevo rango
+				self._tail = tail
+				continue
+			self._tail = tail + 1
+			self._read += 1
+			return entry[1]
+
+	def latest(self, timeout: float | None = None) -> Frame | None:
+		"""Newest unread frame; unread frames still in the ring count as skipped, older ones as overwritten."""
+		broadcast = self._broadcast
+		while True:
+			if broadcast._head == self._tail and not self._wait(timeout):
+				return None
+			head = broadcast._head
+			newest = head - 1
+			entry = broadcast._slots[newest % broadcast._capacity]
+			if entry is None or entry[0] != newest:
+				continue
+			# Lo que el productor ya pisó no lo saltó el consumidor: va a overwritten, como en next()
+			oldest = head - broadcast._capacity
+			overwritten = max(oldest - self._tail, 0)
+			self._overwritten += overwritten
+			self._skipped += newest - self._tail - overwritten
+			self._tail = head
+			self._read += 1
+			return entry[1]
+
+	def close(self) -> None:
+		self._broadcast.unsubscribe(self)
+
+	def stats(self) -> RingStats:
+		return RingStats(
+			capacity=self._broadcast.capacity,
+			written=self._broadcast._head,
+			read=self._read,
+			skipped=self._skipped,
+			overwritten=self._overwritten,
+			pending=len(self),
+			refused=self._broadcast.refused,
+		)
+
+	def _wait(self, timeout: float | None) -> bool:
+		"""Parks until the producer publishes. Returns False on timeout; raises when closed."""
+		broadcast = self._broadcast
+		deadline = None if timeout is None else time.perf_counter() + timeout
+		while broadcast._head == self._tail:
+			if broadcast.closed:
+				raise RingClosed
+			remaining = None if deadline is None else deadline - time.perf_counter()
+			if remaining is not None and remaining <= 0:
+				return False
+			self._waiting = True
+			self._ready.clear()
+			# Re-chequeo tras anunciar la espera: un publish() anterior no habrá hecho set()
+			if broadcast._head == self._tail and not broadcast.closed:
+				self._ready.wait(remaining)
+			self._waiting = False
+		return True
@@ -1,158 +1,207 @@
 import threading
-import time
-from collections import deque
 from collections.abc import Generator, Iterable
+from functools import partial
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
 
 from app.infra.logger import Logger
+from app.infra.memory import memory_budget
+from app.infra.metrics import metric_key, metrics
 from app.interfaces.bufferer import IBufferService
+from app.models.bufferer import GapFill, PacerStats, RingStats
 from app.models.capturer import Frame
 from config.settings import Settings
 
+from .broadcast import FrameCursor, RingClosed
+from .pacer import Pacer
+from .ring import FrameRing
+
+FrameSource = Generator[Frame, None, None] | FrameCursor
+
 
 class BufferService(IBufferService):
-	def __init__(self) -> None:
+	def __init__(self, fps: float | None = None, gap_fill: GapFill | None = None) -> None:
 		self.settings = Settings
 		self.logger = Logger(name='buffer_service')
 
 		self.buffer_size: int = self.settings.stream.buffer_size
-		self.buffer_deque: deque[Frame] = deque(maxlen=self.buffer_size)
+		self.ring: FrameRing = FrameRing(self.settings.stream.ring_size, name='buffer_service')
+		# Lector activo: el ring propio o un cursor sobre el broadcast de VideoService
+		self._source: FrameRing | FrameCursor = self.ring
 
-		self.fps: float = float(self.settings.stream.fps)
+		self.fps: float = float(fps if fps is not None else self.settings.stream.fps)
 		self._interval: float = 1.0 / self.fps if self.fps > 0 else 0.0
+		self.pacer: Pacer | None = Pacer(self.fps) if self.fps > 0 else None
+		self.gap_fill: GapFill = gap_fill or GapFill(self.settings.stream.gap_fill)
 
 		self._active = False
 		self._producer_thread: threading.Thread | None = None
 		self._producer_exc: BaseException | None = None
 		self._feed: Iterable[Frame] | None = None
-		self._lock = threading.Lock()
-		self._new_frame = threading.Condition(self._lock)
 
 		# Mantener el último frame para repetirlo si no llega uno nuevo
 		self._last_frame: Frame | None = None
-
-		# Métricas
-		self._dropped_total = 0
+		# BLEND: frame recibido pero aún no emitido, y buffers de salida de la mezcla
+		self._held: Frame | None = None
+		self._blend_buffers: list[NDArray[np.uint8] | None] = [None, None]
+		self._blend_index = 0
+		self._blend_account = memory_budget.register('blend:buffer_service', owner=self)
 
 	def start(self) -> None:
 		self._active = True
 
 	def stop(self) -> None:
 		self._active = False
-		with self._new_frame:
-			self._new_frame.notify_all()
+		self.ring.close()
+		if isinstance(self._source, FrameCursor):
+			self._source.close()
 		if self._producer_thread and self._producer_thread.is_alive():
 			self._producer_thread.join(timeout=1.0)
 		self._producer_thread = None
 
+	def stats(self) -> RingStats:
+		return self._source.stats()
+
+	def pacer_stats(self) -> PacerStats | None:
+		return self.pacer.stats() if self.pacer is not None else None
+
 	def _producer(self) -> None:
 		try:
 			assert self._feed is not None
 			for frame in self._feed:
 				if not self._active:
 					break
-				with self._new_frame:
-					# Si está llena, el append descarta el más viejo -> contamos drop
-					if len(self.buffer_deque) == self.buffer_deque.maxlen:
-						self._dropped_total += 1
-					self.buffer_deque.append(frame)  # maxlen descarta los más viejos
-					self._new_frame.notify()
+				self.ring.put(frame)
 		except BaseException as exc:
 			self._producer_exc = exc
-			with self._new_frame:
-				self._new_frame.notify_all()
 		finally:
-			with self._new_frame:
-				self._active = False
-				self._new_frame.notify_all()
+			self._active = False
+			self.ring.close()
 
-	def buffer(self, feed: Generator[Frame, None, None]) -> Generator[Frame, None, None]:
+	def buffer(self, feed: FrameSource) -> Generator[Frame, None, None]:
 		"""
-		Emite a FPS objetivo. Si no hay frame nuevo a tiempo,
-		repite el último frame emitido para mantener continuidad visual.
-		Loguea NEW/REPEAT/SKIP y resumen por segundo.
+		Emite a FPS objetivo con un Pacer sin deriva. Si no hay frame nuevo a tiempo,
+		rellena el hueco según `gap_fill` (REPEAT, SKIP o BLEND).
+		Los contadores de ticks y la latencia del pacer se publican en el registro de métricas.
+		Con un FrameCursor no hay hilo productor: se lee del broadcast compartido.
 		"""
-		self._feed = feed
 		self.start()
-		self._producer_thread = threading.Thread(
-			target=self._producer, name='buffer_producer', daemon=True
-		)
-		self._producer_thread.start()
-
-		next_deadline = time.perf_counter()
-
-		# Acumuladores de métricas por segundo
-		new_count = 0
-		repeat_count = 0
-		skip_count = 0
-		last_report = time.perf_counter()
+		if isinstance(feed, FrameCursor):
+			self._source = feed
+		else:
+			self._feed = feed
+			self._producer_thread = threading.Thread(
+				target=self._producer, name='buffer_producer', daemon=True
+			)
+			self._producer_thread.start()
+		source = self._source
+		if self.pacer is not None:
+			self.pacer.reset()
+
+		name = source.name if isinstance(source, FrameCursor) else 'buffer_service'
+		new_total = metrics.counter('buffer_ticks_total', consumer=name, kind='new')
+		gap_total = metrics.counter('buffer_ticks_total', consumer=name, kind=self.gap_fill.value)
+		skip_total = metrics.counter('buffer_ticks_total', consumer=name, kind='empty')
+		lateness = metrics.histogram('buffer_tick_lateness_seconds', consumer=name)
+		metrics.collector(f'buffer_{name}', partial(self._metrics, name))
 
 		try:
 			while True:
-				now = time.perf_counter()
-				if self._interval > 0:
-					sleep_for = next_deadline - now
-					if sleep_for > 0:
-						time.sleep(sleep_for)
-					next_deadline += self._interval
+				if self.pacer is not None:
+					self.pacer.wait()
+					lateness.observe(self.pacer.last_lateness)
 
 				if self._producer_exc is not None:
 					raise self._producer_exc
 
-				emitted = False
-				with self._new_frame:
-					if not self.buffer_deque and self._active:
-						self._new_frame.wait(timeout=self._interval if self._interval > 0 else 0.01)
-
-					if self.buffer_deque:
-						qlen = len(self.buffer_deque)
-						latest = self.buffer_deque[-1]
-						self.buffer_deque.clear()
-						self._last_frame = latest
-
-						self.logger.debug(
-							f'bufferer: EMIT=NEW ts={latest.timestamp:.6f} '
-							f'queue_before_clear={qlen} drops_total={self._dropped_total}'
-						)
-						new_count += 1
-						yield latest
-						emitted = True
-
+				# Solo se espera por el primer frame: después un tick sin frame es un hueco
+				timeout = self._interval if self._last_frame is None and self._held is None else 0.0
+				try:
+					frame = source.read(timeout=timeout if self._interval > 0 else 0.01)
+				except RingClosed:
+					self._active = False
+					frame = None
+
+				if frame is not None:
+					out = self._emit_new(frame)
+				elif self._held is not None and not self._active:
+					# Fin del feed: se vacía el frame retenido por BLEND
+					out, self._held = self._held, None
+				elif self._active:
+					out = self._fill_gap()
+				else:
+					out = None
+
+				if out is not None:
+					if frame is not None:
+						self.logger.debug('bufferer: EMIT=NEW ts=%.6f', out.timestamp)
+						new_total.inc()
 					else:
-						# Repite solo si seguimos activos y ya hubo al menos un frame
-						if self._active and self._last_frame is not None:
-							self.logger.debug(
-								f'bufferer: EMIT=REPEAT ts={self._last_frame.timestamp:.6f} '
-								f'queue=0 drops_total={self._dropped_total}'
-							)
-							repeat_count += 1
-							yield self._last_frame
-							emitted = True
-						elif self._active:
-							# Activo pero aún no hay frame -> saltamos este tick
-							self.logger.debug(
-								f'bufferer: EMIT=SKIP (no frame yet) queue=0 drops_total={self._dropped_total}'
-							)
-							skip_count += 1
-							emitted = False
-						else:
-							# No activo y sin frames -> terminar
-							emitted = False
-
-				# Reporte agregado por segundo
-				now = time.perf_counter()
-				if now - last_report >= 1.0:
-					total = new_count + repeat_count + skip_count
-					self.logger.debug(
-						f'bufferer: 1s summary -> total_ticks={total}, new={new_count}, '
-						f'repeat={repeat_count}, skip={skip_count}, '
-						f'drops_total={self._dropped_total}, deque_len={len(self.buffer_deque)}'
-					)
-					new_count = repeat_count = skip_count = 0
-					last_report = now
+						self.logger.debug('bufferer: EMIT=%s ts=%.6f', self.gap_fill.name, out.timestamp)
+						gap_total.inc()
+					self._last_frame = out
+					yield out
+				elif self._active:
+					skip_total.inc()
 
 				# Condición de salida
-				if not emitted and not self._active and not self.buffer_deque:
+				if out is None and not self._active and not len(source):
 					break
 
 		finally:
+			metrics.remove_collector(f'buffer_{name}')
 			self.stop()
+
+	def _metrics(self, name: str) -> dict[str, float]:
+		stats = self._source.stats()
+		values: dict[str, float] = {
+			metric_key('buffer_pending', consumer=name): stats.pending,
+			metric_key('buffer_skipped_total', consumer=name): stats.skipped,
+			metric_key('buffer_overwritten_total', consumer=name): stats.overwritten,
+			metric_key('buffer_refused_total', consumer=name): stats.refused,
+		}
+		if self.pacer is not None:
+			pacer = self.pacer.stats()
+			values[metric_key('buffer_late_ticks_total', consumer=name)] = pacer.late_ticks
+			values[metric_key('buffer_missed_ticks_total', consumer=name)] = pacer.missed_ticks
+			values[metric_key('buffer_tick_jitter_p99_seconds', consumer=name)] = pacer.jitter_p99
+		return values
+
+	def _emit_new(self, frame: Frame) -> Frame | None:
+		if self.gap_fill is not GapFill.BLEND:
+			return frame
+		# BLEND retiene un frame para poder interpolar entre el último emitido y el siguiente
+		held, self._held = self._held, frame
+		return held
+
+	def _fill_gap(self) -> Frame | None:
+		match self.gap_fill:
+			case GapFill.REPEAT:
+				return self._last_frame
+			case GapFill.SKIP:
+				return None
+			case GapFill.BLEND:
+				if self._held is None:
+					return self._last_frame
+				if self._last_frame is None or self._last_frame.data.shape != self._held.data.shape:
+					held, self._held = self._held, None
+					return held
+				return self._blend(self._last_frame, self._held)
+
+	def _blend(self, a: Frame, b: Frame) -> Frame:
+		# Dos buffers alternos: el consumidor puede seguir usando el blend anterior
+		target = self._blend_buffers[self._blend_index]
+		if target is None or target.shape != a.data.shape:
+			if target is not None:
+				self._blend_account.release(target.nbytes)
+				self._blend_buffers[self._blend_index] = None
+			if not self._blend_account.charge(a.data.nbytes):
+				# Sin presupuesto para el buffer de mezcla: se repite el último frame
+				return a
+			target = np.empty_like(a.data)
+			self._blend_buffers[self._blend_index] = target
+		self._blend_index ^= 1
+		cv2.addWeighted(a.data, 0.5, b.data, 0.5, 0.0, dst=target)
+		return Frame(data=target, timestamp=(a.timestamp + b.timestamp) / 2, format=b.format)
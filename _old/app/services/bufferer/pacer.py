@@ -0,0 +1,80 @@
+import time
+
+import numpy as np
+from numpy.typing import NDArray
+
+from app.models.bufferer import PacerStats
+
+
+class Pacer:
+	"""
+	Fixed-rate ticker on an absolute perf_counter grid (t0 + n * interval), so sleep
+	overshoot never accumulates into drift. After a stall of at least `resync_after`
+	intervals the missed ticks are skipped instead of fired back to back.
+	"""
+
+	def __init__(
+		self,
+		fps: float,
+		resync_after: float = 1.0,
+		late_tolerance: float = 0.25,
+		history: int = 1024,
+	) -> None:
+		if fps <= 0:
+			raise ValueError('Pacer fps must be positive')
+		self.interval: float = 1.0 / fps
+		self._resync_after = resync_after * self.interval
+		self._late_after = late_tolerance * self.interval
+		self._lateness: NDArray[np.float64] = np.zeros(history, dtype=np.float64)
+		self.reset()
+
+	def reset(self) -> None:
+		self._t0: float | None = None
+		self._index = 0
+		self._ticks = 0
+		self._late_ticks = 0
+		self._resyncs = 0
+		self._missed_ticks = 0
+		self.last_lateness = 0.0
+
+	def wait(self) -> int:
+		"""Sleeps until the next tick. Returns how many ticks were skipped to resync."""
+		now = time.perf_counter()
+		if self._t0 is None:
+			self._t0 = now
+		deadline = self._t0 + self._index * self.interval
+		if now < deadline:
+			time.sleep(deadline - now)
+			now = time.perf_counter()
+
+		lateness = now - deadline
+		self.last_lateness = lateness
+		self._lateness[self._ticks % len(self._lateness)] = lateness
+		self._ticks += 1
+		if lateness > self._late_after:
+			self._late_ticks += 1
+
+		missed = 0
+		if lateness >= self._resync_after:
+			# Se salta al tick vigente en la misma rejilla: sin ráfaga y sin perder la fase
+			missed = int(lateness / self.interval)
+			self._resyncs += 1
+			self._missed_ticks += missed
+		self._index += missed + 1
+		return missed
+
+	def stats(self) -> PacerStats:
+		samples = self._lateness[: min(self._ticks, len(self._lateness))]
+		if not len(samples):
+			return PacerStats(self._ticks, 0, 0, 0, 0.0, 0.0, 0.0, 0.0)
+		p50, p95, p99 = np.percentile(samples, (50, 95, 99))
+		return PacerStats(
+			ticks=self._ticks,
+			late_ticks=self._late_ticks,
+			resyncs=self._resyncs,
+			missed_ticks=self._missed_ticks,
+			jitter_p50=float(p50),
+			jitter_p95=float(p95),
+			jitter_p99=float(p99),
+			jitter_max=float(samples.max()),
+		)
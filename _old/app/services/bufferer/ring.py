@@ -0,0 +1,42 @@
+from app.infra.memory import MemoryBudget
+from app.models.bufferer import RingStats
+from app.models.capturer import Frame
+
+from .broadcast import FrameBroadcast, FrameCursor, ReadPolicy
+
+
+class FrameRing(FrameBroadcast):
+	"""
+	Fixed-capacity single-producer/single-consumer ring: a FrameBroadcast with exactly one
+	cursor, so slots, waiting, memory accounting and the skipped/overwritten counters are
+	the broadcast's. The producer calls put(); the consumer reads with next()/latest().
+	"""
+
+	_kind = 'ring'
+
+	def __init__(self, capacity: int, name: str | None = None, budget: MemoryBudget | None = None) -> None:
+		super().__init__(capacity, name=name, budget=budget)
+		self._cursor: FrameCursor = self.subscribe(ReadPolicy.LATEST, name)
+
+	def __len__(self) -> int:
+		return len(self._cursor)
+
+	# Productor
+
+	def put(self, frame: Frame) -> int:
+		"""Publishes `frame`. Returns its seq, or -1 when the memory budget refused it."""
+		return self.publish(frame)
+
+	# Consumidor
+
+	def read(self, timeout: float | None = None) -> Frame | None:
+		return self._cursor.latest(timeout)
+
+	def next(self, timeout: float | None = None) -> Frame | None:
+		return self._cursor.next(timeout)
+
+	def latest(self, timeout: float | None = None) -> Frame | None:
+		return self._cursor.latest(timeout)
+
+	def stats(self) -> RingStats:
+		return self._cursor.stats()
@@ -0,0 +1,3 @@
+from .graph import Stage, StageGraph
+
+__all__ = ['Stage', 'StageGraph']
@@ -0,0 +1,241 @@
+import queue
+import threading
+import time
+from collections.abc import Callable, Generator, Sequence
+from typing import Any, Generic, TypeVar
+
+from app.infra.logger import Logger
+from app.infra.metrics import metric_key, metrics
+from app.models.pipeline import StageStats
+
+_In = TypeVar('_In')
+_Out = TypeVar('_Out')
+
+# (secuencia, instante de entrada al grafo, item); item None = descartado aguas arriba
+_Envelope = tuple[int, float, Any]
+
+_POLL: float = 0.1
+
+
+class Stage(Generic[_In, _Out]):
+	"""
+	One node of a StageGraph. `process` returns None to drop the item; the drop still
+	travels downstream as a tombstone so later stages keep the sequence contiguous.
+	"""
+
+	def __init__(self, name: str, process: Callable[[_In], _Out | None], workers: int = 1) -> None:
+		if workers < 1:
+			raise ValueError('Stage needs at least one worker')
+		self.name = name
+		self.process = process
+		self.workers = workers
+
+
+class _Node:
+	def __init__(self, graph: str, stage: Stage[Any, Any], inbox: queue.Queue[_Envelope], capacity: int) -> None:
+		self.stage = stage
+		self.inbox = inbox
+		self.capacity = capacity
+		self.outbox: queue.Queue[_Envelope] | None = None
+		self.lock = threading.Lock()  # contadores
+		self.order = threading.Lock()  # buffer de reordenación y entrega aguas abajo
+		self.pending: dict[int, _Envelope] = {}
+		self.next_seq = 0
+		self.processed = 0
+		self.dropped = 0
+		self.busy = 0.0
+		self.latency_sum = 0.0
+		self.latency_max = 0.0
+		self.seconds = metrics.histogram('pipeline_stage_seconds', graph=graph, stage=stage.name)
+		self.items_total = metrics.counter('pipeline_stage_items_total', graph=graph, stage=stage.name)
+		self.dropped_total = metrics.counter('pipeline_stage_dropped_total', graph=graph, stage=stage.name)
+
+
+class StageGraph(Generic[_Out]):
+	"""
+	Linear chain of stages, each on its own worker thread(s), joined by bounded queues.
+	A full queue blocks the stage feeding it, so the slowest stage sets the pace while
+	the others overlap with it. Stages with several workers finish out of order; a
+	per-node reorder buffer releases results strictly by sequence number.
+	"""
+
+	def __init__(
+		self,
+		name: str,
+		source: Callable[[], Any | None],
+		stages: Sequence[Stage[Any, Any]],
+		capacity: int = 2,
+	) -> None:
+		if not stages:
+			raise ValueError('StageGraph needs at least one stage')
+		self.name = name
+		self._source = source
+		self._capacity = max(1, capacity)
+		self._nodes: list[_Node] = []
+		for stage in stages:
+			inbox: queue.Queue[_Envelope] = queue.Queue(maxsize=self._capacity)
+			if self._nodes:
+				self._nodes[-1].outbox = inbox
+			self._nodes.append(_Node(name, stage, inbox, self._capacity))
+		self._output: queue.Queue[_Envelope] = queue.Queue(maxsize=self._capacity)
+		self._nodes[-1].outbox = self._output
+		self._threads: list[threading.Thread] = []
+		self._running = False
+		self._started = 0.0
+		self.logger = Logger(name=f'pipeline_{name}')
+
+		self._source_seconds = metrics.histogram('pipeline_stage_seconds', graph=name, stage='source')
+		self._source_errors_total = metrics.counter('pipeline_source_errors_total', graph=name)
+		self._latency = metrics.histogram('pipeline_latency_seconds', graph=name)
+		self._outputs_total = metrics.counter('pipeline_outputs_total', graph=name)
+		metrics.collector(f'pipeline_{name}', self._metrics)
+
+	@property
+	def running(self) -> bool:
+		return self._running
+
+	def start(self) -> None:
+		if self._running:
+			return
+		self._running = True
+		self._started = time.perf_counter()
+		self._threads = [threading.Thread(target=self._feed, name=f'{self.name}_source', daemon=True)]
+		for node in self._nodes:
+			node.pending.clear()
+			node.next_seq = 0
+			for index in range(node.stage.workers):
+				self._threads.append(
+					threading.Thread(
+						target=self._work, args=(node,), name=f'{self.name}_{node.stage.name}_{index}', daemon=True
+					)
+				)
+		for thread in self._threads:
+			thread.start()
+
+	def stop(self) -> None:
+		if not self._running:
+			return
+		self._running = False
+		for thread in self._threads:
+			if thread is not threading.current_thread():
+				thread.join(timeout=1.0)
+		self._threads = []
+		for q in [node.inbox for node in self._nodes] + [self._output]:
+			while True:
+				try:
+					q.get_nowait()
+				except queue.Empty:
+					break
+
+	def outputs(self) -> Generator[_Out, None, None]:
+		"""Yields the last stage's results in source order until stop()."""
+		while self._running:
+			try:
+				_, entered, item = self._output.get(timeout=_POLL)
+			except queue.Empty:
+				continue
+			if item is None:
+				continue
+			self._latency.observe(time.perf_counter() - entered)
+			self._outputs_total.inc()
+			yield item
+
+	def stats(self) -> tuple[StageStats, ...]:
+		elapsed = max(time.perf_counter() - self._started, 1e-9) if self._started else 0.0
+		result: list[StageStats] = []
+		for node in self._nodes:
+			with node.lock:
+				handled = node.processed + node.dropped
+				result.append(
+					StageStats(
+						name=node.stage.name,
+						workers=node.stage.workers,
+						processed=node.processed,
+						dropped=node.dropped,
+						queue_depth=node.inbox.qsize(),
+						queue_capacity=node.capacity,
+						busy=node.busy / (elapsed * node.stage.workers) if elapsed else 0.0,
+						latency_mean=node.latency_sum / handled if handled else 0.0,
+						latency_max=node.latency_max,
+					)
+				)
+		return tuple(result)
+
+	def _put(self, target: queue.Queue[_Envelope], envelope: _Envelope) -> bool:
+		while self._running:
+			try:
+				target.put(envelope, timeout=_POLL)
+				return True
+			except queue.Full:
+				continue
+		return False
+
+	def _feed(self) -> None:
+		seq = 0
+		first = self._nodes[0].inbox
+		while self._running:
+			t0 = time.perf_counter()
+			try:
+				item = self._source()
+			except Exception as error:
+				# Igual que una etapa: se registra y se sigue, sin matar el hilo que alimenta el grafo
+				self._source_errors_total.inc()
+				self.logger.error('Source of %s failed: %s', self.name, error)
+				time.sleep(_POLL)
+				continue
+			if item is None:
+				continue
+			self._source_seconds.observe(time.perf_counter() - t0)
+			if not self._put(first, (seq, t0, item)):
+				break
+			seq += 1
+
+	def _work(self, node: _Node) -> None:
+		process = node.stage.process
+		while self._running:
+			try:
+				seq, entered, item = node.inbox.get(timeout=_POLL)
+			except queue.Empty:
+				continue
+
+			elapsed = 0.0
+			result = None
+			if item is not None:
+				t0 = time.perf_counter()
+				try:
+					result = process(item)
+				except Exception as error:
+					self.logger.error('Stage %s failed: %s', node.stage.name, error)
+				elapsed = time.perf_counter() - t0
+
+			with node.lock:
+				if item is not None:
+					node.busy += elapsed
+					node.latency_sum += elapsed
+					node.latency_max = max(node.latency_max, elapsed)
+					node.seconds.observe(elapsed)
+					if result is None:
+						node.dropped += 1
+						node.dropped_total.inc()
+					else:
+						node.processed += 1
+						node.items_total.inc()
+
+			# Sin el lock de contadores: un put bloqueado por backpressure no frena stats()
+			with node.order:
+				node.pending[seq] = (seq, entered, result)
+				# Solo se libera en orden: un worker rápido espera al que lleva el item anterior
+				assert node.outbox is not None
+				while node.next_seq in node.pending:
+					if not self._put(node.outbox, node.pending.pop(node.next_seq)):
+						return
+					node.next_seq += 1
+
+	def _metrics(self) -> dict[str, float]:
+		values: dict[str, float] = {}
+		for stats in self.stats():
+			labels = {'graph': self.name, 'stage': stats.name}
+			values[metric_key('pipeline_stage_queue_depth', **labels)] = stats.queue_depth
+			values[metric_key('pipeline_stage_occupancy', **labels)] = stats.queue_depth / stats.queue_capacity
+			values[metric_key('pipeline_stage_busy', **labels)] = stats.busy
+		return values
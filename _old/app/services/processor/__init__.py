@@ -1,5 +1,7 @@
 from .postprocessor import VideoPostProcessorService
 from .preprocessor import VideoPreProcessorService
+from .stitcher import PanoramaStitcher
 from .transformer import VideoTransformationService
+from .undistort import LensUndistorter
 
-__all__ = ['VideoTransformationService', 'VideoPostProcessorService', 'VideoPreProcessorService']
+__all__ = ['LensUndistorter', 'PanoramaStitcher', 'VideoTransformationService', 'VideoPostProcessorService', 'VideoPreProcessorService']
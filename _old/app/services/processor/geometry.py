@@ -0,0 +1,145 @@
+import json
+import threading
+from math import radians, tan
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from app.infra.logger import Logger
+from app.models.calibrator.calibration_parameters import CameraCalibrationParameters
+from config.settings import Settings
+
+Size = tuple[int, int]  # width, height
+FloatMap = tuple[NDArray[np.float32], NDArray[np.float32]]
+FixedMap = tuple[NDArray[np.int16], NDArray[np.uint16]]
+
+CAMERAS: tuple[str, str] = ('camera_0', 'camera_1')
+
+_logger = Logger(name='geometry')
+
+
+def load_calibration(path: str | None = None) -> CameraCalibrationParameters | None:
+	path = path or Settings.processing.calibration_path
+	try:
+		with open(path) as file:
+			return CameraCalibrationParameters.from_firmware(json.load(file))
+	except (OSError, ValueError) as error:
+		_logger.warning('No camera calibration at %s (%s), using the lens FOV', path, error)
+		return None
+
+
+def calibration_digest(calibration: CameraCalibrationParameters | None) -> str:
+	return calibration.digest() if calibration else f'fov:{Settings.camera.fov}'
+
+
+def camera_matrix(calibration: CameraCalibrationParameters | None, camera: str, size: Size) -> NDArray[np.float64]:
+	"""Intrinsics for `camera` scaled to `size`; a pinhole from the lens FOV when uncalibrated."""
+	width, height = size
+	matrix = calibration.camera_matrix(camera) if calibration else None
+	resolution = calibration.resolution(camera) if calibration else None
+	if matrix is None or resolution is None:
+		focal = width / 2 / tan(radians(Settings.camera.fov / 2))
+		return np.array([[focal, 0, width / 2], [0, focal, height / 2], [0, 0, 1]], dtype=np.float64)
+	scaled = matrix.copy()
+	scaled[0] *= width / resolution[0]
+	scaled[1] *= height / resolution[1]
+	return scaled
+
+
+def distortion(calibration: CameraCalibrationParameters | None, camera: str) -> NDArray[np.float64] | None:
+	"""Distortion coefficients, or None when there are none or all are zero."""
+	coefficients = calibration.distortion(camera) if calibration else None
+	if coefficients is None or not np.any(coefficients):
+		return None
+	return coefficients
+
+
+def to_fixed(maps: FloatMap) -> FixedMap:
+	"""CV_16SC2 + interpolation table: half the bytes of float maps and a faster remap."""
+	x, y = maps
+	return cv2.convertMaps(np.ascontiguousarray(x), np.ascontiguousarray(y), cv2.CV_16SC2)
+
+
+def compose_maps(outer: FloatMap, inner: FloatMap) -> FloatMap:
+	"""
+	outer: output -> intermediate, inner: intermediate -> source. Returns output -> source,
+	so two geometric warps (undistort + stitch, stitch + crop, ...) cost a single remap.
+	Pixels that fall outside either map come out as -1.
+	"""
+	x, y = outer
+	inner_x, inner_y = inner
+	border = (-1.0, -1.0, -1.0, -1.0)
+	composed_x = cv2.remap(inner_x, x, y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT, borderValue=border)
+	composed_y = cv2.remap(inner_y, x, y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT, borderValue=border)
+	outside = (x < 0) | (y < 0)
+	composed_x[outside] = -1.0
+	composed_y[outside] = -1.0
+	return composed_x, composed_y
+
+
+_undistort_cache: dict[tuple[str, str, Size], FloatMap] = {}
+_undistort_lock = threading.Lock()
+
+
+def undistort_maps(calibration: CameraCalibrationParameters | None, camera: str, size: Size) -> FloatMap | None:
+	"""
+	Undistorted -> distorted float maps for `camera` at `size` (same intrinsics on both
+	sides), cached per calibration digest and resolution. None when there is nothing to undo.
+	"""
+	coefficients = distortion(calibration, camera)
+	if coefficients is None:
+		return None
+	key = (calibration_digest(calibration), camera, size)
+	with _undistort_lock:
+		maps = _undistort_cache.get(key)
+		if maps is None:
+			matrix = camera_matrix(calibration, camera, size)
+			maps = cv2.initUndistortRectifyMap(matrix, coefficients, None, matrix, size, cv2.CV_32FC1)
+			_undistort_cache[key] = maps
+		return maps
+
+
+def half_maps(maps: FloatMap) -> FloatMap:
+	"""4:2:0 chroma maps from luma maps: half the size, in chroma coordinates."""
+	x, y = maps
+	size = (x.shape[1] // 2, x.shape[0] // 2)
+	half_x = cv2.resize(x, size, interpolation=cv2.INTER_LINEAR)
+	half_y = cv2.resize(y, size, interpolation=cv2.INTER_LINEAR)
+	return (
+		np.where(half_x < 0, -1.0, half_x / 2 - 0.25).astype(np.float32),
+		np.where(half_y < 0, -1.0, half_y / 2 - 0.25).astype(np.float32),
+	)
+
+
+def crop_maps(box: tuple[float, float, float, float], size: Size) -> FloatMap:
+	"""Output -> source maps that scale `box` (x1, y1, x2, y2 in source pixels) to `size`, pixel centres aligned."""
+	x1, y1, x2, y2 = box
+	width, height = size
+	x = (np.arange(width, dtype=np.float32) + 0.5) * np.float32((x2 - x1) / width) + np.float32(x1 - 0.5)
+	y = (np.arange(height, dtype=np.float32) + 0.5) * np.float32((y2 - y1) / height) + np.float32(y1 - 0.5)
+	# Al ampliar, el primer centro cae antes del píxel 0: compose_maps lo tomaría por fuera
+	np.maximum(x, 0, out=x)
+	np.maximum(y, 0, out=y)
+	return np.tile(x, (height, 1)), np.repeat(y[:, None], width, axis=1)
+
+
+def map_bounds(maps: FloatMap, box: tuple[int, int, int, int]) -> tuple[int, int, int, int]:
+	"""
+	Source box that `maps` reads for the output region `box`, one pixel wider for the
+	bilinear taps and clamped to the map size. Only the edges are sampled: lens maps are
+	monotonic, so the extremes of a region lie on its border.
+	"""
+	x, y = maps
+	height, width = x.shape
+	x1, y1, x2, y2 = box
+	left = float(x[y1:y2, x1].min())
+	right = float(x[y1:y2, x2 - 1].max())
+	top = float(y[y1, x1:x2].min())
+	bottom = float(y[y2 - 1, x1:x2].max())
+	return (
+		max(0, int(np.floor(left)) - 1),
+		max(0, int(np.floor(top)) - 1),
+		min(width, int(np.ceil(right)) + 2),
+		min(height, int(np.ceil(bottom)) + 2),
+	)
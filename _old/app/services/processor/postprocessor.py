@@ -1,18 +1,47 @@
-import cv2
-import numpy as np
-
 from app.infra.logger.loger_adapter import Logger
 from app.models.capturer import Frame
 from config.settings import Settings
 
+from .geometry import CAMERAS, FloatMap, Size, distortion, load_calibration
+from .stitcher import PanoramaStitcher
+from .undistort import LensUndistorter
+
 
 class VideoPostProcessorService:
 	def __init__(self) -> None:
 		self.settings = Settings
 		self.logger = Logger(name='video_post_processor_service')
+		self._mode: str = self.settings.processing.stitch
+		self._stitcher: PanoramaStitcher | None = None
+		self._undistorters: tuple[LensUndistorter | None, ...] = (None, None)
+		calibration = load_calibration()
+		if self._mode == 'cylindrical':
+			# La corrección de lente va dentro de los mapas del stitcher: un solo remap
+			self._stitcher = PanoramaStitcher(self.settings.stream.resolution, calibration)
+		elif self._mode != 'none':
+			raise ValueError(f'Unknown stitch mode: {self._mode}')
+		elif self.settings.processing.undistort:
+			# Una por cámara: el zoom puede salir de cualquiera de las dos
+			self._undistorters = tuple(
+				LensUndistorter(camera, calibration) if distortion(calibration, camera) is not None else None
+				for camera in CAMERAS
+			)
+
+	@property
+	def stitched(self) -> bool:
+		return self._stitcher is not None
+
+	def lens(self, camera: int, size: Size) -> FloatMap | None:
+		"""Undistorted -> distorted maps of `camera` at `size`, for crops composed with the correction."""
+		undistorter = self._undistorters[camera]
+		return undistorter.maps(size) if undistorter is not None else None
 
 	def process(self, frame_0: Frame, frame_1: Frame) -> Frame:
-		frame_0_data = frame_0.data
+		if self._stitcher is not None:
+			return self._stitcher.process(frame_0, frame_1)
+		undistorter = self._undistorters[1]
+		if undistorter is not None:
+			frame_1 = undistorter.process(frame_1)
 		frame_1_data = frame_1.data
 		frame_data = frame_1_data  # cv2.hconcat((frame_0_data, frame_1_data))
-		return Frame(data=frame_data, timestamp=frame_0.timestamp)
+		return Frame(data=frame_data, timestamp=frame_0.timestamp, format=frame_1.format)
@@ -1,27 +1,100 @@
+import threading
+
 import cv2
 import numpy as np
+from numpy.typing import NDArray
 
+from app.infra.memory import FramePool
 from app.models.capturer import Frame
 from config.settings import Settings
 
+from .utils import Box, output_format, resize
+
+
+def unsharp_kernel(ksize: int, amount: float) -> NDArray[np.float32]:
+	"""(1 + amount) * identity - amount * gaussian: blur and addWeighted in one filter2D pass."""
+	gaussian = cv2.getGaussianKernel(ksize, 0)
+	kernel = -amount * (gaussian @ gaussian.T)
+	kernel[ksize // 2, ksize // 2] += 1 + amount
+	return kernel.astype(np.float32)
+
 
 class VideoPreProcessorService:
-	def __init__(self) -> None:
+	"""
+	Long-lived, one per camera. Output frames come from a FramePool and every OpenCV call
+	writes through dst=, so steady state allocates nothing per frame. With a `box` only that
+	region of the source is resized and sharpened (crop-first ROI processing).
+	"""
+
+	def __init__(self, name: str | None = None, sharpen: str | None = None) -> None:
 		self.settings = Settings
+		self.name = name
+		processing = self.settings.processing
+		self._size: tuple[int, int] = self.settings.stream.resolution
+		self._mode: str = sharpen or processing.sharpen
+		self._amount: float = processing.sharpen_amount
+		self._ksize: int = processing.sharpen_ksize
+		self._kernel = unsharp_kernel(self._ksize, self._amount)
+		self._pools: dict[tuple[int, ...], FramePool] = {}
+		# El recorte de respaldo puede llegar desde otra etapa mientras esta preprocesa
+		self._lock = threading.Lock()
+		self._blur: NDArray[np.uint8] | None = None
+
+	def process(self, frame: Frame, box: Box | None = None, size: tuple[int, int] | None = None) -> Frame:
+		size = size or self._size
+		with self._lock:
+			if box is not None:
+				resized = resize(frame, size, box=box, out=self._output(frame, size), interpolation=cv2.INTER_AREA)
+				# En YUV solo se realza la luma: el croma no aporta nitidez percibida
+				self._sharpen(resized.planes()[0], resized.planes()[0])
+				return resized
+			# El nivel reducido queda memoizado en el frame para tracker y previews; si ya
+			# existe no se toma buffer del pool, que level() ni siquiera escribiría
+			level = frame.cached_level(size=size) or frame.level(size=size, out=self._output(frame, size))
+			if self._mode == 'none':
+				return level
+			out = self._output(frame, size)
+			if out is None:
+				out = np.empty_like(level.data)
+			result = Frame(data=out, timestamp=frame.timestamp, format=level.format)
+			source, target = level.planes(), result.planes()
+			self._sharpen(source[0], target[0])
+			for src, dst in zip(source[1:], target[1:]):
+				np.copyto(dst, src)
+		return result
+
+	def _output(self, frame: Frame, size: tuple[int, int]) -> NDArray[np.uint8] | None:
+		target = output_format(frame.format)
+		shape = target.shape(*size)
+		full = target.shape(*self._size)
+		# Los ROI (tamaño variable) usan un prefijo contiguo del buffer del frame completo
+		pool_shape = full if int(np.prod(shape)) <= int(np.prod(full)) else shape
+		pool = self._pools.get(pool_shape)
+		if pool is None:
+			if len(self._pools) >= 2:
+				self._pools.pop(next(iter(self._pools))).close()
+			suffix = '' if pool_shape == full else f'_{size[0]}x{size[1]}'
+			pool = FramePool(shape=pool_shape, capacity=4, name=f'preprocess_{self.name or id(self)}{suffix}')
+			self._pools[pool_shape] = pool
+		# None si el presupuesto de memoria lo rechaza: resize() reserva uno propio
+		buffer = pool.acquire()
+		if buffer is None or pool_shape == shape:
+			return buffer
+		return buffer.reshape(-1)[: int(np.prod(shape))].reshape(shape)
 
-	def process(self, frame: Frame) -> Frame:
-		timestamp = frame.timestamp
-		data = frame.data
-		resized = cv2.resize(
-			data,
-			(self.settings.stream.resolution[0], self.settings.stream.resolution[1]),
-			interpolation=cv2.INTER_AREA,
-		)
-		size = (5, 5)
-		reduced_blur = cv2.GaussianBlur(
-			resized, ksize=size, sigmaX=0, borderType=cv2.BORDER_DEFAULT
-		)
-		amount = 0.18
-		sharpen = cv2.addWeighted(resized, 1 + amount, reduced_blur, -amount, 0)
-		processed_frame = sharpen
-		return Frame(data=processed_frame, timestamp=timestamp)
+	def _sharpen(self, source: NDArray[np.uint8], target: NDArray[np.uint8]) -> None:
+		"""Sharpens `source` into `target`; both may be the same array."""
+		match self._mode:
+			case 'fused':
+				cv2.filter2D(source, -1, self._kernel, dst=target, borderType=cv2.BORDER_DEFAULT)
+			case 'unsharp':
+				if self._blur is None or self._blur.shape != source.shape:
+					self._blur = np.empty_like(source)
+				size = (self._ksize, self._ksize)
+				cv2.GaussianBlur(source, ksize=size, sigmaX=0, dst=self._blur, borderType=cv2.BORDER_DEFAULT)
+				cv2.addWeighted(source, 1 + self._amount, self._blur, -self._amount, 0, dst=target)
+			case 'none':
+				if target is not source:
+					np.copyto(target, source)
+			case _:
+				raise ValueError(f'Unknown sharpen mode: {self._mode}')
@@ -0,0 +1,248 @@
+import threading
+from dataclasses import dataclass
+from math import atan
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from app.infra.logger import Logger
+from app.infra.memory import FramePool
+from app.models.calibrator.calibration_parameters import CameraCalibrationParameters
+from app.models.capturer import Frame, PixelFormat
+from config.settings import Settings
+
+from .geometry import (
+	CAMERAS,
+	FixedMap,
+	FloatMap,
+	Size,
+	calibration_digest,
+	camera_matrix,
+	compose_maps,
+	half_maps,
+	to_fixed,
+	undistort_maps,
+)
+
+_logger = Logger(name='stitcher')
+
+
+@dataclass(frozen=True)
+class _PlaneMaps:
+	left: FixedMap  # camera_0 -> columnas [0, band_end)
+	right: FixedMap  # camera_1 -> columnas [band_end, width)
+	band: FixedMap  # camera_1 -> columnas [band_start, band_end)
+	weights: tuple[NDArray[np.float32], NDArray[np.float32]]
+	band_start: int
+	band_end: int
+	border: int
+
+
+@dataclass(frozen=True)
+class PanoramaMaps:
+	size: Size
+	format: PixelFormat
+	planes: tuple[_PlaneMaps, ...]
+
+	@property
+	def nbytes(self) -> int:
+		total = 0
+		for plane in self.planes:
+			for xy, fraction in (plane.left, plane.right, plane.band):
+				total += xy.nbytes + fraction.nbytes
+			total += sum(weight.nbytes for weight in plane.weights)
+		return total
+
+
+def cylindrical_maps(
+	source: Size, canvas: Size, matrices: tuple[NDArray[np.float64], NDArray[np.float64]], overlap: float
+) -> tuple[FloatMap, FloatMap, tuple[float, float]]:
+	"""
+	Canvas -> source float maps for both cameras on a shared cylinder whose radius is the
+	mean focal length. The cameras are yawed apart so that `overlap` source columns are
+	seen by both; the panorama is fitted into `canvas` keeping its aspect ratio.
+	Returns (left maps, right maps, overlap band as canvas columns).
+	"""
+	width, height = source
+	canvas_width, canvas_height = canvas
+	focal = float(np.mean([matrix[0, 0] for matrix in matrices]))
+	hfov = 2 * atan(width / (2 * focal))
+	overlap_angle = hfov * overlap / width
+	yaw = (hfov - overlap_angle) / 2
+	span = 2 * hfov - overlap_angle
+
+	scale = min(canvas_width / (focal * span), canvas_height / height)
+	offset_x = (canvas_width - focal * span * scale) / 2
+	offset_y = (canvas_height - height * scale) / 2
+	alpha = ((np.arange(canvas_width, dtype=np.float64) - offset_x) / scale) / focal - span / 2
+	rows = ((np.arange(canvas_height, dtype=np.float64) - offset_y) / scale - height / 2) / focal
+
+	maps: list[FloatMap] = []
+	for matrix, sign in zip(matrices, (-1.0, 1.0)):
+		angle = alpha - sign * yaw
+		cos = np.cos(angle)
+		visible = (cos > 1e-3) & (np.abs(alpha) <= span / 2)
+		safe = np.where(visible, cos, 1.0)
+		x = np.where(visible, matrix[0, 0] * np.tan(np.where(visible, angle, 0.0)) + matrix[0, 2], -1.0)
+		y = matrix[1, 1] * rows[:, None] / safe[None, :] + matrix[1, 2]
+		y[:, ~visible] = -1.0
+		maps.append((np.broadcast_to(x, y.shape).astype(np.float32), y.astype(np.float32)))
+
+	band = (
+		(-overlap_angle / 2 + span / 2) * focal * scale + offset_x,
+		(overlap_angle / 2 + span / 2) * focal * scale + offset_x,
+	)
+	return maps[0], maps[1], band
+
+
+def _inside(maps: FloatMap, source: Size) -> NDArray[np.bool_]:
+	x, y = maps
+	return (x >= 0) & (x <= source[0] - 1) & (y >= 0) & (y <= source[1] - 1)
+
+
+def _plane_maps(
+	left: FloatMap, right: FloatMap, source: Size, band_start: int, band_end: int, border: int
+) -> _PlaneMaps:
+	band_width = band_end - band_start
+	# Mezcla lineal (feathering) solo dentro de la banda de solape
+	ramp = (np.arange(band_width, dtype=np.float32) + 0.5) / max(band_width, 1)
+	band = np.s_[:, band_start:band_end]
+	# Peso cero donde una cámara no ve el píxel: las esquinas negras no entran en la mezcla
+	seen_left = _inside((left[0][band], left[1][band]), source)
+	seen_right = _inside((right[0][band], right[1][band]), source)
+	# Fuera de ambas: se mezclan los bordes (negro), no ceros (verde en croma)
+	unseen = ~(seen_left | seen_right)
+	seen_left |= unseen
+	seen_right |= unseen
+	return _PlaneMaps(
+		left=to_fixed((left[0][:, :band_end], left[1][:, :band_end])),
+		right=to_fixed((right[0][:, band_end:], right[1][:, band_end:])),
+		band=to_fixed((right[0][band], right[1][band])),
+		weights=(
+			np.where(seen_left, 1.0 - ramp, 0.0).astype(np.float32),
+			np.where(seen_right, ramp, 0.0).astype(np.float32),
+		),
+		band_start=band_start,
+		band_end=band_end,
+		border=border,
+	)
+
+
+def build_panorama_maps(
+	source: Size,
+	canvas: Size,
+	pixel_format: PixelFormat,
+	matrices: tuple[NDArray[np.float64], NDArray[np.float64]],
+	overlap: float,
+	lenses: tuple[FloatMap | None, FloatMap | None] = (None, None),
+) -> PanoramaMaps:
+	"""`lenses` are per-camera undistortion maps, composed in so undistort + stitch is one remap."""
+	left, right, (start, end) = cylindrical_maps(source, canvas, matrices, overlap)
+	if lenses[0] is not None:
+		left = compose_maps(left, lenses[0])
+	if lenses[1] is not None:
+		right = compose_maps(right, lenses[1])
+	band_start = max(0, int(start)) & ~1
+	band_end = min(canvas[0], -(-int(end) // 2) * 2)
+	planes = [_plane_maps(left, right, source, band_start, band_end, border=0)]
+	if pixel_format.yuv:
+		chroma_left, chroma_right = half_maps(left), half_maps(right)
+		chroma_source = (source[0] // 2, source[1] // 2)
+		chroma = _plane_maps(chroma_left, chroma_right, chroma_source, band_start // 2, band_end // 2, border=128)
+		planes += [chroma, chroma]
+	return PanoramaMaps(size=canvas, format=pixel_format, planes=tuple(planes))
+
+
+_cache: dict[tuple[object, ...], PanoramaMaps] = {}
+_cache_lock = threading.Lock()
+
+
+def panorama_maps(
+	calibration: CameraCalibrationParameters | None,
+	source: Size,
+	canvas: Size,
+	pixel_format: PixelFormat,
+	overlap: float,
+) -> PanoramaMaps:
+	"""Cached by calibration hash and resolution: the trigonometry runs once per configuration."""
+	undistort = Settings.processing.undistort
+	key = (calibration_digest(calibration), source, canvas, pixel_format, round(overlap, 3), undistort)
+	with _cache_lock:
+		maps = _cache.get(key)
+		if maps is None:
+			matrices = (
+				camera_matrix(calibration, CAMERAS[0], source),
+				camera_matrix(calibration, CAMERAS[1], source),
+			)
+			lenses = (
+				undistort_maps(calibration, CAMERAS[0], source) if undistort else None,
+				undistort_maps(calibration, CAMERAS[1], source) if undistort else None,
+			)
+			maps = build_panorama_maps(source, canvas, pixel_format, matrices, overlap, lenses)
+			_cache[key] = maps
+			_logger.info(
+				'Panorama maps %dx%d -> %dx%d (%s, %.1f MB)',
+				*source, *canvas, pixel_format.label, maps.nbytes / 1e6,
+			)
+		return maps
+
+
+class PanoramaStitcher:
+	"""
+	Two-camera cylindrical panorama. Every canvas pixel is produced by one remap from the
+	camera that sees it; only the overlap band gets a second remap and a blendLinear.
+	"""
+
+	def __init__(self, size: Size | None = None, calibration: CameraCalibrationParameters | None = None) -> None:
+		self.size: Size = size or Settings.stream.resolution
+		self.calibration = calibration
+		self._pool: FramePool | None = None
+		self._band: list[NDArray[np.uint8]] = []
+
+	def process(self, frame_0: Frame, frame_1: Frame) -> Frame:
+		if frame_0.format is not frame_1.format or frame_0.data.shape != frame_1.data.shape:
+			raise ValueError('Stitching needs both frames in the same format and size')
+		source = (frame_0.width, frame_0.height)
+		# El solape de FOVSettings está en píxeles de la resolución del sensor
+		overlap = Settings.fov.focal_pixel_overlap() * source[0] / Settings.camera.resolution[0]
+		maps = panorama_maps(self.calibration, source, self.size, frame_0.format, overlap)
+
+		shape = frame_0.format.shape(*self.size)
+		if self._pool is None:
+			self._pool = FramePool(shape=shape, capacity=4, name='stitch')
+		elif self._pool.shape != shape:
+			self._pool.resize(shape)
+		out = self._pool.acquire()
+		if out is None:
+			out = np.empty(shape, dtype=np.uint8)
+
+		if len(self._band) != len(maps.planes):
+			self._band = [np.empty(0, dtype=np.uint8)] * len(maps.planes)
+		for index, (plane, src_0, src_1, dst) in enumerate(
+			zip(maps.planes, frame_0.planes(), frame_1.planes(), frame_0.format.planes(out))
+		):
+			self._stitch_plane(index, plane, src_0, src_1, dst)
+		return Frame(data=out, timestamp=frame_0.timestamp, format=frame_0.format)
+
+	def _stitch_plane(
+		self,
+		index: int,
+		plane: _PlaneMaps,
+		src_0: NDArray[np.uint8],
+		src_1: NDArray[np.uint8],
+		dst: NDArray[np.uint8],
+	) -> None:
+		start, end = plane.band_start, plane.band_end
+		border = (plane.border,) * 4
+		remap = cv2.remap
+		remap(src_0, *plane.left, cv2.INTER_LINEAR, dst=dst[:, :end], borderMode=cv2.BORDER_CONSTANT, borderValue=border)
+		remap(src_1, *plane.right, cv2.INTER_LINEAR, dst=dst[:, end:], borderMode=cv2.BORDER_CONSTANT, borderValue=border)
+		if end <= start:
+			return
+		band_shape = (dst.shape[0], end - start, *dst.shape[2:])
+		if self._band[index].shape != band_shape:
+			self._band[index] = np.empty(band_shape, dtype=np.uint8)
+		band = self._band[index]
+		remap(src_1, *plane.band, cv2.INTER_LINEAR, dst=band, borderMode=cv2.BORDER_CONSTANT, borderValue=border)
+		cv2.blendLinear(dst[:, start:end], band, *plane.weights, dst=dst[:, start:end])
@@ -4,25 +4,88 @@ import numpy as np
 from app.models.capturer import Frame
 from app.models.tracker import ZoomData
 
+from .geometry import FloatMap, compose_maps, crop_maps, half_maps
+from .utils import Box, output_format, resize
+
+
+def zoom_box(size: tuple[int, int], zoom: ZoomData) -> Box:
+	"""Crop window for `zoom` inside a frame of `size`, clamped to the frame."""
+	frame_width, frame_height = size
+	crop_w: int = max(16, int(frame_width * (1 - zoom.zoom_level)))
+	crop_h: int = max(9, int(frame_height * (1 - zoom.zoom_level)))
+	x1 = int(zoom.center.x - crop_w / 2)
+	y1 = int(zoom.center.y - crop_h / 2)
+	x1: int = max(0, min(x1, frame_width - crop_w))
+	y1: int = max(0, min(y1, frame_height - crop_h))
+	return x1, y1, x1 + crop_w, y1 + crop_h
+
+
+def expand_box(box: Box, margin: float, size: tuple[int, int]) -> Box:
+	"""Grows `box` by `margin` of its size on every side, clamped to `size`."""
+	x1, y1, x2, y2 = box
+	dx = int((x2 - x1) * margin)
+	dy = int((y2 - y1) * margin)
+	return max(0, x1 - dx), max(0, y1 - dy), min(size[0], x2 + dx), min(size[1], y2 + dy)
+
+
+def scale_box(box: Box, sx: float, sy: float) -> Box:
+	x1, y1, x2, y2 = box
+	return int(x1 * sx), int(y1 * sy), int(np.ceil(x2 * sx)), int(np.ceil(y2 * sy))
+
+
+def contains(outer: Box, inner: Box) -> bool:
+	return outer[0] <= inner[0] and outer[1] <= inner[1] and inner[2] <= outer[2] and inner[3] <= outer[3]
+
 
 class VideoTransformationService:
+	"""
+	Crops the zoom window and scales it to `target_size`. With `lens` (undistorted ->
+	distorted maps of the full frame) the window is taken from the corrected geometry and
+	crop, scale and undistortion are one remap.
+	"""
+
 	def __init__(self, target_size: tuple[int, int] = (1920, 1080)) -> None:
 		self.target_size: tuple[int, int] = target_size
 
-	def process(self, frames: Frame, zoom: ZoomData) -> Frame:
-		frame_width, frame_height = frames.data.shape[1], frames.data.shape[0]
-		crop_w: int = max(16, int(frame_width * (1 - zoom.zoom_level)))
-		crop_h: int = max(9, int(frame_height * (1 - zoom.zoom_level)))
-		x1 = int(zoom.center.x - crop_w / 2)
-		y1 = int(zoom.center.y - crop_h / 2)
-		x1: int = max(0, min(x1, frame_width - crop_w))
-		y1: int = max(0, min(y1, frame_height - crop_h))
-		x2: int = x1 + crop_w
-		y2: int = y1 + crop_h
-
-		cropped = frames.data[y1:y2, x1:x2]
-		resized = cv2.resize(cropped, self.target_size, interpolation=cv2.INTER_AREA)
-		return Frame(
-			data=resized,
-			timestamp=frames.timestamp,
-		)
+	def process(self, frames: Frame, zoom: ZoomData, lens: FloatMap | None = None) -> Frame:
+		box = zoom_box((frames.width, frames.height), zoom)
+		if lens is None:
+			return resize(frames, self.target_size, box=box, interpolation=cv2.INTER_AREA)
+		return self._warp(frames, compose_maps(crop_maps(box, self.target_size), lens))
+
+	def process_roi(self, frames: Frame, roi: Box, window: Box, lens: FloatMap | None = None) -> Frame:
+		"""
+		Crops `window` out of a frame that only holds `roi` of the full image (both boxes in
+		full-frame coordinates). `window` must lie inside `roi`; with `lens`, `roi` is in
+		distorted coordinates and must hold map_bounds(lens, window).
+		"""
+		rx1, ry1, rx2, ry2 = roi
+		sx = frames.width / (rx2 - rx1)
+		sy = frames.height / (ry2 - ry1)
+		if lens is not None:
+			x, y = compose_maps(crop_maps(window, self.target_size), lens)
+			# Del frame completo a los píxeles del ROI; lo marcado fuera (-1) sigue negativo
+			x -= rx1 - 0.5
+			x *= sx
+			x -= 0.5
+			y -= ry1 - 0.5
+			y *= sy
+			y -= 0.5
+			return self._warp(frames, (x, y))
+		x1, y1, x2, y2 = window
+		local = scale_box((x1 - rx1, y1 - ry1, x2 - rx1, y2 - ry1), sx, sy)
+		local = (local[0], local[1], min(local[2], frames.width), min(local[3], frames.height))
+		return resize(frames, self.target_size, box=local, interpolation=cv2.INTER_AREA)
+
+	def _warp(self, frames: Frame, maps: FloatMap) -> Frame:
+		"""One remap per plane; the window moves every frame, so the maps stay float (no convertMaps)."""
+		target = output_format(frames.format)
+		out = np.empty(target.shape(*self.target_size), dtype=np.uint8)
+		planes = [maps]
+		if frames.format.yuv:
+			chroma = half_maps(maps)
+			planes += [chroma, chroma]
+		for index, (plane, src, dst) in enumerate(zip(planes, frames.planes(), target.planes(out))):
+			border = (128 if index else 0,) * 4 if frames.format.yuv else (0,) * 4
+			cv2.remap(src, *plane, cv2.INTER_LINEAR, dst=dst, borderMode=cv2.BORDER_CONSTANT, borderValue=border)
+		return Frame(data=out, timestamp=frames.timestamp, format=target)
@@ -0,0 +1,64 @@
+import threading
+
+import cv2
+import numpy as np
+
+from app.infra.memory import FramePool
+from app.models.calibrator.calibration_parameters import CameraCalibrationParameters
+from app.models.capturer import Frame, PixelFormat
+
+from .geometry import FixedMap, FloatMap, Size, calibration_digest, half_maps, to_fixed, undistort_maps
+
+_cache: dict[tuple[object, ...], tuple[FixedMap, ...] | None] = {}
+_cache_lock = threading.Lock()
+
+
+def plane_undistort_maps(
+	calibration: CameraCalibrationParameters | None, camera: str, size: Size, pixel_format: PixelFormat
+) -> tuple[FixedMap, ...] | None:
+	"""Fixed-point maps per plane (luma + half-size chroma for YUV), built once per calibration and resolution."""
+	key = (calibration_digest(calibration), camera, size, pixel_format)
+	with _cache_lock:
+		if key not in _cache:
+			maps = undistort_maps(calibration, camera, size)
+			if maps is None:
+				_cache[key] = None
+			else:
+				planes = [to_fixed(maps)]
+				if pixel_format.yuv:
+					chroma = to_fixed(half_maps(maps))
+					planes += [chroma, chroma]
+				_cache[key] = tuple(planes)
+		return _cache[key]
+
+
+class LensUndistorter:
+	"""
+	Standalone undistortion for one camera: one remap per plane into a pooled buffer.
+	When another warp follows (stitching, zoom crops), compose its maps with maps() instead.
+	"""
+
+	def __init__(self, camera: str, calibration: CameraCalibrationParameters | None) -> None:
+		self.camera = camera
+		self.calibration = calibration
+		self._pool: FramePool | None = None
+
+	def maps(self, size: Size) -> FloatMap | None:
+		return undistort_maps(self.calibration, self.camera, size)
+
+	def process(self, frame: Frame) -> Frame:
+		maps = plane_undistort_maps(self.calibration, self.camera, (frame.width, frame.height), frame.format)
+		if maps is None:
+			return frame
+		shape = frame.data.shape
+		if self._pool is None:
+			self._pool = FramePool(shape=shape, capacity=4, name=f'undistort_{self.camera}')
+		elif self._pool.shape != shape:
+			self._pool.resize(shape)
+		out = self._pool.acquire()
+		if out is None:
+			out = np.empty(shape, dtype=np.uint8)
+		for index, (plane, src, dst) in enumerate(zip(maps, frame.planes(), frame.format.planes(out))):
+			border = (128 if index else 0,) * 4 if frame.format.yuv else (0,) * 4
+			cv2.remap(src, *plane, cv2.INTER_LINEAR, dst=dst, borderMode=cv2.BORDER_CONSTANT, borderValue=border)
+		return Frame(data=out, timestamp=frame.timestamp, format=frame.format)
@@ -0,0 +1,87 @@
+import threading
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from app.models.capturer import Frame, PixelFormat
+
+Box = tuple[int, int, int, int]  # x1, y1, x2, y2
+
+# UV intercalado de NV12 ya reducido, por hilo: cada cámara redimensiona en su propio worker
+_scratch = threading.local()
+
+_TO_BGR: dict[PixelFormat, int] = {
+	PixelFormat.RGB: cv2.COLOR_RGB2BGR,
+	PixelFormat.NV12: cv2.COLOR_YUV2BGR_NV12,
+	PixelFormat.I420: cv2.COLOR_YUV2BGR_I420,
+}
+
+
+def to_bgr(frame: Frame) -> NDArray[np.uint8]:
+	"""Packed BGR copy of the frame, only for stages that really need RGB pixels."""
+	if frame.format is PixelFormat.BGR:
+		return frame.data
+	return cv2.cvtColor(frame.data, _TO_BGR[frame.format])
+
+
+def output_format(pixel_format: PixelFormat) -> PixelFormat:
+	# Todo lo YUV sale como I420, que es lo que consume el encoder (yuv420p)
+	return PixelFormat.I420 if pixel_format.yuv else pixel_format
+
+
+def even_box(box: Box) -> Box:
+	"""Rounds a crop box down to even coordinates so 4:2:0 chroma stays aligned."""
+	x1, y1, x2, y2 = box
+	return x1 & ~1, y1 & ~1, x2 & ~1, y2 & ~1
+
+
+def resize(
+	frame: Frame,
+	size: tuple[int, int],
+	box: Box | None = None,
+	out: NDArray[np.uint8] | None = None,
+	interpolation: int = cv2.INTER_AREA,
+) -> Frame:
+	"""
+	Crops `box` (whole frame by default) and resizes it to `size` plane by plane.
+	YUV input stays YUV and comes out as I420; BGR/RGB stays packed.
+	"""
+	width, height = size
+	target = output_format(frame.format)
+	if out is None:
+		out = np.empty(target.shape(width, height), dtype=np.uint8)
+	if box is None:
+		box = (0, 0, frame.width, frame.height)
+
+	if not frame.format.yuv:
+		x1, y1, x2, y2 = box
+		cv2.resize(frame.data[y1:y2, x1:x2], size, dst=out, interpolation=interpolation)
+		return Frame(data=out, timestamp=frame.timestamp, format=target)
+
+	x1, y1, x2, y2 = even_box(box)
+	src = frame.planes()
+	dst = target.planes(out)
+	cv2.resize(src[0][y1:y2, x1:x2], size, dst=dst[0], interpolation=interpolation)
+
+	cx1, cy1, cx2, cy2 = x1 // 2, y1 // 2, x2 // 2, y2 // 2
+	chroma_size = (width // 2, height // 2)
+	if frame.format is PixelFormat.NV12:
+		uv = _uv_scratch(chroma_size)
+		cv2.resize(src[1][cy1:cy2, cx1:cx2], chroma_size, dst=uv, interpolation=interpolation)
+		cv2.extractChannel(uv, 0, dst=dst[1])
+		cv2.extractChannel(uv, 1, dst=dst[2])
+	else:
+		cv2.resize(src[1][cy1:cy2, cx1:cx2], chroma_size, dst=dst[1], interpolation=interpolation)
+		cv2.resize(src[2][cy1:cy2, cx1:cx2], chroma_size, dst=dst[2], interpolation=interpolation)
+	return Frame(data=out, timestamp=frame.timestamp, format=target)
+
+
+def _uv_scratch(size: tuple[int, int]) -> NDArray[np.uint8]:
+	"""Two-channel chroma buffer reused by this thread while the output size stays the same."""
+	width, height = size
+	uv: NDArray[np.uint8] | None = getattr(_scratch, 'uv', None)
+	if uv is None or uv.shape != (height, width, 2):
+		uv = np.empty((height, width, 2), dtype=np.uint8)
+		_scratch.uv = uv
+	return uv
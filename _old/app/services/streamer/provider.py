@@ -7,10 +7,11 @@ import av
 from av.container import Flags as ContainerFlags
 
 from app.infra.logger import Logger
+from app.infra.metrics import metrics
 from app.interfaces.streamer import IStreamProvider
 from app.models.capturer import Frame
 from app.models.streamer import StreamProtocol
-from app.services.bufferer import BufferService
+from app.services.bufferer import BufferService, FrameSource
 from config.settings import Settings
 
 
@@ -25,7 +26,7 @@ class StreamProviderService(IStreamProvider):
 
 	def start(
 		self,
-		feed: Generator[Frame, None, None],
+		feed: FrameSource,
 		url: str,
 	) -> None:
 		if self.active:
@@ -123,26 +124,24 @@ class StreamProviderService(IStreamProvider):
 			stream.codec_context.framerate = frame_rate
 			stream.time_base = time_base
 
+			frames_total = metrics.counter('stream_frames_total', protocol=self.protocol.value)
+			encode_seconds = metrics.histogram('stream_encode_seconds', protocol=self.protocol.value)
 			try:
 				self.logger.debug('RTMP streaming started')
 				pts = 0
-				for i, frame in enumerate(feed):
-					# t0 = time.perf_counter()
-					av_frame = av.VideoFrame.from_ndarray(frame.data, format=self.settings.camera.ffmpeg_format)
+				for frame in feed:
+					t0 = time.perf_counter()
+					av_frame = av.VideoFrame.from_ndarray(frame.data, format=frame.format.ffmpeg)
 
 					av_frame.pts = pts
 					av_frame.time_base = time_base
 
-					# if pts <= 40:
-					# self.logger.debug(f'PTS={pts} t={float(pts * time_base):.6f}s')
-
 					pts += ticks_per_frame
 
 					for packet in stream.encode(av_frame):
 						container.mux(packet)
-					# t1 = time.perf_counter()
-					if i < 100 or (i % 30 == 0):
-						pass  # self.logger.debug(f'encode+mux_ms={(t1 - t0) * 1000:.1f}')
+					encode_seconds.observe(time.perf_counter() - t0)
+					frames_total.inc()
 				for packet in stream.encode():
 					container.mux(packet)
 
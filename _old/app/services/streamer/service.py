@@ -1,10 +1,8 @@
-from collections.abc import Generator
-
 from app.infra.logger import Logger
 from app.interfaces.capturer import IVideoService
 from app.interfaces.streamer import IStreamService
-from app.models.capturer import Frame
 from app.models.streamer import StreamProtocol
+from app.services.bufferer import FrameCursor
 from app.services.streamer.provider import StreamProviderService
 from config.settings import Settings
 
@@ -43,6 +41,6 @@ class StreamService(IStreamService):
 	) -> None:
 		if self.active and self.video_service.status:
 			self.logger.debug(f'Starting feed for provider: {stream_protocol.value}')
-			feed: Generator[Frame, None, None] = self.video_service.frames()
+			feed: FrameCursor = self.video_service.subscribe(name=stream_protocol.value)
 			self.stream_provider_service = StreamProviderService(stream_protocol, self.active)
 			self.stream_provider_service.start(feed, url)
@@ -1,8 +1,12 @@
+from .court import CourtService
 from .motion import MotionService
+from .scheduler import DetectionScheduler
 from .side_decision import SideDecisionService
 from .zoom import ZoomService
 
 __all__ = [
+	'CourtService',
+	'DetectionScheduler',
 	'SideDecisionService',
 	'MotionService',
 	'ZoomService',
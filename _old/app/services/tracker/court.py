@@ -0,0 +1,269 @@
+from math import radians, tan
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from app.infra.logger import Logger
+from app.infra.metrics import metrics
+from app.models.capturer import Frame, PixelFormat
+from app.models.tracker import CourtGeometry
+from app.models.tracker.boundaries import Court, Point
+from app.models.tracker.detection import CourtDetection
+from config.settings import Settings
+
+# Líneas de la pista: muy claras y casi sin color
+_LINE_LOW = np.array([0, 0, 190], dtype=np.uint8)
+_LINE_HIGH = np.array([180, 60, 255], dtype=np.uint8)
+_HSV: dict[PixelFormat, int] = {PixelFormat.BGR: cv2.COLOR_BGR2HSV, PixelFormat.RGB: cv2.COLOR_RGB2HSV}
+_TO_BGR: dict[PixelFormat, int] = {PixelFormat.I420: cv2.COLOR_YUV2BGR_I420, PixelFormat.NV12: cv2.COLOR_YUV2BGR_NV12}
+# Pendiente máxima de una línea "horizontal" (fondo) frente a una lateral
+_FLAT = tan(radians(30))
+_THUMBNAIL: tuple[int, int] = (128, 72)
+# Esquinas de la pista normalizada en el orden de Court
+_UNIT = np.array([[0, 0], [1, 0], [0, 1], [1, 1]], dtype=np.float32)
+
+Line = NDArray[np.float64]  # homogénea: a·x + b·y + c = 0
+
+
+def hsv(frame: Frame) -> NDArray[np.uint8]:
+	if frame.format in _HSV:
+		return cv2.cvtColor(frame.data, _HSV[frame.format])
+	return cv2.cvtColor(cv2.cvtColor(frame.data, _TO_BGR[frame.format]), cv2.COLOR_BGR2HSV)
+
+
+def line_mask(hsv_image: NDArray[np.uint8]) -> NDArray[np.uint8]:
+	return cv2.inRange(hsv_image, _LINE_LOW, _LINE_HIGH)
+
+
+def _through(x0: float, y0: float, x1: float, y1: float) -> Line:
+	return np.cross((x0, y0, 1.0), (x1, y1, 1.0))
+
+
+def _fit(segments: NDArray[np.float64]) -> Line:
+	points = segments.reshape(-1, 2).astype(np.float32)
+	vx, vy, x0, y0 = cv2.fitLine(points, cv2.DIST_HUBER, 0, 0.01, 0.01).ravel()
+	return _through(x0, y0, x0 + vx, y0 + vy)
+
+
+def _beyond(line: Line, points: NDArray[np.float64], axis: int, sign: int, tolerance: float) -> bool:
+	"""True if any point lies outside `line` along `axis` (x: 0, y: 1), on the side given by -sign."""
+	if not len(points):
+		return False
+	a, b, c = line
+	if axis == 0:
+		offset = points[:, 0] + (b * points[:, 1] + c) / a
+	else:
+		offset = points[:, 1] + (a * points[:, 0] + c) / b
+	return bool(np.any(sign * offset < -tolerance))
+
+
+class CourtService:
+	"""
+	Court model cache for a fixed camera. The court is detected once on a downscaled
+	frame (line mask -> Hough segments -> one fitted line per side) and then served from
+	cache with its homography and an on-court mask. Every `court_check_every` frames a
+	phase correlation of line-mask thumbnails (only the court's structure, so players and
+	the ball barely move the peak) looks for global camera motion; every `court_every`
+	frames the cached outline is checked against the current line pixels. Either failing
+	triggers a new detection. Without a court, detection is retried at the same
+	`court_check_every` cadence instead of on every frame.
+	A side that is out of view (the court continues past the frame) is closed with the
+	extent of the perpendicular lines, clipped to the frame.
+	"""
+
+	def __init__(self, name: str | None = None) -> None:
+		tracking = Settings.tracking
+		self.name = name or 'court'
+		self.logger = Logger(name=f'court_{self.name}')
+		self._width: int = tracking.detect_width
+		self._every: int = tracking.court_every
+		self._check_every: int = tracking.court_check_every
+		self._shift: float = tracking.court_shift
+		self._support: float = tracking.court_support
+		self._margin: float = tracking.court_margin
+		self._mask_size: tuple[int, int] = Settings.processing.analysis_resolution
+
+		self.geometry: CourtGeometry | None = None
+		self._since = -1  # frames desde la última detección; -1: el próximo update detecta
+		self._outline: NDArray[np.uint8] | None = None  # contorno en px de trabajo
+		self._reference_support = 0.0
+		self._thumbnail: NDArray[np.float32] | None = None
+		self._window: NDArray[np.float32] = cv2.createHanningWindow(_THUMBNAIL, cv2.CV_32F)
+		self._masks: dict[tuple[int, int], NDArray[np.uint8]] = {}
+
+		self._detections_total = metrics.counter('court_detections_total', camera=self.name)
+		self._revalidations_total = {
+			result: metrics.counter('court_revalidations_total', camera=self.name, result=result)
+			for result in ('kept', 'moved', 'lost')
+		}
+
+	def reset(self) -> None:
+		self.geometry = None
+		self._since = -1
+		self._outline = None
+		self._thumbnail = None
+		self._masks.clear()
+
+	def update(self, frame: Frame, image: NDArray[np.uint8] | None = None) -> CourtGeometry | None:
+		"""
+		Cached court for `frame`, re-detected when the camera moved or the lines no longer
+		match. `image` is the HSV of the work level when the caller already has it.
+		"""
+		if self.geometry is not None and self.geometry.size != (frame.width, frame.height):
+			self.reset()
+		self._since += 1
+		if self.geometry is None:
+			# Sin pista no se reintenta en cada frame: solo al ritmo de la comprobación
+			if self._since % self._check_every == 0:
+				return self._detect(frame, image)
+			return None
+
+		check = self._since % self._check_every == 0
+		revalidate = self._since % self._every == 0
+		if not check and not revalidate:
+			return self.geometry
+		lines = line_mask(image if image is not None else hsv(self._work(frame)))
+		if check and self._moved(lines):
+			self._revalidations_total['moved'].inc()
+			return self._detect(frame, image)
+		if revalidate:
+			if self._valid(lines):
+				self._revalidations_total['kept'].inc()
+			else:
+				self._revalidations_total['lost'].inc()
+				return self._detect(frame, image)
+		return self.geometry
+
+	def mask(self, size: tuple[int, int]) -> NDArray[np.uint8] | None:
+		"""On-court mask resized to `size` (width, height), cached until the next detection."""
+		if self.geometry is None:
+			return None
+		cached = self._masks.get(size)
+		if cached is None:
+			cached = self.geometry.mask
+			if size != self._mask_size:
+				cached = cv2.resize(cached, size, interpolation=cv2.INTER_NEAREST)
+			self._masks[size] = cached
+		return cached
+
+	def _work(self, frame: Frame) -> Frame:
+		scale = min(1.0, self._width / frame.width)
+		return frame.level(scale=scale) if scale < 1.0 else frame
+
+	def _detect(self, frame: Frame, image: NDArray[np.uint8] | None = None) -> CourtGeometry | None:
+		self._since = 0
+		self._masks.clear()
+		self._detections_total.inc()
+		work = self._work(frame)
+		lines = line_mask(image if image is not None else hsv(work))
+		corners, fitted = self._corners(lines)
+		if corners is None:
+			self.geometry = None
+			return None
+
+		outline = np.zeros_like(lines)
+		cv2.polylines(outline, [corners[[0, 1, 3, 2]].round().astype(np.int32)], True, 255, thickness=5)
+		on_lines = cv2.countNonZero(cv2.bitwise_and(lines, outline))
+		support = on_lines / max(cv2.countNonZero(lines), 1)
+		self._outline = outline
+		self._reference_support = on_lines / max(cv2.countNonZero(outline), 1)
+		self._thumbnail = self._thumbnail_of(lines)
+
+		scale = frame.width / work.width
+		image_corners = (corners * scale).astype(np.float32)
+		top_left, top_right, bottom_left, bottom_right = (Point(float(x), float(y)) for x, y in image_corners)
+		self.geometry = CourtGeometry(
+			detection=CourtDetection(
+				Court(top_left, top_right, bottom_left, bottom_right), confidence=support * fitted / 4
+			),
+			homography=cv2.getPerspectiveTransform(image_corners, _UNIT).astype(np.float64),
+			mask=self._court_mask(image_corners / (frame.width, frame.height)),
+			size=(frame.width, frame.height),
+			timestamp=frame.timestamp,
+		)
+		self.logger.info('Court detected (%d/4 sides on lines, confidence %.2f)', fitted, self.geometry.detection.confidence)
+		return self.geometry
+
+	def _corners(self, lines: NDArray[np.uint8]) -> tuple[NDArray[np.float64] | None, int]:
+		"""Corners (top left, top right, bottom left, bottom right) in work px and how many sides were fitted."""
+		height, width = lines.shape
+		segments = cv2.HoughLinesP(
+			lines, 1, np.pi / 180, threshold=max(20, width // 16), minLineLength=width // 8, maxLineGap=width // 60
+		)
+		if segments is None:
+			return None, 0
+		segments = segments.reshape(-1, 4).astype(np.float64)
+		dx, dy = segments[:, 2] - segments[:, 0], segments[:, 3] - segments[:, 1]
+		flat_mask = np.abs(dy) <= np.abs(dx) * _FLAT
+		flat, upright = segments[flat_mask], segments[~flat_mask]
+		tolerance = 0.03 * width
+
+		# Extensión de las líneas perpendiculares: hasta dónde llega la pista si falta un lado
+		x_min = flat[:, [0, 2]].min() if len(flat) else 0.0
+		x_max = flat[:, [0, 2]].max() if len(flat) else width - 1.0
+		y_min = upright[:, [1, 3]].min() if len(upright) else 0.0
+		y_max = upright[:, [1, 3]].max() if len(upright) else height - 1.0
+
+		fitted = 0
+		sides: list[Line] = []
+		for group, across, axis, sign, fallback in (
+			(flat, upright, 1, 1, _through(0, y_min, 1, y_min)),
+			(flat, upright, 1, -1, _through(0, y_max, 1, y_max)),
+			(upright, flat, 0, 1, _through(x_min, 0, x_min, 1)),
+			(upright, flat, 0, -1, _through(x_max, 0, x_max, 1)),
+		):
+			line = None
+			if len(group):
+				middle = (group[:, axis] + group[:, axis + 2]) / 2
+				best = middle.min() if sign > 0 else middle.max()
+				candidate = _fit(group[np.abs(middle - best) <= tolerance])
+				# Solo es lado de la pista si ninguna línea perpendicular sigue más allá
+				if not _beyond(candidate, across.reshape(-1, 2), axis, sign, tolerance):
+					line = candidate
+					fitted += 1
+			sides.append(line if line is not None else fallback)
+
+		top, bottom, left, right = sides
+		corners = []
+		for horizontal, vertical in ((top, left), (top, right), (bottom, left), (bottom, right)):
+			x, y, w = np.cross(horizontal, vertical)
+			if abs(w) < 1e-9:
+				return None, 0
+			corners.append((x / w, y / w))
+		corners_array = np.clip(np.array(corners), (0, 0), (width - 1, height - 1))
+		area = cv2.contourArea(corners_array[[0, 1, 3, 2]].astype(np.float32))
+		if fitted < 2 or area < 0.05 * width * height:
+			return None, 0
+		return corners_array, fitted
+
+	def _court_mask(self, corners: NDArray[np.float32]) -> NDArray[np.uint8]:
+		"""Court plus margin, open to the top of the frame: lobs and players rise above the far line."""
+		width, height = self._mask_size
+		top_left, top_right, bottom_left, bottom_right = corners * (width, height)
+		polygon = np.array(
+			[(top_left[0], 0), (top_right[0], 0), bottom_right, bottom_left], dtype=np.float32
+		).round().astype(np.int32)
+		mask = np.zeros((height, width), dtype=np.uint8)
+		cv2.fillConvexPoly(mask, polygon, 255)
+		margin = max(1, int(self._margin * width))
+		kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2 * margin + 1, 2 * margin + 1))
+		return cv2.dilate(mask, kernel)
+
+	def _thumbnail_of(self, lines: NDArray[np.uint8]) -> NDArray[np.float32]:
+		return cv2.resize(lines, _THUMBNAIL, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+	def _moved(self, lines: NDArray[np.uint8]) -> bool:
+		if self._thumbnail is None:
+			return False
+		current = self._thumbnail_of(lines)
+		# phaseCorrelate aplica la ventana sobre sus entradas: la referencia va copiada
+		(shift_x, shift_y), _ = cv2.phaseCorrelate(self._thumbnail.copy(), current, self._window)
+		# Desplazamiento global en fracción del ancho; los jugadores apenas mueven el pico
+		return float(np.hypot(shift_x, shift_y)) / _THUMBNAIL[0] > self._shift
+
+	def _valid(self, lines: NDArray[np.uint8]) -> bool:
+		if self._outline is None:
+			return False
+		on_lines = cv2.countNonZero(cv2.bitwise_and(lines, self._outline))
+		return on_lines / max(cv2.countNonZero(self._outline), 1) >= self._support * self._reference_support
@@ -1,3 +1,6 @@
+import numpy as np
+from numpy.typing import NDArray
+
 from app.models.tracker import DetectionData
 from app.models.tracker.boundaries import Point
 from app.models.tracker.motion_data import MotionData
@@ -5,37 +8,135 @@ from config.settings import Settings
 
 
 class MotionService:
+	"""
+	Constant-acceleration Kalman filter for the ball, one per camera. x and y share the
+	same model, noise and measurement times, so they share one 3x3 covariance and the
+	state is a 3x2 array: rows (position, velocity, acceleration), columns (x, y).
+	"""
+
 	def __init__(
 		self,
 	):
-		self.detection_data_old: DetectionData | None = None
+		tracking = Settings.tracking
+		self.dt: float = 1 / Settings.camera.fps  # solo si el frame no trae timestamp
+		self.process_noise: float = tracking.process_noise
+		self.measurement_noise: float = tracking.measurement_noise
+		self.reset_after: float = tracking.reset_after
+		self.gate: float = tracking.gate
+		self.state: NDArray[np.float64] = np.zeros((3, 2), dtype=np.float64)
+		self.covariance: NDArray[np.float64] = np.eye(3, dtype=np.float64)
+		self.timestamp: float | None = None
+		self.last_update: float | None = None
 		self.motion_data_old: MotionData | None = None
-		self.dt: float = 1 / Settings.camera.fps
+		self.updates = 0
+		self.predictions = 0
+		self.outliers = 0
+
+	@property
+	def initialized(self) -> bool:
+		return self.timestamp is not None
+
+	def reset(self) -> None:
+		self.state[:] = 0.0
+		self.covariance = np.eye(3, dtype=np.float64)
+		self.timestamp = None
+		self.last_update = None
+		self.motion_data_old = None
 
 	def calculate_motion(
 		self,
 		detection_data: DetectionData,
+		timestamp: float | None = None,
 	) -> MotionData:
-		position: Point = detection_data.ball.center
-		x: int = int(position.x)
-		y: int = int(position.y)
-		if self.detection_data_old is None:
-			x_old, y_old = x, y
-		else:
-			position_old: Point = self.detection_data_old.ball.center
-			x_old: int = int(position_old.x)
-			y_old: int = int(position_old.y)
-
-		if self.motion_data_old is None:
-			vx = vy = ax = ay = 0.0
-		else:
-			vx_old: float = self.motion_data_old.velocity.x
-			vy_old: float = self.motion_data_old.velocity.y
-			vx: float = (x - x_old) / self.dt
-			vy: float = (y - y_old) / self.dt
-			ax: float = (vx - vx_old) / self.dt
-			ay: float = (vy - vy_old) / self.dt
-		motion = MotionData(position=position, velocity=Point(vx, vy), acceleration=Point(ax, ay))
-		self.detection_data_old = detection_data
+		"""Predicts to `timestamp` (the frame time) and corrects with the detected ball."""
+		ball = detection_data.ball
+		timestamp = self._timestamp(timestamp)
+		measured = np.array([ball.center.x, ball.center.y], dtype=np.float64)
+		if not self.initialized or self._stale(timestamp):
+			return self._start(measured, timestamp)
+
+		self._predict(timestamp)
+		# Ruido de medida mayor cuanto menor la confianza del detector
+		variance = self.measurement_noise**2 / max(ball.confidence, 0.05)
+		innovation = measured - self.state[0]
+		innovation_variance = self.covariance[0, 0] + variance
+		if innovation @ innovation / innovation_variance > self.gate:
+			# Detección atípica (otro objeto, reflejo): se queda la predicción
+			self.outliers += 1
+			self.predictions += 1
+			return self._motion(predicted=True)
+
+		gain = self.covariance[:, 0] / innovation_variance
+		self.state += np.outer(gain, innovation)
+		self.covariance -= np.outer(gain, self.covariance[0])
+		self.last_update = timestamp
+		self.updates += 1
+		return self._motion(predicted=False)
+
+	def predict(self, timestamp: float | None = None) -> MotionData | None:
+		"""Ball state at `timestamp` for frames without a detection; None when there is no track."""
+		if not self.initialized:
+			return None
+		timestamp = self._timestamp(timestamp)
+		if self._stale(timestamp):
+			self.reset()
+			return None
+		self._predict(timestamp)
+		# `predictions` solo cuenta cuando el estado predicho sustituye a una detección: used_prediction()
+		return self._motion(predicted=True)
+
+	def used_prediction(self) -> None:
+		"""Counts a frame whose output is the predicted state (no usable detection)."""
+		self.predictions += 1
+
+	def _timestamp(self, timestamp: float | None) -> float:
+		if timestamp is not None:
+			return timestamp
+		return (self.timestamp if self.timestamp is not None else 0.0) + self.dt
+
+	def _stale(self, timestamp: float) -> bool:
+		# Comparaciones explícitas con None: t=0.0 es un instante válido
+		return self.last_update is not None and timestamp - self.last_update > self.reset_after
+
+	def _start(self, measured: NDArray[np.float64], timestamp: float) -> MotionData:
+		self.state[:] = 0.0
+		self.state[0] = measured
+		# Posición conocida con el error del detector; velocidad y aceleración, casi nada
+		self.covariance = np.diag([self.measurement_noise**2, 2000.0**2, 5000.0**2])
+		self.timestamp = timestamp
+		self.last_update = timestamp
+		self.updates += 1
+		return self._motion(predicted=False)
+
+	def _predict(self, timestamp: float) -> None:
+		if self.timestamp is None:
+			return
+		dt = timestamp - self.timestamp
+		if dt <= 0:
+			return
+		transition = np.array([[1.0, dt, dt * dt / 2], [0.0, 1.0, dt], [0.0, 0.0, 1.0]])
+		# Jerk blanco: Q discreta del modelo de aceleración constante
+		dt2, dt3, dt4, dt5 = dt**2, dt**3, dt**4, dt**5
+		noise = self.process_noise * np.array(
+			[
+				[dt5 / 20, dt4 / 8, dt3 / 6],
+				[dt4 / 8, dt3 / 3, dt2 / 2],
+				[dt3 / 6, dt2 / 2, dt],
+			]
+		)
+		self.state = transition @ self.state
+		self.covariance = transition @ self.covariance @ transition.T + noise
+		self.timestamp = timestamp
+
+	def _motion(self, predicted: bool) -> MotionData:
+		(x, y), (vx, vy), (ax, ay) = self.state
+		motion = MotionData(
+			position=Point(float(x), float(y)),
+			velocity=Point(float(vx), float(vy)),
+			acceleration=Point(float(ax), float(ay)),
+			covariance=self.covariance.copy(),
+			timestamp=self.timestamp,
+			predicted=predicted,
+		)
 		self.motion_data_old = motion
 		return motion
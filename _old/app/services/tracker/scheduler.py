@@ -0,0 +1,218 @@
+import time
+from dataclasses import replace
+
+import numpy as np
+
+from app.infra.metrics import metrics
+from app.interfaces.tracker import ITracker
+from app.models.capturer import Frame
+from app.models.tracker import DetectionData, DetectionMode, MotionData, SchedulerStats
+from app.models.tracker.boundaries import Court, Point
+from app.models.tracker.detection import BallDetection, CourtDetection
+from app.services.processor.utils import Box, resize
+from config.settings import Settings
+
+from .motion import MotionService
+
+# Peso de la última medida en la media móvil del coste por modo
+_COST_ALPHA: float = 0.2
+_BURST: float = 3.0
+
+
+def _shift(point: Point, dx: float, dy: float, scale: float) -> Point:
+	return Point((point.x + dx) * scale, (point.y + dy) * scale)
+
+
+class DetectionScheduler:
+	"""
+	Runs an ITracker at a bounded cost. Each frame it picks FULL, ROI (around the Kalman
+	prediction) or SKIP (the prediction is the detection). A token bucket refills
+	`budget_ms` per frame; a mode runs only when its moving-average cost fits in the
+	bucket, so a slow detector lowers the detection rate instead of the frame rate.
+	Detections come back scaled by `scale` (analysis frame -> output coordinates).
+	"""
+
+	def __init__(
+		self,
+		tracker: ITracker,
+		motion: MotionService | None = None,
+		scale: float = 1.0,
+		name: str | None = None,
+	) -> None:
+		tracking = Settings.tracking
+		self.tracker = tracker
+		self.motion = motion or MotionService()
+		self.scale = scale
+		self.name = name or f'tracker_{id(self)}'
+		self.budget_ms: float = tracking.budget_ms
+		self._full_every = tracking.full_every
+		self._min_confidence = tracking.min_confidence
+		self._roi_sigma = tracking.roi_sigma
+		self._roi_min = tracking.roi_min
+		self._skip_sigma = tracking.skip_sigma
+		self._max_skip = tracking.max_skip
+
+		self._credit: float = self.budget_ms
+		self._cost: dict[DetectionMode, float] = {DetectionMode.FULL: 0.0, DetectionMode.ROI: 0.0}
+		self._since_full = self._full_every
+		self._skipped_in_row = 0
+		self._last: DetectionData | None = None
+		self._counts: dict[DetectionMode, int] = {mode: 0 for mode in DetectionMode}
+		self._frames = 0
+		self._overruns = 0
+		self._lost = 0
+
+		self._mode_total = {
+			mode: metrics.counter('tracker_detections_total', camera=self.name, mode=mode.value)
+			for mode in DetectionMode
+		}
+		self._overruns_total = metrics.counter('tracker_budget_overruns_total', camera=self.name)
+		self._seconds = {
+			mode: metrics.histogram('tracker_detect_seconds', camera=self.name, mode=mode.value)
+			for mode in (DetectionMode.FULL, DetectionMode.ROI)
+		}
+
+	def reset(self) -> None:
+		self.tracker.reset()
+		self.motion.reset()
+		self._last = None
+		self._since_full = self._full_every
+		self._skipped_in_row = 0
+
+	def update(self, frame: Frame) -> tuple[DetectionData | None, MotionData | None]:
+		"""Detection (real or predicted) and ball motion for `frame`; (None, None) while the ball is lost."""
+		self._frames += 1
+		self._credit = min(self._credit + self.budget_ms, self.budget_ms * _BURST)
+		predicted = self.motion.predict(frame.timestamp) if self.motion.initialized else None
+		mode = self._decide(predicted)
+		self._counts[mode] += 1
+		self._mode_total[mode].inc()
+
+		if mode is DetectionMode.SKIP:
+			self._skipped_in_row += 1
+			if predicted is None or self._last is None:
+				self._lost += 1
+				return None, None
+			self.motion.used_prediction()
+			return self._predicted_detection(predicted), predicted
+
+		self._skipped_in_row = 0
+		box = self._roi(frame, predicted) if mode is DetectionMode.ROI else None
+		t0 = time.perf_counter()
+		detection = self._detect(frame, box)
+		elapsed = time.perf_counter() - t0
+		self._charge(mode, elapsed * 1000)
+
+		if mode is DetectionMode.FULL:
+			self._since_full = 0
+		else:
+			self._since_full += 1
+		if detection.ball.confidence < self._min_confidence:
+			# Sin bola fiable: la predicción sigue hasta que el filtro se reinicie
+			self._since_full = self._full_every
+			if predicted is None or self._last is None:
+				return None, None
+			self.motion.used_prediction()
+			return self._predicted_detection(predicted), predicted
+
+		motion = self.motion.calculate_motion(detection, frame.timestamp)
+		if motion.predicted and self._last is not None:
+			# El filtro rechazó la bola (atípica): el zoom sigue a la predicción, no al salto
+			return self._predicted_detection(motion), motion
+		self._last = detection
+		return detection, motion
+
+	def stats(self) -> SchedulerStats:
+		detected = self._counts[DetectionMode.FULL] + self._counts[DetectionMode.ROI]
+		return SchedulerStats(
+			frames=self._frames,
+			full=self._counts[DetectionMode.FULL],
+			roi=self._counts[DetectionMode.ROI],
+			skipped=self._counts[DetectionMode.SKIP],
+			detection_rate=detected / self._frames if self._frames else 0.0,
+			overruns=self._overruns,
+			budget_ms=self.budget_ms,
+			cost_full_ms=self._cost[DetectionMode.FULL],
+			cost_roi_ms=self._cost[DetectionMode.ROI],
+			lost=self._lost,
+		)
+
+	def _decide(self, predicted: MotionData | None) -> DetectionMode:
+		tracking = predicted is not None and self._last is not None
+		if not tracking or self._since_full >= self._full_every:
+			wanted = DetectionMode.FULL
+		elif (
+			predicted.position_sigma() / self.scale < self._skip_sigma
+			and self._skipped_in_row < self._max_skip
+		):
+			wanted = DetectionMode.SKIP
+		else:
+			wanted = DetectionMode.ROI
+
+		# Si no alcanza el presupuesto se baja de modo: FULL -> ROI (si hay track) -> SKIP
+		if wanted is DetectionMode.FULL and self._affordable(DetectionMode.FULL):
+			return DetectionMode.FULL
+		if wanted is not DetectionMode.SKIP and tracking and self._affordable(DetectionMode.ROI):
+			return DetectionMode.ROI
+		return DetectionMode.SKIP
+
+	def _affordable(self, mode: DetectionMode) -> bool:
+		# Un modo más caro que la ráfaga entra con el cubo lleno; la deuda espacia las siguientes
+		return self._credit >= min(self._cost[mode], self.budget_ms * _BURST)
+
+	def _charge(self, mode: DetectionMode, cost_ms: float) -> None:
+		self._seconds[mode].observe(cost_ms / 1000)
+		self._cost[mode] = cost_ms if not self._cost[mode] else (1 - _COST_ALPHA) * self._cost[mode] + _COST_ALPHA * cost_ms
+		self._credit -= cost_ms
+		if cost_ms > self.budget_ms:
+			self._overruns += 1
+			self._overruns_total.inc()
+
+	def _roi(self, frame: Frame, predicted: MotionData | None) -> Box | None:
+		if predicted is None:
+			return None
+		half = max(self._roi_min / 2, self._roi_sigma * predicted.position_sigma() / self.scale)
+		cx, cy = predicted.position.x / self.scale, predicted.position.y / self.scale
+		x1 = int(np.clip(cx - half, 0, frame.width)) & ~1
+		y1 = int(np.clip(cy - half, 0, frame.height)) & ~1
+		x2 = int(np.clip(cx + half, 0, frame.width)) & ~1
+		y2 = int(np.clip(cy + half, 0, frame.height)) & ~1
+		if x2 - x1 < 16 or y2 - y1 < 16:
+			return None
+		return x1, y1, x2, y2
+
+	def _detect(self, frame: Frame, box: Box | None) -> DetectionData:
+		if box is None:
+			return self._to_output(self.tracker.detect(frame), 0, 0)
+		x1, y1, x2, y2 = box
+		crop = resize(frame, (x2 - x1, y2 - y1), box=box)
+		return self._to_output(self.tracker.detect(crop), x1, y1)
+
+	def _to_output(self, detection: DetectionData, dx: float, dy: float) -> DetectionData:
+		if not dx and not dy and self.scale == 1.0:
+			return detection
+		scale = self.scale
+		court = detection.court
+		if (dx or dy) and self._last is not None:
+			# Un ROI solo ve un trozo de la pista: se conserva la del último frame completo
+			court = self._last.court
+		elif court is not None:
+			corners = court.court
+			court = CourtDetection(
+				court=Court(
+					top_left=_shift(corners.top_left, dx, dy, scale),
+					top_right=_shift(corners.top_right, dx, dy, scale),
+					bottom_left=_shift(corners.bottom_left, dx, dy, scale),
+					bottom_right=_shift(corners.bottom_right, dx, dy, scale),
+				),
+				confidence=court.confidence,
+			)
+		return DetectionData(
+			ball=BallDetection(_shift(detection.ball.center, dx, dy, scale), detection.ball.confidence),
+			court=court,
+			players=detection.players.transformed(dx, dy, scale),
+		)
+
+	def _predicted_detection(self, predicted: MotionData) -> DetectionData:
+		assert self._last is not None
+		return replace(self._last, ball=BallDetection(predicted.position, self._last.ball.confidence))
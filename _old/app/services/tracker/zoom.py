@@ -17,9 +17,7 @@ class ZoomService:
 		speed = motion_data.speed()
 		acc = motion_data.acc()
 		players = detection_data.players
-		players_count_near_ball = sum(
-			1 for p in players if p.distance_to_ball(ball) < self.near_ball_threshold
-		)
+		players_count_near_ball = players.count_near(ball.center, self.near_ball_threshold)
 		players_count_in_frame = len(players)
 		norm_speed = min(speed / self.max_speed, 1)
 		norm_acc = min(abs(acc) / self.max_acc, 1)
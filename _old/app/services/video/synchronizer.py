@@ -0,0 +1,166 @@
+import queue
+import threading
+import time
+from collections import deque
+
+from app.infra.logger import Logger
+from app.interfaces.capturer.camera import ICamera
+from app.models.capturer import Frame, SyncStats
+from config.settings import Settings
+
+
+class FrameSynchronizer:
+	"""
+	Pairs frames from two cameras by capture timestamp. One pump thread per camera keeps a
+	short history, so a slow camera never blocks the other, and pair() returns the newest
+	pair whose timestamps are within `tolerance` seconds.
+	"""
+
+	def __init__(
+		self,
+		cam0: ICamera,
+		cam1: ICamera,
+		tolerance: float | None = None,
+		history: int = 4,
+		timeout: float = 0.5,
+	) -> None:
+		self._cameras: tuple[ICamera, ICamera] = (cam0, cam1)
+		self._tolerance: float = (
+			tolerance if tolerance is not None else 0.5 / Settings.stream.fps
+		)
+		self._history_size: int = history
+		self._timeout: float = timeout
+		self._history: tuple[deque[Frame], deque[Frame]] = (deque(), deque())
+		self._cond = threading.Condition()
+		self._threads: list[threading.Thread] = []
+		self._active = False
+		self.logger = Logger(name='frame_synchronizer')
+
+		self._pairs = 0
+		self._unmatched = [0, 0]
+		self._dropped = [0, 0]
+		self._skew_last = 0.0
+		self._skew_sum = 0.0
+		self._skew_max = 0.0
+		self._latency_last = 0.0
+
+	def start(self) -> None:
+		if self._active:
+			return
+		self._active = True
+		self._threads = [
+			threading.Thread(target=self._pump, args=(index,), name=f'sync_pump_{index}', daemon=True)
+			for index in range(len(self._cameras))
+		]
+		for thread in self._threads:
+			thread.start()
+
+	def stop(self) -> None:
+		with self._cond:
+			self._active = False
+			self._cond.notify_all()
+		for thread in self._threads:
+			if thread.is_alive():
+				thread.join(timeout=1.0)
+		self._threads = []
+		with self._cond:
+			for history in self._history:
+				history.clear()
+
+	def pair(self, timeout: float | None = None) -> tuple[Frame, Frame]:
+		"""Blocks until a matched pair is available. Raises queue.Empty on timeout."""
+		timeout = self._timeout if timeout is None else timeout
+		deadline = time.perf_counter() + timeout
+		with self._cond:
+			while True:
+				matched = self._match()
+				if matched is not None:
+					return matched
+				remaining = deadline - time.perf_counter()
+				if not self._active or remaining <= 0:
+					raise queue.Empty
+				self._cond.wait(remaining)
+
+	def stats(self) -> SyncStats:
+		with self._cond:
+			return SyncStats(
+				pairs=self._pairs,
+				unmatched=(self._unmatched[0], self._unmatched[1]),
+				dropped=(self._dropped[0], self._dropped[1]),
+				skew_last=self._skew_last,
+				skew_mean=self._skew_sum / self._pairs if self._pairs else 0.0,
+				skew_max=self._skew_max,
+				latency_last=self._latency_last,
+			)
+
+	def _pump(self, index: int) -> None:
+		camera = self._cameras[index]
+		history = self._history[index]
+		while self._active:
+			try:
+				frame = camera.capture()
+			except queue.Empty:
+				continue
+			with self._cond:
+				if len(history) >= self._history_size:
+					history.popleft()
+					self._dropped[index] += 1
+				history.append(frame)
+				self._cond.notify()
+
+	def _match(self) -> tuple[Frame, Frame] | None:
+		h0, h1 = self._history
+		tolerance = self._tolerance
+		matches: list[tuple[int, int]] = []
+		i = j = 0
+		while i < len(h0) and j < len(h1):
+			skew = h0[i].timestamp - h1[j].timestamp
+			if abs(skew) <= tolerance:
+				# Si el siguiente frame de la otra cámara está más cerca, se empareja con ese
+				if j + 1 < len(h1) and abs(h0[i].timestamp - h1[j + 1].timestamp) < abs(skew):
+					j += 1
+				elif i + 1 < len(h0) and abs(h0[i + 1].timestamp - h1[j].timestamp) < abs(skew):
+					i += 1
+				else:
+					matches.append((i, j))
+					i += 1
+					j += 1
+			elif skew < 0:
+				i += 1
+			else:
+				j += 1
+
+		if not matches:
+			# Frames más viejos que el último de la otra cámara (menos la tolerancia) ya no emparejan
+			if h0 and h1:
+				newest0, newest1 = h0[-1].timestamp, h1[-1].timestamp
+				self._trim(0, newest1 - tolerance)
+				self._trim(1, newest0 - tolerance)
+			return None
+
+		best_i, best_j = matches[-1]
+		superseded = len(matches) - 1
+		self._unmatched[0] += best_i - superseded
+		self._unmatched[1] += best_j - superseded
+		self._dropped[0] += superseded
+		self._dropped[1] += superseded
+		for _ in range(best_i):
+			h0.popleft()
+		for _ in range(best_j):
+			h1.popleft()
+		frame0 = h0.popleft()
+		frame1 = h1.popleft()
+
+		skew = abs(frame0.timestamp - frame1.timestamp)
+		self._pairs += 1
+		self._skew_last = skew
+		self._skew_sum += skew
+		self._skew_max = max(self._skew_max, skew)
+		self._latency_last = time.time() - max(frame0.timestamp, frame1.timestamp)
+		return frame0, frame1
+
+	def _trim(self, index: int, oldest: float) -> None:
+		history = self._history[index]
+		while history and history[0].timestamp < oldest:
+			history.popleft()
+			self._unmatched[index] += 1
@@ -1,42 +1,144 @@
+import queue
+import threading
 import time
-from collections.abc import Generator
-
-from app.interfaces.capturer.ivideo import IVideoService
+from collections.abc import Callable, Generator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
 
+from app.adapters.tracker import TrackerAdapter
 from app.infra.logger import Logger
-from app.interfaces.capturer import ICamera
-from app.models.capturer import Frame
-from app.models.tracker import DetectionData, MotionData, SideDecisionData, ZoomData
-from app.services.bufferer import BufferService
+from app.infra.memory import memory_budget
+from app.infra.metrics import metric_key, metrics, serve_metrics
+from app.interfaces.capturer import IVideoService
+from app.interfaces.capturer.camera import ICamera
+from app.interfaces.tracker import ITracker
+from app.models.capturer import Frame, SyncStats
+from app.models.general import Sides
+from app.models.pipeline import PipelineItem, StageStats
+from app.models.tracker import DetectionData, MotionData, SchedulerStats, SideDecisionData, ZoomData
+from app.models.tracker.boundaries import Point
+from app.services.bufferer import BufferService, FrameBroadcast, FrameCursor, ReadPolicy
+from app.services.pipeline import Stage, StageGraph
 from app.services.processor import (
 	VideoPostProcessorService,
 	VideoPreProcessorService,
 	VideoTransformationService,
 )
-from app.services.tracker import MotionService, SideDecisionService, ZoomService
+from app.services.processor.geometry import FloatMap, map_bounds
+from app.services.processor.transformer import contains, expand_box, scale_box, zoom_box
+from app.services.processor.utils import Box
+from app.services.tracker import DetectionScheduler, MotionService, SideDecisionService, ZoomService
+
+from config.settings import Settings
+
+from .synchronizer import FrameSynchronizer
+
+_In = TypeVar('_In')
+_Out = TypeVar('_Out')
+# (zoom, motion, side) de un mismo frame
+_Tracked = tuple[ZoomData | None, MotionData | None, int | None]
 
 
 class VideoService(IVideoService):
-	def __init__(self, cam0: ICamera, cam1: ICamera) -> None:
+	def __init__(
+		self, cam0: ICamera, cam1: ICamera, trackers: tuple[ITracker, ITracker] | None = None
+	) -> None:
 		self.cam0 = cam0
 		self.cam1 = cam1
 		self.active = False
-		self.motion_service = MotionService()
+		self.motion_services = (MotionService(), MotionService())
+		# El detector corre sobre los frames de análisis; sus coordenadas se llevan a la salida
+		scale = Settings.stream.resolution[0] / Settings.processing.analysis_resolution[0]
+		if trackers is None:
+			trackers = (TrackerAdapter(0), TrackerAdapter(1))
+		self.schedulers: tuple[DetectionScheduler, ...] = tuple(
+			DetectionScheduler(tracker, motion, scale=scale, name=f'camera_{index}')
+			for index, (tracker, motion) in enumerate(zip(trackers, self.motion_services))
+		)
 		self.zoom_service = ZoomService()
 		self.side_decider = SideDecisionService()
+		self.synchronizer = FrameSynchronizer(cam0, cam1)
+		self.preprocessors = (
+			VideoPreProcessorService(name='camera_0'),
+			VideoPreProcessorService(name='camera_1'),
+		)
+		self.postprocessor = VideoPostProcessorService()
+		self.transformer = VideoTransformationService(Settings.stream.resolution)
+		self.broadcast = FrameBroadcast(Settings.stream.ring_size, name='video_service')
+		self._publisher: threading.Thread | None = None
+		self._publisher_lock = threading.Lock()
+		self._workers: int = Settings.processing.workers
+		self._executor: ThreadPoolExecutor | None = None
+		# Cada etapa en su propio hilo; mientras una cámara se preprocesa la anterior se postprocesa
+		self.pipeline: StageGraph[PipelineItem] = StageGraph(
+			'video',
+			source=self._get_frames,
+			stages=[
+				Stage('preprocess', self._preprocess),
+				Stage('track', self._track),
+				Stage('transform', self._transform),
+				Stage('postprocess', self._postprocess),
+			],
+			capacity=Settings.processing.queue_size,
+		)
 		self.logger = Logger(name='video_service')
 
+		# Crop-first: con un zoom previsto solo se preprocesa la ventana (más margen) de una cámara.
+		# La corrección de lente va compuesta en el remap del zoom; sobre el panorama no hay zoom
+		self._lazy: bool = Settings.processing.lazy_roi and not self.postprocessor.stitched
+		self._roi_margin: float = Settings.processing.roi_margin
+		self._full_size: tuple[int, int] = Settings.stream.resolution
+		# Escrito por la etapa track y leído por preprocess para el frame siguiente: una sola
+		# asignación de una tupla inmutable, así nunca se mezclan zoom y lado de frames distintos
+		self._tracked: _Tracked = (None, None, None)
+
+		self._roi_total = {
+			result: metrics.counter('video_roi_frames_total', result=result)
+			for result in ('hit', 'miss', 'discarded')
+		}
+		self._frames_total = metrics.counter('video_frames_total')
+		self._sync_timeouts_total = metrics.counter('video_sync_timeouts_total')
+		self._camera_stage_seconds = {
+			(stage, index): metrics.histogram('video_camera_stage_seconds', stage=stage, camera=index)
+			for stage in ('preprocess', 'track')
+			for index in range(2)
+		}
+		metrics.collector('video_service', self._metrics)
+
 	def start(self) -> None:
 		if not self.active:
 			self.cam0.start()
 			self.cam1.start()
+			self.synchronizer.start()
+			for scheduler in self.schedulers:
+				scheduler.tracker.start()
+			if self.broadcast.closed:
+				self.broadcast = FrameBroadcast(Settings.stream.ring_size, name='video_service')
+			if Settings.metrics.enabled:
+				serve_metrics(Settings.metrics.host, Settings.metrics.port)
+			if self._workers > 0:
+				self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='video_worker')
 			self.active = True
+			# Consumidores suscritos antes de start(): el publisher arranca ahora
+			if self.broadcast.cursors():
+				self._start_publisher()
 
 	def stop(self) -> None:
 		if self.active:
+			self.active = False
+			self.pipeline.stop()
+			if self._publisher and self._publisher.is_alive():
+				self._publisher.join(timeout=1.0)
+			self._publisher = None
+			if self._executor is not None:
+				self._executor.shutdown(wait=True)
+				self._executor = None
+			self.broadcast.close()
+			self.synchronizer.stop()
+			for scheduler in self.schedulers:
+				scheduler.tracker.stop()
 			self.cam0.stop()
 			self.cam1.stop()
-			self.active = False
 
 	def status(self) -> bool:
 		return self.active
@@ -45,54 +147,239 @@ class VideoService(IVideoService):
 		self.cam0.focus()
 		self.cam1.focus()
 
-	def _get_frames(self) -> None:
-		self.frame0 = self.cam0.frame()
-		self.frame1 = self.cam1.frame()
+	def sync_stats(self) -> SyncStats:
+		return self.synchronizer.stats()
 
-	def _preprocess(self) -> list[Frame]:
-		self.frame0 = VideoPreProcessorService().process(self.frame0)
-		self.frame1 = VideoPreProcessorService().process(self.frame1)
-		return [self.frame0, self.frame1]
+	def pipeline_stats(self) -> tuple[StageStats, ...]:
+		return self.pipeline.stats()
 
-	def _postprocess(self) -> Frame:
-		self.frame = VideoPostProcessorService().process(self.frame0, self.frame1)
-		return self.frame
+	def scheduler_stats(self) -> tuple[SchedulerStats, ...]:
+		return tuple(scheduler.stats() for scheduler in self.schedulers)
 
-	def _track(self) -> None:
-		detection_data_0: DetectionData | None = None  # i havent done this yet
-		detection_data_1: DetectionData | None = None
+	def subscribe(self, policy: ReadPolicy | None = None, name: str | None = None) -> FrameCursor:
+		"""
+		Attaches a consumer to the processed feed. The pipeline runs once, in a single
+		publisher thread, no matter how many consumers are attached.
+		"""
+		cursor = self.broadcast.subscribe(policy or ReadPolicy.LATEST, name)
+		if self.active:
+			self._start_publisher()
+		return cursor
+
+	def _start_publisher(self) -> None:
+		with self._publisher_lock:
+			if self._publisher is None:
+				self._publisher = threading.Thread(target=self._publish, name='video_publisher', daemon=True)
+				self._publisher.start()
+
+	def _publish(self) -> None:
+		try:
+			for frame in self.frames():
+				self.broadcast.publish(frame)
+		finally:
+			self.broadcast.close()
+
+	def _get_frames(self) -> PipelineItem | None:
+		try:
+			frame0, frame1 = self.synchronizer.pair()
+		except queue.Empty:
+			self._sync_timeouts_total.inc()
+			self.logger.warning('No synchronized frame pair available')
+			return None
+		return PipelineItem(frame0=frame0, frame1=frame1)
+
+	def _per_camera(
+		self, stage: str, functions: Sequence[Callable[[_In], _Out]], items: Sequence[_In]
+	) -> list[_Out]:
+		"""
+		Runs functions[i](items[i]) for each camera on the worker pool and joins before
+		returning. OpenCV releases the GIL, so both cameras really run in parallel.
+		"""
+		if self._executor is None:
+			return [self._timed(stage, index, fn, item) for index, (fn, item) in enumerate(zip(functions, items))]
+		futures = [
+			self._executor.submit(self._timed, stage, index, fn, item)
+			for index, (fn, item) in enumerate(zip(functions, items))
+		]
+		return [future.result() for future in futures]
 
-		if detection_data_0 is not None and detection_data_1 is not None:
-			motion_data_0: MotionData = self.motion_service.calculate_motion(detection_data_0)
-			motion_data_1: MotionData = self.motion_service.calculate_motion(detection_data_1)
+	def _timed(self, stage: str, index: int, fn: Callable[[_In], _Out], item: _In) -> _Out:
+		t0 = time.perf_counter()
+		result = fn(item)
+		self._camera_stage_seconds[stage, index].observe(time.perf_counter() - t0)
+		return result
 
+	def _preprocess(self, item: PipelineItem) -> PipelineItem:
+		predicted = self._predicted_window() if self._lazy else None
+		if predicted is None:
+			raw = (item.frame0, item.frame1)
+			self._preprocess_full(item)
+			# Sale del nivel que el preprocesador acaba de memoizar en el frame crudo
+			item.analysis = self._analysis(raw)
+			return item
+		item.analysis = self._analysis((item.frame0, item.frame1))
+
+		side, window = predicted
+		# Misma escala que el frame completo: el trabajo por píxel baja con el área del ROI
+		lens = self.postprocessor.lens(side, self._full_size)
+		x1, y1, x2, y2 = self._source_box(expand_box(window, self._roi_margin, self._full_size), lens)
+		roi = (x1 & ~1, y1 & ~1, x2 & ~1, y2 & ~1)
+		size = (roi[2] - roi[0], roi[3] - roi[1])
+		raw = (item.frame0, item.frame1)[side]
+		source = self._to_source(roi, raw)
+		preprocessor = self.preprocessors[side]
+		item.frame = self._timed(
+			'preprocess', side, lambda frame: preprocessor.process(frame, box=source, size=size), raw
+		)
+		item.roi = roi
+		item.roi_side = side
+		return item
+
+	def _preprocess_full(self, item: PipelineItem) -> PipelineItem:
+		item.frame0, item.frame1 = self._per_camera(
+			'preprocess',
+			[preprocessor.process for preprocessor in self.preprocessors],
+			[item.frame0, item.frame1],
+		)
+		return item
+
+	def _analysis(self, frames: tuple[Frame, Frame]) -> tuple[Frame, Frame]:
+		size = Settings.processing.analysis_resolution
+		return frames[0].level(size=size), frames[1].level(size=size)
+
+	def _predicted_window(self) -> tuple[int, Box] | None:
+		"""Crop window of the last zoom, moved ahead by one frame of ball motion."""
+		zoom, motion, side = self._tracked
+		if zoom is None or side is None:
+			return None
+		center = zoom.center
+		if motion is not None:
+			lead = 1 / Settings.camera.fps
+			center = Point(center.x + motion.velocity.x * lead, center.y + motion.velocity.y * lead)
+		return side, zoom_box(self._full_size, ZoomData(center=center, zoom_level=zoom.zoom_level))
+
+	@staticmethod
+	def _source_box(window: Box, lens: FloatMap | None) -> Box:
+		"""Region of the (distorted) camera frame that `window` of the corrected output reads."""
+		return window if lens is None else map_bounds(lens, window)
+
+	def _to_source(self, box: Box, raw: Frame) -> Box:
+		return scale_box(box, raw.width / self._full_size[0], raw.height / self._full_size[1])
+
+	def _postprocess(self, item: PipelineItem) -> PipelineItem:
+		if item.zoom is not None and item.frame is not None:
+			return item
+		if item.roi is not None:
+			# Se previó zoom pero el tracker no lo dio: hace falta el frame completo
+			self._roi_total['discarded'].inc()
+			item.roi = None
+			self._preprocess_full(item)
+		item.frame = self.postprocessor.process(item.frame0, item.frame1)
+		return item
+
+	def _track(self, item: PipelineItem) -> PipelineItem:
+		detection_data_0: DetectionData | None = None
+		detection_data_1: DetectionData | None = None
+		motion_data_0: MotionData | None = None
+		motion_data_1: MotionData | None = None
+		if self.schedulers and item.analysis is not None:
+			# Cada scheduler decide detección completa, ROI o solo predicción según su presupuesto
+			(detection_data_0, motion_data_0), (detection_data_1, motion_data_1) = self._per_camera(
+				'track', [scheduler.update for scheduler in self.schedulers], list(item.analysis)
+			)
+
+		if (
+			detection_data_0 is not None
+			and detection_data_1 is not None
+			and motion_data_0 is not None
+			and motion_data_1 is not None
+		):
 			side: SideDecisionData = self.side_decider.decide_side(motion_data_0, motion_data_1)
-			if side == SideDecisionData.side.LEFT:
-				self.motion_data: MotionData = motion_data_0
-				self.detection_data: DetectionData = detection_data_0
-				self.frame = self.frame0
-			else:
-				self.motion_data: MotionData = motion_data_1
-				self.detection_data: DetectionData = detection_data_1
-				self.frame = self.frame1
+			item.side = 0 if side.side is Sides.LEFT else 1
+			item.motion = (motion_data_0, motion_data_1)[item.side]
+			item.detection = (detection_data_0, detection_data_1)[item.side]
+			item.zoom = self.zoom_service.calculate_zoom(item.detection, item.motion)
 
-			self.zoom_data: ZoomData = self.zoom_service.calculate_zoom(self.detection_data, self.motion_data)
+		self._tracked = (item.zoom, item.motion, item.side)
+		return item
 
-	def _transform(self) -> None:
-		self.frame = VideoTransformationService().process(self.frame, self.zoom_data)
+	def _transform(self, item: PipelineItem) -> PipelineItem:
+		# El zoom está en coordenadas de una cámara: sobre el panorama no hay ventana equivalente
+		if item.zoom is None or item.side is None or self.postprocessor.stitched:
+			return item
+		# Misma geometría que la salida sin zoom: recorte, escala y corrección de lente en un remap
+		lens = self.postprocessor.lens(item.side, self._full_size)
+		if item.roi is None:
+			item.frame = self.transformer.process((item.frame0, item.frame1)[item.side], item.zoom, lens)
+			return item
+
+		window = zoom_box(self._full_size, item.zoom)
+		needed = self._source_box(window, lens)
+		if item.frame is not None and item.roi_side == item.side and contains(item.roi, needed):
+			self._roi_total['hit'].inc()
+			item.frame = self.transformer.process_roi(item.frame, item.roi, window, lens)
+		else:
+			# La ventana real se salió del margen: se procesa directamente desde el frame crudo
+			self._roi_total['miss'].inc()
+			raw = (item.frame0, item.frame1)[item.side]
+			preprocessor = self.preprocessors[item.side]
+			if lens is None:
+				item.frame = preprocessor.process(
+					raw, box=self._to_source(window, raw), size=self.transformer.target_size
+				)
+			else:
+				# Redondeo hacia fuera: el ROI par tiene que seguir conteniendo lo que lee el remap
+				x1, y1, x2, y2 = needed
+				width, height = self._full_size
+				roi = (x1 & ~1, y1 & ~1, min((x2 + 1) & ~1, width), min((y2 + 1) & ~1, height))
+				size = (roi[2] - roi[0], roi[3] - roi[1])
+				crop = preprocessor.process(raw, box=self._to_source(roi, raw), size=size)
+				item.frame = self.transformer.process_roi(crop, roi, window, lens)
+		item.roi = None
+		return item
 
 	def frames(self) -> Generator[Frame, None, None]:
-		while self.active:
-			self._get_frames()
-			self._preprocess()
-			# self._track()
-			# self._transform()
-			# self._overlay()
-			self._postprocess()
-			yield self.frame
+		self.pipeline.start()
+		try:
+			for item in self.pipeline.outputs():
+				if not self.active:
+					break
+				assert item.frame is not None
+				self._frames_total.inc()
+				yield item.frame
+		finally:
+			self.pipeline.stop()
+
+	def _metrics(self) -> dict[str, float]:
+		sync = self.synchronizer.stats()
+		budget = memory_budget.stats()
+		pyramid = Frame.pyramid_stats()
+		values: dict[str, float] = {
+			'video_sync_pairs_total': sync.pairs,
+			'video_sync_skew_last_seconds': sync.skew_last,
+			'video_sync_skew_max_seconds': sync.skew_max,
+			'video_sync_latency_seconds': sync.latency_last,
+			'memory_budget_bytes': budget.limit,
+			'memory_current_bytes': budget.current,
+			'memory_peak_bytes': budget.peak,
+			'memory_refused_total': budget.refused,
+			'log_dropped_total': Logger.dropped(),
+			'log_format_errors_total': Logger.failed(),
+			'frame_pyramid_resizes_total': pyramid.resizes,
+			'frame_pyramid_reused_total': pyramid.reused,
+			'frame_pyramid_cascaded_total': pyramid.cascaded,
+		}
+		for index in range(2):
+			values[metric_key('video_sync_unmatched_total', camera=index)] = sync.unmatched[index]
+			values[metric_key('video_sync_dropped_total', camera=index)] = sync.dropped[index]
+		for account in budget.accounts:
+			values[metric_key('memory_account_bytes', account=account.name)] = account.current
+			values[metric_key('memory_account_peak_bytes', account=account.name)] = account.peak
+		for name, cursor in self.broadcast.cursors().items():
+			values[metric_key('video_cursor_pending', consumer=name)] = cursor.pending
+			values[metric_key('video_cursor_skipped_total', consumer=name)] = cursor.skipped
+			values[metric_key('video_cursor_overwritten_total', consumer=name)] = cursor.overwritten
+		return values
 
 	def feed(self) -> Generator[Frame, None, None]:
-		while self.active:
-			raw_feed = self.frames()
-			buffered_frames = BufferService().feed(raw_feed)
-			yield from buffered_frames
+		yield from BufferService().buffer(self.subscribe(name='feed'))
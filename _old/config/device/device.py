@@ -1,7 +1,16 @@
+import os
 import subprocess
 
+_DEVICES = ('jetson', 'raspberrypi', 'synthetic')
+
 
 def get_device() -> str:
+	override = os.environ.get('SST_DEVICE', '').strip().lower()
+	if override:
+		if override not in _DEVICES:
+			raise ValueError(f'Unsupported device: {override}')
+		return override
+
 	try:
 		result = subprocess.check_output(['cat', '/sys/firmware/devicetree/base/model'], text=True)
 		model = result.strip('\x00\n').lower()
@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from math import radians, tan
 
 
@@ -6,6 +7,8 @@ from math import radians, tan
 class StreamSettings:
 	resolution: tuple[int, int] = (1920, 1080)  # (3840, 1080)
 	buffer_seconds: int = 2
+	ring_size: int = 8  # frames retenidos entre captura y encoder
+	gap_fill: str = 'repeat'  # repeat | skip | blend
 
 	@property
 	def fps(self) -> int:
@@ -16,18 +19,124 @@ class StreamSettings:
 		return self.buffer_seconds * self.fps
 
 
+@dataclass(frozen=True)
+class CaptureSettings:
+	process_isolation: bool = False
+	ring_slots: int = 4
+	start_timeout: float = 10.0
+
+
+@dataclass(frozen=True)
+class ProcessingSettings:
+	sharpen: str = 'unsharp'  # unsharp (blur + addWeighted) | fused (un filter2D) | none
+	sharpen_amount: float = 0.18
+	sharpen_ksize: int = 5
+	workers: int = 2  # hilos para etapas por cámara; 0 = secuencial en el hilo del pipeline
+	queue_size: int = 2  # items en vuelo entre dos etapas del pipeline
+	stitch: str = 'none'  # none (solo frame_1) | cylindrical (panorama de las dos cámaras)
+	undistort: bool = True  # corrige la distorsión de lente con la calibración (si la hay)
+	lazy_roi: bool = True  # con zoom previsto solo se preprocesa la ventana de salida
+	roi_margin: float = 0.15  # margen alrededor de la ventana prevista, por lado
+	analysis_resolution: tuple[int, int] = (960, 540)  # copia reducida para detección/tracking
+	calibration_path: str = os.environ.get(
+		'SST_CALIBRATION',
+		os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'calibration.json'),
+	)
+
+
+@dataclass(frozen=True)
+class TrackingSettings:
+	process_noise: float = 4.0e6  # densidad espectral del jerk, (px/s³)²·s
+	measurement_noise: float = 6.0  # desviación típica de la detección en px con confianza 1
+	reset_after: float = 0.5  # s sin detección tras los que el filtro se reinicia
+	gate: float = 16.0  # distancia de Mahalanobis² a partir de la cual una detección es atípica
+	budget_ms: float = 12.0  # tiempo de detector por frame y cámara (media, con ráfagas de hasta 3x)
+	full_every: int = 30  # frames máximos entre detecciones de frame completo
+	min_confidence: float = 0.5  # por debajo, la bola se da por perdida y se busca en todo el frame
+	roi_sigma: float = 4.0  # semilado del ROI en sigmas de la posición prevista
+	roi_min: int = 96  # lado mínimo del ROI en px del frame de análisis
+	skip_sigma: float = 3.0  # px: con una predicción así de precisa se puede saltar la detección
+	max_skip: int = 3  # frames seguidos sin detector como máximo
+	detector: str = 'classical'  # implementación de ITracker que crea TrackerAdapter
+	# Detector clásico (ClassicalTracker): fracciones relativas al ancho del frame de entrada
+	detect_width: int = 480  # ancho de la copia reducida sobre la que se detecta
+	ball_hue: tuple[int, int] = (18, 45)  # tono OpenCV (0-180) de la bola amarilla
+	ball_min_saturation: int = 90
+	ball_min_value: int = 110
+	ball_size: tuple[float, float] = (0.003, 0.03)  # diámetro de la bola
+	player_min_area: float = 0.002  # área mínima de un jugador (fracción del frame)
+	background_rate: float = 0.05  # peso del frame nuevo en el fondo
+	motion_threshold: int = 20  # diferencia de luma con el fondo que cuenta como movimiento
+	# Pista (CourtService): se detecta una vez y se revalida; la cámara va en trípode
+	court_every: int = 150  # frames entre revalidaciones contra las líneas del frame actual
+	court_check_every: int = 10  # frames entre comprobaciones de movimiento global de la cámara
+	court_shift: float = 0.005  # desplazamiento global (fracción del ancho) que obliga a redetectar
+	court_support: float = 0.5  # fracción del contorno original que debe seguir sobre las líneas
+	court_margin: float = 0.05  # margen de la máscara alrededor de la pista (fracción del ancho)
+
+
+@dataclass(frozen=True)
+class MemorySettings:
+	budget_mb: int = 3072  # colas, rings y pools de frames (Orin de 8 GB)
+
+
+@dataclass(frozen=True)
+class MetricsSettings:
+	enabled: bool = True
+	host: str = '127.0.0.1'
+	port: int = 9108
+
+
+@dataclass(frozen=True)
+class LogSettings:
+	level: str = os.environ.get('SST_LOG_LEVEL', 'INFO')
+	queue_size: int = 1024  # registros pendientes antes de descartar
+
+
+@dataclass(frozen=True)
+class SyntheticSettings:
+	resolution: tuple[int, int] = (3840, 2160)
+	fps: int = 30
+	format: str = 'BGR888'
+	video_path: str | None = None
+	ball_speed: tuple[float, float] = (900.0, 420.0)  # px/s
+	ball_radius: int = 18
+
+
+@dataclass(frozen=True)
+class CameraSettings:
+	resolution: tuple[int, int] = (1920, 1080)
+	fps: int = 30
+	fov: int = 120
+	ffmpeg_format: str = 'bgr24'
+
+
 @dataclass(frozen=True)
 class FOVSettings:
 	focal_distance_c: float = 75
 	focal_angle_acb: float = 60
+	camera_settings: CameraSettings = field(default_factory=CameraSettings)
 
 	@property
 	def focal_distance_ab(self) -> float:
 		return 2 * tan(radians(self.focal_angle_acb / 2)) * self.focal_distance_c
-"""
+
 	def focal_pixel_overlap(self) -> int:
-		return int(self.camera_settings.resolution[0] * tan(radians(self.focal_angle_acb / 2)) / tan(radians(self.camera_settings.fov / 2)))
-"""
+		return int(
+			self.camera_settings.resolution[0]
+			* tan(radians(self.focal_angle_acb / 2))
+			/ tan(radians(self.camera_settings.fov / 2))
+		)
+
 
 class Settings:
 	stream: StreamSettings = StreamSettings()
+	camera: CameraSettings = CameraSettings()
+	capture: CaptureSettings = CaptureSettings()
+	processing: ProcessingSettings = ProcessingSettings()
+	tracking: TrackingSettings = TrackingSettings()
+	fov: FOVSettings = FOVSettings()
+	log: LogSettings = LogSettings()
+	memory: MemorySettings = MemorySettings()
+	metrics: MetricsSettings = MetricsSettings()
+	synthetic: SyntheticSettings = SyntheticSettings()
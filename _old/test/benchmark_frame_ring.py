@@ -0,0 +1,91 @@
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.models.capturer import Frame
+from app.services.bufferer import FrameRing, RingClosed
+
+
+class DequeHandoff:
+	"""The deque + Condition handoff BufferService used before FrameRing."""
+
+	def __init__(self, maxlen: int) -> None:
+		self._deque: deque[Frame] = deque(maxlen=maxlen)
+		self._cond = threading.Condition()
+		self._closed = False
+
+	def put(self, frame: Frame) -> None:
+		with self._cond:
+			self._deque.append(frame)
+			self._cond.notify()
+
+	def close(self) -> None:
+		with self._cond:
+			self._closed = True
+			self._cond.notify_all()
+
+	def latest(self, timeout: float | None = None) -> Frame | None:
+		with self._cond:
+			while not self._deque:
+				if self._closed:
+					raise RingClosed
+				if not self._cond.wait(timeout):
+					return None
+			latest = self._deque[-1]
+			self._deque.clear()
+			return latest
+
+
+def run(handoff: DequeHandoff | FrameRing, fps: float | None, frames: int) -> tuple[float, float, float]:
+	"""Returns (p50 latency us, p99 latency us, frames/s received)."""
+	data = np.zeros((4, 4), dtype=np.uint8)
+	latencies: list[float] = []
+
+	def producer() -> None:
+		interval = 1.0 / fps if fps else 0.0
+		next_due = time.perf_counter()
+		for _ in range(frames):
+			if interval:
+				next_due += interval
+				delay = next_due - time.perf_counter()
+				if delay > 0:
+					time.sleep(delay)
+			handoff.put(Frame(data=data, timestamp=time.perf_counter()))
+		handoff.close()
+
+	thread = threading.Thread(target=producer, daemon=True)
+	t0 = time.perf_counter()
+	thread.start()
+	while True:
+		try:
+			frame = handoff.latest(timeout=1.0)
+		except RingClosed:
+			break
+		if frame is not None:
+			latencies.append(time.perf_counter() - frame.timestamp)
+	elapsed = time.perf_counter() - t0
+	thread.join()
+
+	values = np.array(latencies) * 1e6
+	return float(np.percentile(values, 50)), float(np.percentile(values, 99)), len(latencies) / elapsed
+
+
+def benchmark_frame_ring(seconds: float = 3.0) -> None:
+	print(f'{"rate":<10}{"handoff":<10}{"p50 us":>10}{"p99 us":>10}{"recv/s":>12}')
+	for fps in (60, 120, None):
+		frames = int(seconds * fps) if fps else 200_000
+		label = f'{fps} fps' if fps else 'unpaced'
+		for name, handoff in (('deque', DequeHandoff(maxlen=8)), ('ring', FrameRing(capacity=8))):
+			p50, p99, rate = run(handoff, fps, frames)
+			print(f'{label:<10}{name:<10}{p50:>10.1f}{p99:>10.1f}{rate:>12.0f}')
+			if isinstance(handoff, FrameRing):
+				print(f'  {handoff.stats()}')
+
+
+if __name__ == '__main__':
+	benchmark_frame_ring()
@@ -0,0 +1,93 @@
+import dataclasses
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.models.capturer import Frame
+from app.models.general import Sides
+from app.models.tracker import DetectionData, MotionData, SideDecisionData, ZoomData
+from app.models.tracker.boundaries import Court, Point
+from app.models.tracker.detection import BallDetection, CourtDetection, PlayerDetections
+
+MODELS = (Frame, Point, Court, BallDetection, CourtDetection, DetectionData, MotionData, SideDecisionData, ZoomData)
+
+
+def unslotted(cls: type) -> type:
+	"""Same fields without __slots__: the models as they were, with an instance __dict__."""
+	fields = [
+		(field.name, field.type, dataclasses.field(default=field.default, default_factory=field.default_factory, init=field.init))
+		for field in dataclasses.fields(cls)
+	]
+	return dataclasses.make_dataclass(cls.__name__, fields)
+
+
+def frame_pair(models: SimpleNamespace, data: np.ndarray, players: PlayerDetections, t: float) -> list[object]:
+	"""Model objects the video pipeline creates for one synchronized pair, detection included."""
+	objects: list[object] = []
+	for camera in range(2):
+		frame = models.Frame(data=data, timestamp=t)
+		analysis = models.Frame(data=data, timestamp=t)
+		court = models.CourtDetection(
+			court=models.Court(
+				top_left=models.Point(0.0, 0.0),
+				top_right=models.Point(960.0, 0.0),
+				bottom_left=models.Point(0.0, 540.0),
+				bottom_right=models.Point(960.0, 540.0),
+			),
+			confidence=0.9,
+		)
+		detection = models.DetectionData(
+			ball=models.BallDetection(center=models.Point(100.0 + camera, 200.0), confidence=0.9),
+			court=court,
+			players=players,
+		)
+		motion = models.MotionData(
+			position=models.Point(100.0, 200.0),
+			velocity=models.Point(10.0, -5.0),
+			acceleration=models.Point(0.0, 9.8),
+			timestamp=t,
+		)
+		objects += [frame, analysis, detection, motion]
+	side = models.SideDecisionData(side=Sides.LEFT, confidence=1.0)
+	zoom = models.ZoomData(center=models.Point(100.0, 200.0), zoom_level=0.5)
+	return objects + [side, zoom]
+
+
+def measure(models: SimpleNamespace, pairs: int) -> tuple[float, float, float]:
+	data = np.zeros((4, 4, 3), dtype=np.uint8)
+	players = PlayerDetections()
+	frame_pair(models, data, players, 0.0)  # calienta cachés de clase fuera de la medida
+	tracemalloc.start()
+	tracemalloc.clear_traces()
+	kept = [frame_pair(models, data, players, index / 30) for index in range(pairs)]
+	snapshot = tracemalloc.take_snapshot()
+	tracemalloc.stop()
+	stats = snapshot.statistics('filename')
+	blocks = sum(stat.count for stat in stats)
+	size = sum(stat.size for stat in stats)
+	del kept
+
+	t0 = time.perf_counter()
+	for index in range(pairs):
+		frame_pair(models, data, players, index / 30)
+	per_pair_us = (time.perf_counter() - t0) * 1e6 / pairs
+	return blocks / pairs, size / pairs, per_pair_us
+
+
+def benchmark_models(pairs: int = 2000) -> None:
+	slotted = SimpleNamespace(**{cls.__name__: cls for cls in MODELS})
+	plain = SimpleNamespace(**{cls.__name__: unslotted(cls) for cls in MODELS})
+	print(f'{pairs} frame pairs')
+	print(f'{"models":<10}{"allocs/pair":>13}{"bytes/pair":>12}{"us/pair":>10}')
+	for label, models in (('__dict__', plain), ('__slots__', slotted)):
+		blocks, size, per_pair = measure(models, pairs)
+		print(f'{label:<10}{blocks:>13.1f}{size:>12.0f}{per_pair:>10.1f}')
+
+
+if __name__ == '__main__':
+	benchmark_models()
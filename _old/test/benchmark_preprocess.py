@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+from collections.abc import Callable
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.models.capturer import Frame, PixelFormat
+from app.services.processor import VideoPreProcessorService
+from config.settings import Settings
+
+SOURCE: tuple[int, int] = (3840, 2160)
+
+
+def legacy_process(frame: Frame) -> Frame:
+	"""VideoPreProcessorService.process as it was: a new service and three new arrays per frame."""
+	resized = cv2.resize(frame.data, Settings.stream.resolution, interpolation=cv2.INTER_AREA)
+	reduced_blur = cv2.GaussianBlur(resized, ksize=(5, 5), sigmaX=0, borderType=cv2.BORDER_DEFAULT)
+	sharpen = cv2.addWeighted(resized, 1 + 0.18, reduced_blur, -0.18, 0)
+	return Frame(data=sharpen, timestamp=frame.timestamp)
+
+
+def source_frame(pixel_format: PixelFormat) -> Frame:
+	width, height = SOURCE
+	bgr = cv2.GaussianBlur(np.random.randint(0, 255, (height, width, 3), dtype=np.uint8), (5, 5), 0)
+	if pixel_format is PixelFormat.I420:
+		return Frame(data=cv2.cvtColor(bgr, cv2.COLOR_BGR2YUV_I420), timestamp=0.0, format=pixel_format)
+	if pixel_format is PixelFormat.NV12:
+		i420 = cv2.cvtColor(bgr, cv2.COLOR_BGR2YUV_I420)
+		quarter = width * height // 4
+		u = i420[height:].reshape(-1)[:quarter]
+		v = i420[height:].reshape(-1)[quarter:]
+		uv = np.stack((u, v), axis=-1).reshape(height // 2, width)
+		return Frame(data=np.vstack((i420[:height], uv)), timestamp=0.0, format=pixel_format)
+	return Frame(data=bgr, timestamp=0.0, format=pixel_format)
+
+
+def measure(process: Callable[[Frame], Frame], frame: Frame, frames: int) -> float:
+	for _ in range(5):
+		process(frame)
+	t0 = time.perf_counter()
+	for _ in range(frames):
+		out = process(frame)
+		del out
+	return (time.perf_counter() - t0) * 1000 / frames
+
+
+def benchmark_preprocess(frames: int = 60) -> None:
+	print(f'{SOURCE[0]}x{SOURCE[1]} -> {Settings.stream.resolution[0]}x{Settings.stream.resolution[1]}')
+	print(f'{"format":<8}{"variant":<12}{"ms/frame":>10}')
+	for pixel_format in (PixelFormat.BGR, PixelFormat.I420, PixelFormat.NV12):
+		frame = source_frame(pixel_format)
+		variants: list[tuple[str, Callable[[Frame], Frame]]] = []
+		if pixel_format is PixelFormat.BGR:
+			variants.append(('legacy', legacy_process))
+		for mode in ('unsharp', 'fused', 'none'):
+			service = VideoPreProcessorService(name=f'benchmark_{mode}', sharpen=mode)
+			variants.append((mode, service.process))
+		for name, process in variants:
+			print(f'{pixel_format.label:<8}{name:<12}{measure(process, frame, frames):>10.2f}')
+
+
+if __name__ == '__main__':
+	benchmark_preprocess()
@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+from collections.abc import Sequence
+from functools import partial
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.adapters.capturer.camera import SyntheticCamera
+from app.adapters.capturer.process_adapter import ProcessCamera
+from app.interfaces.capturer.camera import ICamera
+from app.models.capturer import CaptureFormat
+
+MODES: list[tuple[tuple[int, int], int]] = [
+	((1920, 1080), 60),
+	((3840, 2160), 30),
+]
+
+
+def run(cameras: Sequence[ICamera], seconds: float) -> tuple[float, float, float]:
+	"""Returns (frames/s per camera, mean capture latency in ms, main-process CPU %)."""
+	for camera in cameras:
+		camera.start()
+	# Descarta el arranque
+	for camera in cameras:
+		camera.capture()
+
+	frames = 0
+	latency = 0.0
+	cpu0 = time.process_time()
+	t0 = time.perf_counter()
+	while time.perf_counter() - t0 < seconds:
+		for camera in cameras:
+			frame = camera.capture()
+			latency += time.time() - frame.timestamp
+			frames += 1
+			del frame
+	elapsed = time.perf_counter() - t0
+	cpu = time.process_time() - cpu0
+
+	for camera in cameras:
+		camera.stop()
+	return frames / elapsed / len(cameras), latency * 1000 / frames, cpu * 100 / elapsed
+
+
+def benchmark_process_capture(seconds: float = 5.0, capture_format: CaptureFormat = CaptureFormat.YUV420) -> None:
+	print(f'{"mode":<14}{"capture":<10}{"fps/cam":>10}{"latency ms":>12}{"main cpu %":>12}')
+	for resolution, fps in MODES:
+		factories = [
+			partial(SyntheticCamera, index, 0, resolution=resolution, fps=fps, capture_format=capture_format)
+			for index in range(2)
+		]
+		threaded: list[ICamera] = [factory() for factory in factories]
+		isolated = [ProcessCamera(index, 0, factory=factory) for index, factory in enumerate(factories)]
+		label = f'{resolution[1]}p{fps}'
+		runs: tuple[tuple[str, Sequence[ICamera]], ...] = (('thread', threaded), ('process', isolated))
+		for name, cameras in runs:
+			fps_cam, latency, cpu = run(cameras, seconds)
+			print(f'{label:<14}{name:<10}{fps_cam:>10.1f}{latency:>12.2f}{cpu:>12.1f}')
+		for camera in isolated:
+			print(f'  {camera.stats()}')
+
+
+if __name__ == '__main__':
+	benchmark_process_capture()
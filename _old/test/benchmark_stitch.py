@@ -0,0 +1,44 @@
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.models.capturer import Frame, PixelFormat
+from app.services.processor import PanoramaStitcher
+from app.services.processor.geometry import load_calibration
+
+SOURCE: tuple[int, int] = (1920, 1080)
+CANVASES: tuple[tuple[int, int], ...] = ((1920, 1080), (3840, 1080))
+
+
+def source_frame(pixel_format: PixelFormat) -> Frame:
+	width, height = SOURCE
+	bgr = cv2.GaussianBlur(np.random.randint(0, 255, (height, width, 3), dtype=np.uint8), (5, 5), 0)
+	if pixel_format is PixelFormat.I420:
+		return Frame(data=cv2.cvtColor(bgr, cv2.COLOR_BGR2YUV_I420), timestamp=0.0, format=pixel_format)
+	return Frame(data=bgr, timestamp=0.0, format=pixel_format)
+
+
+def benchmark_stitch(frames: int = 30) -> None:
+	calibration = load_calibration()
+	print(f'2x {SOURCE[0]}x{SOURCE[1]}')
+	print(f'{"format":<8}{"canvas":<12}{"build ms":>10}{"ms/frame":>10}')
+	for pixel_format in (PixelFormat.BGR, PixelFormat.I420):
+		frame_0, frame_1 = source_frame(pixel_format), source_frame(pixel_format)
+		for canvas in CANVASES:
+			stitcher = PanoramaStitcher(canvas, calibration)
+			t0 = time.perf_counter()
+			stitcher.process(frame_0, frame_1)
+			build = (time.perf_counter() - t0) * 1000
+			t0 = time.perf_counter()
+			for _ in range(frames):
+				stitcher.process(frame_0, frame_1)
+			per_frame = (time.perf_counter() - t0) * 1000 / frames
+			print(f'{pixel_format.label:<8}{f"{canvas[0]}x{canvas[1]}":<12}{build:>10.1f}{per_frame:>10.2f}')
+
+
+if __name__ == '__main__':
+	benchmark_stitch()
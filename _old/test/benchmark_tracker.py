@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.adapters.capturer.camera import SyntheticCamera
+from app.adapters.tracker import ClassicalTracker
+from app.models.capturer import CaptureFormat, Frame
+from config.settings import Settings
+
+TARGET_MS: float = 5.0
+
+
+def capture(capture_format: CaptureFormat, count: int) -> list[Frame]:
+	"""Analysis-resolution frames from the synthetic source, as VideoService hands them to the tracker."""
+	camera = SyntheticCamera(0, 0, capture_format=capture_format)
+	camera.start()
+	try:
+		frames = [camera.capture() for _ in range(count)]
+	finally:
+		camera.stop()
+	size = Settings.processing.analysis_resolution
+	return [frame.level(size=size) for frame in frames]
+
+
+def benchmark_tracker(count: int = 90) -> None:
+	width, height = Settings.processing.analysis_resolution
+	print(f'{width}x{height} -> detect width {Settings.tracking.detect_width}, target {TARGET_MS:.1f} ms')
+	print(f'{"format":<8}{"median ms":>10}{"p95 ms":>10}{"max ms":>10}{"ball %":>8}')
+	for capture_format in (CaptureFormat.BGR888, CaptureFormat.YUV420):
+		levels = capture(capture_format, count)
+		tracker = ClassicalTracker()
+		tracker.start()
+		times: list[float] = []
+		found = 0
+		for level in levels:
+			# Frame nuevo: el nivel reducido se calcula dentro de la medida, como en el pipeline
+			frame = Frame(data=level.data, timestamp=level.timestamp, format=level.format)
+			t0 = time.perf_counter()
+			detection = tracker.detect(frame)
+			times.append((time.perf_counter() - t0) * 1000)
+			found += detection.ball.confidence >= Settings.tracking.min_confidence
+		tracker.stop()
+		steady = np.array(times[1:])
+		print(
+			f'{frame.format.label:<8}{np.median(steady):>10.2f}{np.percentile(steady, 95):>10.2f}'
+			f'{steady.max():>10.2f}{100 * found / len(levels):>8.1f}'
+		)
+
+
+if __name__ == '__main__':
+	benchmark_tracker()
@@ -21,6 +21,7 @@ from app.models.tracking import (
 	DetectionData,
 	MotionData,
 	PlayerDetection,
+	PlayerDetections,
 )
 from app.models.tracking.frame_side_decision import FrameSideDecision
 from app.models.tracking.zoom import ZoomData
@@ -160,12 +161,12 @@ def generate_random_detection_data(
 
 		det_L = DetectionData(
 			ball=ball_L,
-			players=list(players_L),
+			players=PlayerDetections.from_list(players_L),
 			court=CourtDetection(court=court_L, confidence=random.uniform(0.5, 1.0)),
 		)
 		det_R = DetectionData(
 			ball=ball_R,
-			players=list(players_R),
+			players=PlayerDetections.from_list(players_R),
 			court=CourtDetection(court=court_R, confidence=random.uniform(0.5, 1.0)),
 		)
 